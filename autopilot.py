@@ -0,0 +1,191 @@
+"""Pathfinding autopilot that plays SnakeGame without a human.
+
+The autopilot runs a breadth-first search from the head to the food over
+the free cells of the board. The snake never grows, so the only obstacles
+are its own body, minus the tail, which moves out of the way on the next
+tick. The path is reused until the food moves. If no path exists, the
+autopilot takes the safe move with the most reachable space.
+
+In the game, set SPOTISNAKE_AUTOPILOT=on (normal speed) or =uncapped (no
+frame delay), or press F6 to toggle it. Run standalone, it plays seeded
+games headlessly with optional rendering, so a full 100-piece reveal can
+be measured the same way every time:
+
+    python autopilot.py --games 5 --render
+"""
+import os
+import sys
+from collections import deque
+
+from game_rules import SnakeGame, UP, DOWN, LEFT, RIGHT
+from debug_log import get_logger
+
+log = get_logger("autopilot")
+
+OFF = 'off'
+ON = 'on'
+UNCAPPED = 'uncapped'
+
+# Mode start_game uses: off, on (normal speed) or uncapped (no frame delay)
+mode = os.environ.get('SPOTISNAKE_AUTOPILOT', OFF).lower()
+if mode not in (OFF, ON, UNCAPPED):
+    log.warning("Unknown SPOTISNAKE_AUTOPILOT value %r, autopilot off", mode)
+    mode = OFF
+
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+
+class Autopilot:
+    """Steers one SnakeGame towards its food"""
+
+    def __init__(self, game):
+        self.game = game
+        self.cols = game.board_width // game.grid_size
+        self.rows = game.board_height // game.grid_size
+        self.path = deque()
+        self.path_food = None
+        self.searches = 0
+
+    def _cell(self, pos):
+        return (pos[0] // self.game.grid_size, pos[1] // self.game.grid_size)
+
+    def _blocked(self):
+        # The tail moves away before the head arrives, so it isn't an obstacle
+        return {self._cell(pos) for pos in self.game.snake_body[:-1]}
+
+    def _neighbours(self, cell, blocked):
+        col, row = cell
+        for direction in DIRECTIONS:
+            nxt = (col + direction[0], row + direction[1])
+            if 0 <= nxt[0] < self.cols and 0 <= nxt[1] < self.rows and nxt not in blocked:
+                yield direction, nxt
+
+    def find_path(self):
+        """Shortest list of directions from the head to the food, or None"""
+        game = self.game
+        if game.food is None:
+            return None
+        self.searches += 1
+        start = self._cell(game.snake_body[0])
+        goal = self._cell(game.food)
+        blocked = self._blocked()
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == goal:
+                path = deque()
+                while came_from[cell] is not None:
+                    cell, direction = came_from[cell]
+                    path.appendleft(direction)
+                return path
+            for direction, nxt in self._neighbours(cell, blocked):
+                if nxt not in came_from:
+                    came_from[nxt] = (cell, direction)
+                    queue.append(nxt)
+        return None
+
+    def _reachable(self, start, blocked):
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for _, nxt in self._neighbours(queue.popleft(), blocked):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return len(seen)
+
+    def _safest_move(self):
+        """Move with the most room behind it, for when the food can't be reached"""
+        blocked = self._blocked()
+        head = self._cell(self.game.snake_body[0])
+        best, best_room = None, -1
+        for direction, nxt in self._neighbours(head, blocked):
+            room = self._reachable(nxt, blocked | {head})
+            if room > best_room:
+                best, best_room = direction, room
+        return best
+
+    def next_direction(self):
+        """Direction to steer this tick, or None to keep going straight"""
+        game = self.game
+        if game.food != self.path_food or not self.path:
+            self.path = self.find_path() or deque()
+            self.path_food = game.food
+        if self.path:
+            return self.path.popleft()
+        return self._safest_move()
+
+    def steer(self, change_direction=None):
+        """Apply next_direction() through change_direction (e.g. a ReplayRecorder's)"""
+        direction = self.next_direction()
+        if direction is not None and direction != self.game.direction:
+            (change_direction or self.game.change_direction)(direction)
+        return direction
+
+def play(seed, max_ticks=20000, on_tick=None):
+    """Autoplay one seeded game headlessly and return it"""
+    game = SnakeGame(seed=seed)
+    pilot = Autopilot(game)
+    while not game.game_over and game.tick < max_ticks:
+        pilot.steer()
+        game.step()
+        if on_tick:
+            on_tick(game)
+    return game
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Autoplay seeded games and report wins, speed and frame times")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--render', action='store_true', help="draw every frame headlessly")
+    args = parser.parse_args(argv)
+
+    on_tick = None
+    if args.render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        import ui  # Imported before snake_logic to resolve the ui <-> snake_logic import cycle
+        import snake_logic
+        from shared_constants import ALBUM_GRID_SIZE
+        from tile_atlas import TileAtlas
+        from benchmark import synthetic_cover
+        from soak import current_rss_mb
+        from frame_profiler import percentile
+        atlas = TileAtlas(synthetic_cover(args.seed), ALBUM_GRID_SIZE)
+        # Frame times bucketed by how much of the album is revealed
+        by_decile = [[] for _ in range(11)]
+
+        def on_tick(game):
+            start = time.perf_counter()
+            snake_logic.draw_game_frame(ui.screen, game, atlas, "Autopilot")
+            pygame.display.flip()
+            decile = len(game.revealed_pieces) * 10 // game.total_pieces
+            by_decile[decile].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    wins = ticks = 0
+    for seed in range(args.seed, args.seed + args.games):
+        game = play(seed, on_tick=on_tick)
+        wins += game.won
+        ticks += game.tick
+        outcome = 'won' if game.won else (game.death_cause or 'tick limit')
+        print(f"seed {seed:>5}: {outcome:<10} {len(game.revealed_pieces):>3}/{game.total_pieces} pieces, {game.tick} ticks")
+    elapsed = time.perf_counter() - start
+    print(f"\n{wins}/{args.games} won, {ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:,.0f} ticks/s)")
+
+    if args.render:
+        print("revealed   frames   p50 ms   p95 ms")
+        for decile, samples in enumerate(by_decile):
+            if samples:
+                samples.sort()
+                print(f"{decile * 10:>6}%  {len(samples):>8} {percentile(samples, 0.5) * 1000:>8.2f} "
+                      f"{percentile(samples, 0.95) * 1000:>8.2f}")
+        print(f"RSS {current_rss_mb():.1f} MB")
+    return 0 if wins == args.games else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
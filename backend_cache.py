@@ -0,0 +1,340 @@
+"""Small thread-safe caches for discogs_backend.py.
+
+Flask serves requests on several threads, so every cache here takes a lock.
+Entries expire after a TTL and the least recently used entry is evicted
+once the cache is full. SQLiteCache has the same interface but keeps its
+entries in a file, so every worker process of a multi-worker server shares
+one cache. PopularityTracker ranks what players ask for, and
+save_snapshot()/load_snapshot() keep the popular entries on disk so a
+restarted instance starts warm.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SNAPSHOT_VERSION = 2  # 2 saves when each entry expires
+
+def _size(value):
+    return len(value) if isinstance(value, bytes) else 0
+
+class TTLCache:
+    """LRU cache whose entries also expire after ttl seconds
+
+    With max_bytes, bytes values are also evicted least recently used first
+    once their total size goes over it.
+    """
+
+    def __init__(self, name, maxsize=256, ttl=3600.0, max_bytes=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.bytes -= _size(value)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.get(key)
+            if old is not None:
+                self.bytes -= _size(old[0])
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            self.bytes += _size(value)
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.bytes -= _size(evicted)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[1] >= time.monotonic()
+
+    def expires_at(self, key):
+        """Wall-clock time key's entry expires, or None if it isn't cached"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            return time.time() + entry[1] - time.monotonic()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self._data), 'maxsize': self.maxsize, 'bytes': self.bytes,
+                'hits': self.hits, 'misses': self.misses}
+
+class SQLiteCache:
+    """TTLCache stored in an SQLite file, shared by every process that opens the same path
+
+    Values are bytes or anything JSON can hold. Each thread uses its own
+    connection, opened again after a fork. Once the cache holds more than
+    maxsize entries the ones written longest ago are removed. Hit and miss
+    counts are per process. A locked or broken database counts as a miss
+    rather than failing the request. With max_bytes, the entries written
+    longest ago are also removed once their values add up to more than that.
+    """
+    PRUNE_EVERY = 64  # Writes between removals of expired and surplus entries
+
+    def __init__(self, name, path, maxsize=256, ttl=3600.0, max_bytes=None):
+        self.name = name
+        self.path = path
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self._db().execute('CREATE TABLE IF NOT EXISTS cache (name TEXT, key TEXT, value BLOB, is_json INTEGER, '
+                           'expires REAL, PRIMARY KEY (name, key))')
+
+    def _db(self):
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        try:
+            row = self._db().execute('SELECT value, is_json, expires FROM cache WHERE name = ? AND key = ?',
+                                     (self.name, key)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None or row[2] < time.time():
+            self._count(False)
+            return default
+        self._count(True)
+        value, is_json, _ = row
+        return json.loads(value) if is_json else bytes(value)
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        is_json = not isinstance(value, bytes)
+        data = json.dumps(value) if is_json else value
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        try:
+            db = self._db()
+            db.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)', (self.name, key, data, int(is_json), expires))
+            if prune:
+                db.execute('DELETE FROM cache WHERE name = ? AND expires < ?', (self.name, time.time()))
+                db.execute('DELETE FROM cache WHERE name = ? AND key IN (SELECT key FROM cache WHERE name = ? '
+                           'ORDER BY expires DESC LIMIT -1 OFFSET ?)', (self.name, self.name, self.maxsize))
+                if self.max_bytes is not None:
+                    db.execute('DELETE FROM cache WHERE name = ? AND key IN (SELECT key FROM (SELECT key, '
+                               'SUM(LENGTH(value)) OVER (ORDER BY expires DESC) AS total FROM cache WHERE name = ?) '
+                               'WHERE total > ?)', (self.name, self.name, self.max_bytes))
+        except sqlite3.Error:
+            pass
+
+    def __contains__(self, key):
+        try:
+            return self._db().execute('SELECT 1 FROM cache WHERE name = ? AND key = ? AND expires >= ?',
+                                      (self.name, key, time.time())).fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def expires_at(self, key):
+        """Wall-clock time key's entry expires, or None if it isn't cached"""
+        try:
+            row = self._db().execute('SELECT expires FROM cache WHERE name = ? AND key = ? AND expires >= ?',
+                                     (self.name, key, time.time())).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def __len__(self):
+        try:
+            return self._db().execute('SELECT COUNT(*) FROM cache WHERE name = ? AND expires >= ?',
+                                      (self.name, time.time())).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self):
+        self._db().execute('DELETE FROM cache WHERE name = ?', (self.name,))
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'shared': self.path}
+
+class PopularityTracker:
+    """Hit counts that halve every half_life seconds, so trending keys outrank old favourites"""
+
+    def __init__(self, half_life=86400.0):
+        self.half_life = half_life
+        self._scores = {}  # key -> (score, time.time() it was last updated)
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated, now):
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def hit(self, key, weight=1.0):
+        now = time.time()
+        with self._lock:
+            score, updated = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated, now) + weight, now)
+
+    def top(self, n):
+        """The n most popular keys, most popular first"""
+        now = time.time()
+        with self._lock:
+            scored = [(self._decayed(score, updated, now), key) for key, (score, updated) in self._scores.items()]
+        scored.sort(reverse=True)
+        return [key for _, key in scored[:n]]
+
+    def prune(self, keep):
+        """Forget all but the keep most popular keys"""
+        kept = set(self.top(keep))
+        with self._lock:
+            for key in [key for key in self._scores if key not in kept]:
+                del self._scores[key]
+
+    def to_dict(self):
+        with self._lock:
+            return {key: list(entry) for key, entry in self._scores.items()}
+
+    def update(self, scores):
+        """Merge scores saved by to_dict()"""
+        now = time.time()
+        with self._lock:
+            for key, (score, updated) in scores.items():
+                mine, mine_updated = self._scores.get(key, (0.0, now))
+                self._scores[key] = (self._decayed(score, updated, now) + self._decayed(mine, mine_updated, now), now)
+
+    def __len__(self):
+        return len(self._scores)
+
+def _image_filename(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest() + '.img'
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def save_snapshot(directory, popularity, search_cache, search_keys, image_cache, image_urls):
+    """Write the given cache entries and the popularity scores to directory
+
+    popularity maps a name to a PopularityTracker. Searches go into
+    index.json; images are stored as one file each, named after their URL,
+    and files for images that are no longer wanted are removed. Each entry
+    keeps the time it expires, so a restore doesn't extend its TTL.
+    """
+    image_dir = os.path.join(directory, 'images')
+    os.makedirs(image_dir, exist_ok=True)
+    searches = {}
+    for key in search_keys:
+        data = search_cache.get(key)
+        expires = search_cache.expires_at(key)
+        if data is not None and expires is not None:
+            searches[key] = {'data': data, 'expires': expires}
+    images = {}
+    for url in image_urls:
+        data = image_cache.get(url)
+        expires = image_cache.expires_at(url)
+        if data is None or expires is None:
+            continue
+        filename = _image_filename(url)
+        path = os.path.join(image_dir, filename)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        images[url] = {'file': filename, 'expires': expires}
+    index = {
+        'version': SNAPSHOT_VERSION,
+        'saved': time.time(),
+        'popularity': {name: tracker.to_dict() for name, tracker in popularity.items()},
+        'searches': searches,
+        'images': images,
+    }
+    _write_atomic(os.path.join(directory, 'index.json'), json.dumps(index).encode('utf-8'))
+    wanted = {image['file'] for image in images.values()}
+    for filename in os.listdir(image_dir):
+        if filename.endswith('.img') and filename not in wanted:
+            os.remove(os.path.join(image_dir, filename))
+    return len(searches), len(images)
+
+def load_snapshot(directory, popularity, search_cache, image_cache):
+    """Fill the caches and popularity scores from save_snapshot(); returns (searches, images) loaded
+
+    Entries get only the TTL they had left when saved, and ones that have
+    expired since are skipped.
+    """
+    try:
+        with open(os.path.join(directory, 'index.json'), 'rb') as f:
+            index = json.loads(f.read().decode('utf-8'))
+    except FileNotFoundError:
+        return 0, 0
+    if index.get('version') != SNAPSHOT_VERSION:
+        return 0, 0
+    for name, scores in index.get('popularity', {}).items():
+        if name in popularity:
+            popularity[name].update(scores)
+    now = time.time()
+    searches = 0
+    for key, entry in index.get('searches', {}).items():
+        if entry['expires'] > now:
+            search_cache.set(key, entry['data'], ttl=entry['expires'] - now)
+            searches += 1
+    images = 0
+    for url, entry in index.get('images', {}).items():
+        if entry['expires'] <= now:
+            continue
+        try:
+            with open(os.path.join(directory, 'images', entry['file']), 'rb') as f:
+                image_cache.set(url, f.read(), ttl=entry['expires'] - now)
+            images += 1
+        except OSError:
+            continue
+    return searches, images
@@ -0,0 +1,214 @@
+"""Local full-text index of every release the backend has seen, for discogs_backend.py.
+
+Releases come from Discogs search results and release details. Titles
+("Artist - Album") are split into lowercase, accent-free tokens, and each
+query token matches exactly, as a prefix of a longer token (for search as
+you type) or, failing both, within one typo. Every query token has to match.
+Results rank by how well the tokens matched, then by how recently the
+release was seen. The longest query token is looked up in the posting lists
+and the rest are only checked against its matches. Over 50,000 releases a
+query takes tens of microseconds, or around a millisecond for a two-letter
+prefix that matches thousands of releases.
+"""
+import heapq
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+
+INDEX_VERSION = 1
+# Search-result fields kept for each release
+RECORD_FIELDS = ('id', 'title', 'thumb', 'cover_image', 'year')
+MIN_PREFIX = 2   # Shorter prefixes match too much to be useful
+MIN_FUZZY = 4    # Shorter tokens are one typo away from too many others
+
+EXACT, PREFIX, FUZZY = 3, 2, 1  # Match scores
+# Once this few releases are left, later query tokens are checked against each release's own tokens
+FILTER_CANDIDATES = 500
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(text)
+
+def _deletions(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+def record_from_release(release):
+    """Index record from a /releases/<id> response, titled "Artist - Album" like search results"""
+    artists = release.get('artists') or []
+    artist = release.get('artists_sort') or (artists[0].get('name') if artists else None) or "Unknown"
+    images = release.get('images') or []
+    primary = next((image for image in images if image.get('type') == 'primary'), images[0] if images else {})
+    return {
+        'id': release.get('id'),
+        'title': f"{artist} - {release.get('title', 'Unknown Album')}",
+        'thumb': release.get('thumb') or primary.get('uri150'),
+        'cover_image': primary.get('uri'),
+        'year': release.get('year'),
+    }
+
+class AlbumIndex:
+    """Inverted index from title tokens to releases, with prefix and one-typo matching"""
+
+    def __init__(self, max_releases=50000):
+        self.max_releases = max_releases
+        self._records = {}     # release id -> record, oldest seen first
+        self._tokens = {}      # release id -> frozenset of its title tokens
+        self._postings = {}    # token -> set of release ids
+        self._prefixes = {}    # prefix -> set of longer tokens starting with it
+        self._deletes = {}     # token with one character deleted -> set of tokens
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def _add_token(self, token, release_id):
+        ids = self._postings.get(token)
+        if ids is None:
+            ids = self._postings[token] = set()
+            for end in range(MIN_PREFIX, len(token)):
+                self._prefixes.setdefault(token[:end], set()).add(token)
+            if len(token) >= MIN_FUZZY:
+                for deleted in _deletions(token):
+                    self._deletes.setdefault(deleted, set()).add(token)
+        ids.add(release_id)
+
+    def _remove_token(self, token, release_id):
+        ids = self._postings.get(token)
+        if ids is None:
+            return
+        ids.discard(release_id)
+        if ids:
+            return
+        del self._postings[token]
+        for end in range(MIN_PREFIX, len(token)):
+            self._discard(self._prefixes, token[:end], token)
+        if len(token) >= MIN_FUZZY:
+            for deleted in _deletions(token):
+                self._discard(self._deletes, deleted, token)
+
+    @staticmethod
+    def _discard(mapping, key, token):
+        tokens = mapping.get(key)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del mapping[key]
+
+    def _remove(self, release_id):
+        if self._records.pop(release_id, None) is not None:
+            for token in self._tokens.pop(release_id):
+                self._remove_token(token, release_id)
+
+    def add(self, release, seen=None):
+        """Index (or refresh) one search result or record_from_release() record"""
+        release_id = release.get('id')
+        if release_id is None or release.get('type', 'release') != 'release':
+            return
+        record = {field: release.get(field) for field in RECORD_FIELDS}
+        record['seen'] = time.time() if seen is None else seen
+        with self._lock:
+            self._remove(release_id)
+            self._records[release_id] = record
+            tokens = self._tokens[release_id] = frozenset(tokenize(record['title'] or ''))
+            for token in tokens:
+                self._add_token(token, release_id)
+            while len(self._records) > self.max_releases:
+                self._remove(next(iter(self._records)))
+
+    def add_many(self, releases):
+        for release in releases:
+            self.add(release)
+
+    def get(self, release_id):
+        return self._records.get(release_id)
+
+    def _fuzzy(self, token):
+        """Tokens in the index within one insertion, deletion or substitution of token"""
+        found = set(self._deletes.get(token, ()))
+        for deleted in _deletions(token):
+            if deleted in self._postings:
+                found.add(deleted)
+            found.update(self._deletes.get(deleted, ()))
+        return found
+
+    def _matches(self, token):
+        """release id -> score for one query token"""
+        matches = dict.fromkeys(self._postings.get(token, ()), EXACT)
+        for longer in self._prefixes.get(token, ()) if len(token) >= MIN_PREFIX else ():
+            for release_id in self._postings[longer]:
+                matches.setdefault(release_id, PREFIX)
+        if not matches and len(token) >= MIN_FUZZY:
+            for near in self._fuzzy(token):
+                for release_id in self._postings[near]:
+                    matches.setdefault(release_id, FUZZY)
+        return matches
+
+    def _filter(self, token, candidates):
+        """_matches() restricted to candidates, checked against each candidate's tokens"""
+        matches = {}
+        prefix_ok = len(token) >= MIN_PREFIX
+        for release_id in candidates:
+            tokens = self._tokens[release_id]
+            if token in tokens:
+                matches[release_id] = EXACT
+            elif prefix_ok and any(t.startswith(token) for t in tokens):
+                matches[release_id] = PREFIX
+        if not matches and len(token) >= MIN_FUZZY:
+            near = self._fuzzy(token)
+            matches = {release_id: FUZZY for release_id in candidates if not near.isdisjoint(self._tokens[release_id])}
+        return matches
+
+    def search(self, query, limit=50, max_age=None):
+        """Best matching records for query, seen within max_age seconds if given"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            scores = None
+            # Longer tokens tend to match fewer releases, so start with them
+            for token in sorted(dict.fromkeys(tokens), key=len, reverse=True):
+                if scores is not None and len(scores) <= FILTER_CANDIDATES:
+                    matches = self._filter(token, scores)
+                else:
+                    matches = self._matches(token)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {release_id: score + matches[release_id]
+                              for release_id, score in scores.items() if release_id in matches}
+                if not scores:
+                    return []
+            records = self._records
+            oldest = time.time() - max_age if max_age is not None else None
+            ranked = heapq.nlargest(limit, ((score, records[release_id]['seen'], release_id)
+                                            for release_id, score in scores.items()
+                                            if oldest is None or records[release_id]['seen'] >= oldest))
+            return [dict(records[release_id], type='release') for _, _, release_id in ranked]
+
+    def save(self, path):
+        with self._lock:
+            data = json.dumps({'version': INDEX_VERSION, 'records': list(self._records.values())})
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Add the records saved by save(); returns how many were loaded"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if data.get('version') != INDEX_VERSION:
+            return 0
+        records = data.get('records', [])
+        for record in records:
+            self.add(record, seen=record.get('seen'))
+        return len(records)
@@ -0,0 +1,126 @@
+"""Queue-based logging for discogs_backend.py, so request threads never touch the disk.
+
+Handlers attached to the root logger only put records on an in-memory
+queue. One background thread takes them off in batches, writes each batch
+to a size-rotated file and flushes once per batch. If the disk stalls, the
+queue fills up and further records are dropped and counted; request latency
+doesn't change. Records still queued at exit are written by an atexit hook.
+A forked worker process (see gunicorn.conf.py) starts its own writer thread.
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+QUEUE_SIZE = 10000  # Records held while the writer catches up; more than that are dropped
+BATCH_SIZE = 256    # Records written per flush
+
+_STOP = object()
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking once the queue is full"""
+
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The writer runs in this process, so the record is formatted there, not on the request thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BatchFlushMixin:
+    """Leaves flushing to the writer thread, which flushes once per batch"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        with self.lock:
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+
+class BatchFileHandler(BatchFlushMixin, RotatingFileHandler):
+    pass
+
+class BatchStreamHandler(BatchFlushMixin, logging.StreamHandler):
+    pass
+
+class LogWriter:
+    """Background thread that drains the queue into a BatchFileHandler or BatchStreamHandler"""
+
+    def __init__(self, queue_handler, handler):
+        self.queue_handler = queue_handler
+        self.queue = queue_handler.queue
+        self.handler = handler
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._start_in_child)
+
+    def _start_in_child(self):
+        # Threads don't survive a fork, so the child needs a fresh queue and its own writer
+        if self._thread is None:
+            return
+        self.queue = self.queue_handler.queue = queue.Queue(QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is _STOP:
+                    self.handler.flush_batch()
+                    return
+                try:
+                    self.handler.handle(record)
+                except Exception:
+                    self.handler.handleError(record)
+            self.handler.flush_batch()
+
+    def stop(self):
+        """Write whatever is still queued and stop the thread"""
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.handler.close()
+
+def setup_logging(filename, level, max_bytes=5 * 1024 * 1024, backups=3):
+    """Send the root logger's records through a queue to a rotating file; returns the queue handler
+
+    filename '-' writes to stderr instead, for hosts that collect it and for
+    multi-worker servers, whose processes would each rotate the same file.
+    """
+    record_queue = queue.Queue(QUEUE_SIZE)
+    if filename == '-':
+        file_handler = BatchStreamHandler(sys.stderr)
+    else:
+        file_handler = BatchFileHandler(filename, maxBytes=max_bytes, backupCount=backups, delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    queue_handler = DroppingQueueHandler(record_queue)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    LogWriter(queue_handler, file_handler).start()
+    return queue_handler
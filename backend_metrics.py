@@ -0,0 +1,160 @@
+"""In-process metrics for discogs_backend.py, served in the Prometheus text format.
+
+Recording a value is one dict update under a lock, a couple of microseconds,
+so requests don't pay for it. Formatting happens only when /metrics is
+scraped, and values that already exist elsewhere (cache statistics, index
+size) are read then through collectors instead of being tracked twice.
+"""
+import bisect
+import threading
+import time
+
+import requests
+
+# Seconds; wide enough for cache hits (well under 5 ms) and slow Discogs calls alike
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class Metrics:
+    """Counters, gauges and latency histograms keyed by name and a tuple of (label, value) pairs"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._types = {}        # name -> (type, help)
+        self._values = {}       # (name, labels) -> number, for counters and gauges
+        self._histograms = {}   # (name, labels) -> [count per bucket..., +Inf count, sum]
+        self._collectors = []
+        self.in_flight = 0
+
+    def describe(self, name, kind, help_text):
+        self._types[name] = (kind, help_text)
+
+    def add_collector(self, collector):
+        """collector() returns (name, labels, value) samples for described metrics, read at scrape time"""
+        self._collectors.append(collector)
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self._values[(name, labels)] = value
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_done(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def request_finished(self, route, method, status, seconds, size):
+        """Record one served request: count, latency and bytes sent"""
+        route_labels = (('route', route),)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            key = ('requests_total', (('route', route), ('method', method), ('status', str(status))))
+            self._values[key] = self._values.get(key, 0) + 1
+            key = ('response_bytes_total', route_labels)
+            self._values[key] = self._values.get(key, 0) + size
+            histogram = self._histograms.get(('request_duration_seconds', route_labels))
+            if histogram is None:
+                histogram = self._histograms[('request_duration_seconds', route_labels)] = \
+                    [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: list(histogram) for key, histogram in self._histograms.items()}
+            values[('requests_in_flight', ())] = self.in_flight
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                values[(name, labels)] = value
+
+        by_name = {}
+        for (name, labels), value in values.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for (name, labels), histogram in histograms.items():
+            by_name.setdefault(name, []).append((labels, histogram))
+
+        lines = []
+        for name in sorted(by_name):
+            kind, help_text = self._types.get(name, (GAUGE, name))
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in sorted(by_name[name], key=lambda sample: sample[0]):
+                if kind != HISTOGRAM:
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+class InstrumentedSession(requests.Session):
+    """requests.Session that records latency and status of every upstream call
+
+    classify(url) names the upstream (e.g. 'discogs' or 'cdn'). Discogs'
+    rate-limit headers are kept as gauges, so the remaining budget is visible.
+    """
+
+    def __init__(self, metrics, classify):
+        super().__init__()
+        self.metrics = metrics
+        self.classify = classify
+
+    def request(self, method, url, *args, **kwargs):
+        target = self.classify(url)
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.inc('upstream_requests_total', (('target', target), ('status', 'error')))
+            self.metrics.observe('upstream_duration_seconds', (('target', target),), time.perf_counter() - start)
+            raise
+        self.metrics.inc('upstream_requests_total', (('target', target), ('status', str(response.status_code))))
+        self.metrics.observe('upstream_duration_seconds', (('target', target),), time.perf_counter() - start)
+        remaining = response.headers.get('X-Discogs-Ratelimit-Remaining')
+        if remaining is not None:
+            try:
+                self.metrics.set('ratelimit_remaining', (), int(remaining))
+                self.metrics.set('ratelimit_limit', (), int(response.headers.get('X-Discogs-Ratelimit', 0)))
+            except ValueError:
+                pass
+        return response
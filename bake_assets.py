@@ -0,0 +1,75 @@
+"""Build-time asset baking for the pygbag (WebAssembly) build.
+
+Pre-scales the menu/game backgrounds and the fruit sprite to the exact size
+they are drawn at and packs their raw pixels, in the 32-bit layout SDL uses
+for display surfaces, into a single zlib-compressed bundle. At startup
+shared_constants reads the bundle once and copies each image straight into a
+surface, so there is no PNG decode and no rescale in the browser.
+
+Run before packaging:  python bake_assets.py
+"""
+import os
+import sys
+import json
+import struct
+import zlib
+
+# Bake without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from shared_constants import (
+    width, height, GRID_SIZE, ASSET_BUNDLE, ASSET_BUNDLE_MAGIC, ASSET_BUNDLE_VERSION
+)
+
+# (source file, target size, per-pixel alpha)
+ASSETS = [
+    ('background.png', (width, height), False),
+    ('SpotipyStart.png', (width, height), False),
+    ('fruit.png', (GRID_SIZE, GRID_SIZE), True),
+]
+
+def bake_surface(filename, size, alpha):
+    """Load, scale and repack an image into a bare 32-bit surface"""
+    source = pygame.image.load(filename)
+    flags = pygame.SRCALPHA if alpha else 0
+    if source.get_bitsize() not in (24, 32):
+        # smoothscale needs 24 or 32 bits; convert() would need a display mode, which a headless bake doesn't have
+        widened = pygame.Surface(source.get_size(), flags, 32)
+        widened.blit(source, (0, 0))
+        source = widened
+    scaled = pygame.transform.smoothscale(source, size)
+    baked = pygame.Surface(size, flags, 32)
+    baked.blit(scaled, (0, 0))
+    return baked
+
+def build_bundle(assets, output):
+    """Write all assets to one compressed bundle file"""
+    entries = []
+    blob = bytearray()
+    for filename, size, alpha in assets:
+        surface = bake_surface(filename, size, alpha)
+        pixels = surface.get_buffer().raw
+        entries.append({
+            'name': filename,
+            'size': list(size),
+            'alpha': alpha,
+            'masks': list(surface.get_masks()),
+            'pitch': surface.get_pitch(),
+            'offset': len(blob),
+            'length': len(pixels),
+        })
+        blob += pixels
+        print(f"baked {filename} -> {size[0]}x{size[1]} ({len(pixels)} bytes)")
+
+    index = json.dumps({'entries': entries}).encode('utf-8')
+    payload = struct.pack('<I', len(index)) + index + bytes(blob)
+    with open(output, 'wb') as f:
+        f.write(ASSET_BUNDLE_MAGIC)
+        f.write(struct.pack('<B', ASSET_BUNDLE_VERSION))
+        f.write(zlib.compress(payload, 9))
+    print(f"wrote {output}: {len(payload)} bytes raw, {os.path.getsize(output)} bytes compressed")
+
+if __name__ == '__main__':
+    output = sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE
+    build_bundle(ASSETS, output)
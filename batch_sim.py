@@ -0,0 +1,184 @@
+"""Play many seeded games in parallel and aggregate rules statistics.
+
+Each game runs headlessly on SnakeGame in a worker process, driven by the
+autopilot, a random bot or recorded replays. The results are combined into
+ticks-to-win, death causes, food-spawn rejections, simulated play time and
+the cost of one step() call. Use it for balance tuning of the start speed
+and the speed-up interval, and to catch performance regressions in the rules:
+
+    python batch_sim.py --games 2000                          # autopilot, every core
+    python batch_sim.py --policy random --games 5000 --json sim.json
+    python batch_sim.py --start-speed 9 --speed-interval 4    # balance tuning
+    python batch_sim.py --policy replay --replays replays.txt # one code per line
+    python batch_sim.py --max-step-us 5                       # exit 1 if step() got slower
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import time
+from collections import Counter
+
+from game_rules import SnakeGame, UP, DOWN, LEFT, RIGHT, SPEED_INCREASE_INTERVAL
+from shared_constants import SNAKE_SPEED
+from frame_profiler import percentile
+
+POLICIES = ('autopilot', 'random', 'replay')
+DEFAULT_MAX_TICKS = 20000
+RANDOM_TURN_CHANCE = 0.2
+
+def simulate(task):
+    """Play one game described by task (a dict) and return its stats; runs in a worker"""
+    from autopilot import Autopilot
+    from replay import Recording
+
+    policy = task['policy']
+    inputs = None
+    seed = task['seed']
+    if policy == 'replay':
+        recording = Recording.decode(task['replay'])
+        seed = recording.seed
+        inputs = recording.inputs
+        settings = recording.game_settings()
+    else:
+        settings = {}
+    game = SnakeGame(seed=seed, start_speed=task['start_speed'], speed_increase_interval=task['speed_interval'], **settings)
+    pilot = Autopilot(game) if policy == 'autopilot' else None
+    rng = random.Random(seed ^ 0x5EED)
+    next_input = 0
+    max_ticks = task['max_ticks']
+    step_time = 0.0
+    play_seconds = 0.0
+    clock = time.perf_counter
+
+    while not game.game_over and game.tick < max_ticks:
+        if pilot:
+            pilot.steer()
+        elif inputs is not None:
+            while next_input < len(inputs) and inputs[next_input][0] == game.tick:
+                game.change_direction(inputs[next_input][1])
+                next_input += 1
+        elif rng.random() < RANDOM_TURN_CHANCE:
+            game.change_direction(rng.choice((UP, DOWN, LEFT, RIGHT)))
+        play_seconds += 1 / game.current_speed
+        start = clock()
+        game.step()
+        step_time += clock() - start
+
+    return {
+        'seed': seed,
+        'won': game.won,
+        'outcome': 'WON' if game.won else (game.death_cause or 'TICK_LIMIT'),
+        'ticks': game.tick,
+        'score': game.score,
+        'pieces': len(game.revealed_pieces),
+        'final_speed': game.current_speed,
+        'food_rejections': game.food_rejections,
+        'play_seconds': play_seconds,
+        'step_us': step_time / max(1, game.tick) * 1e6,
+    }
+
+def build_tasks(args):
+    common = {'policy': args.policy, 'start_speed': args.start_speed,
+              'speed_interval': args.speed_interval, 'max_ticks': args.max_ticks}
+    if args.policy == 'replay':
+        with open(args.replays) as f:
+            codes = [line.strip() for line in f if line.strip()]
+        return [dict(common, seed=None, replay=code) for code in codes]
+    return [dict(common, seed=seed) for seed in range(args.seed, args.seed + args.games)]
+
+def _init_worker():
+    # Importing the game modules runs SDL's init, which catches SIGTERM; restore it so Pool.terminate() works
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def run_tasks(tasks, workers):
+    if workers <= 1:
+        return [simulate(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    # Spawned workers start clean instead of inheriting the parent's SDL state
+    with multiprocessing.get_context('spawn').Pool(processes=workers, initializer=_init_worker) as pool:
+        return list(pool.imap_unordered(simulate, tasks, chunksize=chunksize))
+
+def _spread(values):
+    values = sorted(values)
+    if not values:
+        # None (null in JSON) rather than 0, which would read as "won instantly" when nothing was won
+        return {'mean': None, 'p50': None, 'p95': None, 'max': None}
+    return {
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'max': values[-1],
+    }
+
+def aggregate(results, elapsed, workers):
+    wins = [r for r in results if r['won']]
+    total_ticks = sum(r['ticks'] for r in results)
+    return {
+        'games': len(results),
+        'workers': workers,
+        'wall_seconds': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed else 0.0,
+        'ticks_per_second': total_ticks / elapsed if elapsed else 0.0,
+        'win_rate': len(wins) / len(results) if results else 0.0,
+        'outcomes': dict(Counter(r['outcome'] for r in results)),
+        'ticks_to_win': _spread([r['ticks'] for r in wins]),
+        'play_seconds_to_win': _spread([r['play_seconds'] for r in wins]),
+        'pieces': _spread([r['pieces'] for r in results]),
+        'final_speed': _spread([r['final_speed'] for r in results]),
+        'food_rejections': _spread([r['food_rejections'] for r in results]),
+        'step_us': _spread([r['step_us'] for r in results]),
+    }
+
+def _fmt(value):
+    return 'n/a' if value is None else f"{value:.2f}"
+
+def print_summary(summary, args):
+    print(f"{summary['games']} games ({args.policy}, start speed {args.start_speed}, speed-up every "
+          f"{args.speed_interval} pieces) on {summary['workers']} workers in {summary['wall_seconds']:.2f}s: "
+          f"{summary['games_per_second']:,.0f} games/s, {summary['ticks_per_second']:,.0f} ticks/s")
+    print(f"win rate {summary['win_rate']:.1%}, outcomes {summary['outcomes']}")
+    print(f"{'':<22} {'mean':>10} {'p50':>10} {'p95':>10} {'max':>10}")
+    for key in ('ticks_to_win', 'play_seconds_to_win', 'pieces', 'final_speed', 'food_rejections', 'step_us'):
+        stats = summary[key]
+        print(f"{key:<22}" + ''.join(f" {_fmt(stats[name]):>10}" for name in ('mean', 'p50', 'p95', 'max')))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel headless game simulation")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1, help="first seed; games use consecutive seeds")
+    parser.add_argument('--policy', choices=POLICIES, default='autopilot')
+    parser.add_argument('--replays', help="file of replay codes, one per line (for --policy replay)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--start-speed', type=int, default=SNAKE_SPEED)
+    parser.add_argument('--speed-interval', type=int, default=SPEED_INCREASE_INTERVAL,
+                        help="pieces between speed-ups (0 disables them)")
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument('--json', help="write the summary and per-game results to this file")
+    parser.add_argument('--max-step-us', type=float, help="exit with status 1 if mean step() cost is above this")
+    args = parser.parse_args(argv)
+    if args.policy == 'replay' and not args.replays:
+        parser.error("--policy replay needs --replays")
+
+    tasks = build_tasks(args)
+    workers = max(1, min(args.workers, len(tasks)))
+    start = time.perf_counter()
+    results = run_tasks(tasks, workers)
+    elapsed = time.perf_counter() - start
+
+    summary = aggregate(results, elapsed, workers)
+    print_summary(summary, args)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'summary': summary, 'games': sorted(results, key=lambda r: r['seed'])}, f, indent=2)
+
+    if args.max_step_us is not None and (summary['step_us']['mean'] or 0.0) > args.max_step_us:
+        print(f"FAIL: mean step() cost {summary['step_us']['mean']:.2f} us is above {args.max_step_us} us")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
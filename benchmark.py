@@ -0,0 +1,238 @@
+"""Headless benchmarks for the game logic and rendering.
+
+Runs under SDL's dummy video driver, so no window is opened. Every input
+(synthetic cover art, bot moves, revealed tiles) comes from the seed, so two
+runs with the same seed do exactly the same work.
+
+    python benchmark.py                  # run and compare with benchmark_baseline.json
+    python benchmark.py --save           # run and store the results as the new baseline
+    python benchmark.py --only render    # run only benchmarks whose name contains "render"
+    python benchmark.py --check          # exit with status 1 if anything regressed
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import platform
+import random
+import sys
+import time
+
+import pygame
+import ui  # Imported before snake_logic to resolve the ui <-> snake_logic import cycle
+import snake_logic
+import discogs_handling
+from shared_constants import width, height, ALBUM_GRID_SIZE, WHITE, BLACK
+from game_rules import SnakeGame, TileGrid, UP, DOWN, LEFT, RIGHT
+from tile_atlas import TileAtlas
+
+BASELINE_FILE = 'benchmark_baseline.json'
+DEFAULT_SEED = 1234
+DEFAULT_TOLERANCE = 0.25
+
+_benchmarks = []
+
+def benchmark(name, unit, better='lower'):
+    """Register a benchmark function; it receives the seed and returns a value in unit"""
+    def register(fn):
+        _benchmarks.append((name, unit, better, fn))
+        return fn
+    return register
+
+def best_time(fn, repeat=5, number=1):
+    """Best wall time of one call to fn over several repeats, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def synthetic_cover(seed, size=(width, height)):
+    """Deterministic stand-in for album art: random rectangles and circles"""
+    rng = random.Random(seed)
+    surface = pygame.Surface(size)
+    surface.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    for _ in range(60):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        if rng.random() < 0.5:
+            rect = pygame.Rect(rng.randrange(size[0]), rng.randrange(size[1]), rng.randrange(10, 200), rng.randrange(10, 200))
+            pygame.draw.rect(surface, color, rect)
+        else:
+            pygame.draw.circle(surface, color, (rng.randrange(size[0]), rng.randrange(size[1])), rng.randrange(5, 100))
+    return surface
+
+def encode_image(surface):
+    """Encode a surface the way covers arrive from Discogs (JPEG, PNG if JPEG is unavailable)"""
+    for name in ('cover.jpg', 'cover.png'):
+        buffer = io.BytesIO()
+        try:
+            pygame.image.save(surface, buffer, name)
+        except (pygame.error, TypeError):
+            continue
+        return buffer.getvalue()
+    raise RuntimeError("pygame cannot encode images to memory")
+
+def random_policy_step(game, rng):
+    """Bot input for the logic benchmark: an occasional random turn"""
+    if rng.random() < 0.2:
+        game.change_direction(rng.choice((UP, DOWN, LEFT, RIGHT)))
+
+def game_with_revealed(seed, fraction):
+    game = SnakeGame(seed=seed)
+    rng = random.Random(seed)
+    cells = [(col, row) for col in range(game.album_cols) for row in range(game.album_rows)]
+    game.revealed_pieces = TileGrid(game.album_cols, game.album_rows, rng.sample(cells, int(len(cells) * fraction)))
+    return game
+
+@benchmark('logic_ticks', 'ticks/s', better='higher')
+def bench_logic_ticks(seed, ticks=50000):
+    rng = random.Random(seed)
+    game_seed = seed
+    game = SnakeGame(seed=game_seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if game.game_over:
+            game_seed += 1
+            game = SnakeGame(seed=game_seed)
+        random_policy_step(game, rng)
+        game.step()
+    return ticks / (time.perf_counter() - start)
+
+def _render_benchmark(fraction):
+    def run(seed):
+        screen = pygame.display.get_surface()
+        atlas = TileAtlas(synthetic_cover(seed), ALBUM_GRID_SIZE)
+        game = game_with_revealed(seed, fraction)
+        return best_time(lambda: snake_logic.draw_game_frame(screen, game, atlas, "Benchmark Album"), repeat=5, number=20) * 1000
+    return run
+
+for _percent in (0, 25, 50, 75, 100):
+    benchmark(f'render_frame_{_percent}pct', 'ms')(_render_benchmark(_percent / 100))
+
+@benchmark('decode_base64_cover_300', 'ms')
+def bench_decode_base64_cover(seed):
+    encoded = base64.b64encode(encode_image(synthetic_cover(seed, (300, 300)))).decode('ascii')
+    loop = asyncio.new_event_loop()
+    try:
+        return best_time(lambda: loop.run_until_complete(
+            discogs_handling.base64_to_pygame_surface_pygbag(encoded, 300, 300))) * 1000
+    finally:
+        loop.close()
+
+@benchmark('rgba_pixel_copy_300', 'ms')
+def bench_rgba_pixel_copy(seed):
+    # Same layout as the canvas ImageData the browser build copies from
+    pixels = random.Random(seed).randbytes(300 * 300 * 4)
+    surface = pygame.Surface((300, 300), pygame.SRCALPHA)
+    return best_time(lambda: discogs_handling.rgba_pixels_to_surface(pixels, surface, 300, 300), repeat=3) * 1000
+
+@benchmark('build_tile_atlas', 'ms')
+def bench_build_tile_atlas(seed):
+    cover = synthetic_cover(seed)
+    return best_time(lambda: TileAtlas(cover, ALBUM_GRID_SIZE), number=5) * 1000
+
+@benchmark('fallback_cover_300', 'ms')
+def bench_fallback_cover(seed):
+    state = random.getstate()
+    try:
+        return best_time(lambda: discogs_handling.create_fallback_album_cover(300, 300), repeat=3) * 1000
+    finally:
+        random.setstate(state)
+
+@benchmark('visual_cover_from_url_300', 'ms')
+def bench_visual_cover_from_url(seed):
+    url = f"https://img.discogs.com/benchmark-{seed}.jpg"
+    return best_time(lambda: discogs_handling.create_visual_album_cover(url, 300, 300), repeat=3) * 1000
+
+@benchmark('visual_cover_from_data_300', 'ms')
+def bench_visual_cover_from_data(seed):
+    data = random.Random(seed).randbytes(4096)
+    return best_time(lambda: discogs_handling.create_visual_album_cover_from_data(data, 300, 300), repeat=3) * 1000
+
+@benchmark('text_outline', 'ms')
+def bench_text_outline(seed):
+    font = pygame.font.SysFont("Courier New", 32, bold=True)
+    return best_time(lambda: snake_logic.render_text_with_outline(f"SCORE: {seed}", font, WHITE, BLACK, 2), number=20) * 1000
+
+@benchmark('text_hud', 'ms')
+def bench_text_hud(seed):
+    screen = pygame.display.get_surface()
+    return best_time(lambda: snake_logic.draw_hud(screen, seed, "Benchmark Album", 12), number=20) * 1000
+
+def run_benchmarks(seed, only=None):
+    results = {}
+    for name, unit, better, fn in _benchmarks:
+        if only and only not in name:
+            continue
+        value = fn(seed)
+        results[name] = {'value': value, 'unit': unit, 'better': better}
+        print(f"{name:<28} {value:12.3f} {unit}")
+    return {
+        'meta': {
+            'seed': seed,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, tolerance):
+    """Print the change against the baseline and return the names that regressed"""
+    regressions = []
+    print(f"\nCompared with baseline (seed {baseline['meta']['seed']}, tolerance {tolerance:.0%}):")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base or not base['value']:
+            print(f"{name:<28} (no baseline)")
+            continue
+        change = result['value'] / base['value'] - 1
+        worse = -change if result['better'] == 'higher' else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<28} {change:+8.1%} {flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--only', help="run only benchmarks whose name contains this text")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.seed, args.only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check and regressions:
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
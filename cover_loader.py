@@ -0,0 +1,194 @@
+"""Album cover work for the desktop build, done on a background thread pool.
+
+Fetching a cover, decoding it, scaling it and building its TileAtlas all
+run on worker threads, so the event loop keeps drawing and handling input
+while a download is slow. Each screen owns a CoverJobs: it submits work and
+gets back concurrent futures, which it polls from its frame loop or awaits.
+
+    jobs = CoverJobs()
+    future = jobs.submit(album_id, url, (60, 60))   # None while the screen has too many in flight
+    ...
+    if future is not None and future.done():
+        cover = jobs.result(future)                  # Surface, or None if the download failed
+    ...
+    jobs.cancel()                                    # leaving the screen
+
+Every finished job posts a COVER_READY event, which wakes an idle screen
+so it redraws. Cancelled jobs stop at the next step (before the fetch,
+decode or scale) rather than finishing work nobody will look at.
+
+Threads rather than processes: requests and SDL's decoder and scaler release
+the GIL, and pygame surfaces can't be sent to another process without
+copying their pixels twice. The browser build has no threads and keeps
+downloading through fetch() in discogs_handling.py.
+"""
+import asyncio
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from debug_log import get_logger
+from tile_atlas import TileAtlas
+
+log = get_logger("cover_loader")
+
+MAX_WORKERS = 4
+MAX_PENDING = 8  # Jobs one screen may have queued or running at once
+FETCH_TIMEOUT = 10
+SLOT_POLL_SECONDS = 0.02  # How often wait() retries while the screen is at max_pending
+THUMB_SIZE = 150  # Discogs thumbnails are about this size
+MAX_THUMBS = 64
+
+COVER_READY = pygame.event.custom_type()
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+_thumbs = OrderedDict()
+
+class Cancelled(Exception):
+    """Raised inside a job whose screen cancelled it"""
+
+def executor():
+    """The shared worker pool, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="cover")
+        return _executor
+
+def _session():
+    # One session per worker thread, so repeat covers from the same CDN reuse the connection
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        session = _local.session = requests.Session()
+    return session
+
+def _check(cancelled):
+    if cancelled.is_set():
+        raise Cancelled()
+
+def load_cover(url, size, cancelled, scale_to=None, tile_size=None):
+    """Fetch, decode and scale one cover; runs on a worker thread
+
+    The image is scaled to size, then to scale_to if given. With tile_size
+    the result is a TileAtlas of the final image, otherwise a Surface.
+    Returns None if the download or decode fails.
+    """
+    try:
+        _check(cancelled)
+        response = _session().get(url, timeout=FETCH_TIMEOUT)
+        if response.status_code != 200:
+            log.warning("Cover download failed with status: %s", response.status_code)
+            return None
+        _check(cancelled)
+        image = pygame.image.load(io.BytesIO(response.content))
+        _check(cancelled)
+        image = pygame.transform.scale(image, size)
+        if scale_to:
+            image = pygame.transform.scale(image, scale_to)
+        _check(cancelled)
+        return TileAtlas(image, tile_size) if tile_size else image
+    except Cancelled:
+        raise
+    except ImportError:
+        log.debug("requests module not available, no cover download")
+        return None
+    except Exception as e:
+        log.warning("Cover download failed: %s", e)
+        return None
+
+def remember_thumb(url, surface):
+    """Keep a decoded thumbnail so the game can start on it without downloading again"""
+    _thumbs[url] = surface
+    _thumbs.move_to_end(url)
+    while len(_thumbs) > MAX_THUMBS:
+        _thumbs.popitem(last=False)
+
+def cached_thumb(url):
+    """The thumbnail remembered for url, or None"""
+    return _thumbs.get(url) if url else None
+
+def _post_ready(future):
+    try:
+        pygame.event.post(pygame.event.Event(COVER_READY))
+    except pygame.error:
+        pass  # Display already closed
+
+class CoverJobs:
+    """The cover jobs of one screen: deduplicated by key, bounded, cancelled together"""
+
+    def __init__(self, max_pending=MAX_PENDING):
+        self.max_pending = max_pending
+        self._futures = {}
+        self._cancel_events = {}
+
+    def __contains__(self, key):
+        return key in self._futures
+
+    def pending(self):
+        return sum(1 for future in self._futures.values() if not future.done())
+
+    def submit(self, key, url, size, scale_to=None, tile_size=None):
+        """The future for key, submitting it first if needed; None when max_pending are already in flight"""
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+        if self.pending() >= self.max_pending:
+            return None
+        cancelled = threading.Event()
+        future = executor().submit(load_cover, url, size, cancelled, scale_to, tile_size)
+        future.add_done_callback(_post_ready)
+        self._futures[key] = future
+        self._cancel_events[key] = cancelled
+        return future
+
+    @staticmethod
+    def result(future):
+        """A finished future's cover, or None if it failed or was cancelled"""
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    async def wait(self, key, url, size, scale_to=None, tile_size=None):
+        """Submit a job (waiting for a free slot) and await its cover without blocking the event loop
+
+        The job is forgotten once done, since the caller holds the result.
+        Cancelling the awaiting task cancels the job too.
+        """
+        future = self.submit(key, url, size, scale_to, tile_size)
+        while future is None:
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+            future = self.submit(key, url, size, scale_to, tile_size)
+        try:
+            await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancel_job(key, future)
+            raise
+        except Exception:
+            pass
+        finally:
+            if self._futures.get(key) is future:
+                self._cancel_events.pop(key, None)
+                del self._futures[key]
+        return self.result(future)
+
+    def _cancel_job(self, key, future):
+        if self._futures.get(key) is future:
+            self._cancel_events[key].set()
+        future.cancel()
+
+    def cancel(self):
+        """Drop every job: queued ones never start and running ones stop at their next step"""
+        if not self._futures:
+            return
+        log.debug("Cancelling %s cover jobs", self.pending())
+        for key, future in list(self._futures.items()):
+            self._cancel_job(key, future)
+        self._futures = {}
+        self._cancel_events = {}
@@ -0,0 +1,160 @@
+"""Level-gated logging for the game client.
+
+A much lighter stand-in for the stdlib logging module, tuned for the browser
+build where every print goes through stdout emulation:
+
+- Each logger carries plain boolean flags (``log.debug_enabled``), so a hot
+  path can skip a disabled call with a single attribute check.
+- Messages use %-style arguments and are only formatted when echoed to the
+  console or dumped, never at the call site.
+- Levels are set per module, from the SPOTISNAKE_LOG environment variable
+  (e.g. ``SPOTISNAKE_LOG=WARNING,snake_logic=DEBUG``) or with set_level().
+- Every record that passes its logger's level goes into a fixed-size ring
+  buffer that can be written out with dump_log(). Records are also echoed
+  to stdout unless SPOTISNAKE_LOG_CONSOLE raises the echo threshold
+  (``SPOTISNAKE_LOG_CONSOLE=OFF`` keeps them in the buffer only).
+"""
+import os
+import sys
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR', OFF: 'OFF'}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+RING_BUFFER_SIZE = 2000
+
+# Records are kept unformatted: (timestamp, level, logger name, message, args)
+_ring = deque(maxlen=RING_BUFFER_SIZE)
+_loggers = {}
+_module_levels = {}
+_default_level = WARNING
+_console_level = DEBUG
+
+def _parse_level(value):
+    """Accept a level number or name"""
+    if isinstance(value, int):
+        return value
+    value = str(value).strip().upper()
+    if value.isdigit():
+        return int(value)
+    return _LEVELS_BY_NAME[value]
+
+def _format(message, args):
+    if not args:
+        return message
+    try:
+        return message % args
+    except Exception:
+        return f"{message} {args!r}"
+
+class Logger:
+    """Per-module logger with cached level flags"""
+    __slots__ = ('name', 'level', 'debug_enabled', 'info_enabled', 'warning_enabled', 'error_enabled')
+
+    def __init__(self, name, level):
+        self.name = name
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        self.debug_enabled = level <= DEBUG
+        self.info_enabled = level <= INFO
+        self.warning_enabled = level <= WARNING
+        self.error_enabled = level <= ERROR
+
+    def log(self, level, message, *args):
+        if level < self.level:
+            return
+        _ring.append((time.time(), level, self.name, message, args))
+        if level >= _console_level:
+            print(f"{LEVEL_NAMES.get(level, level)}: {self.name} - {_format(message, args)}")
+
+    def debug(self, message, *args):
+        if self.debug_enabled:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        if self.info_enabled:
+            self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        if self.warning_enabled:
+            self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        if self.error_enabled:
+            self.log(ERROR, message, *args)
+
+def get_logger(name):
+    """Return the logger for a module, creating it on first use"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = Logger(name, _module_levels.get(name, _default_level))
+        _loggers[name] = logger
+    return logger
+
+def set_level(level, name=None):
+    """Set the level for one module, or the default for all modules without their own level"""
+    global _default_level
+    level = _parse_level(level)
+    if name is None:
+        _default_level = level
+        for logger_name, logger in _loggers.items():
+            if logger_name not in _module_levels:
+                logger.set_level(level)
+    else:
+        _module_levels[name] = level
+        if name in _loggers:
+            _loggers[name].set_level(level)
+
+def set_console_level(level):
+    """Set the level from which records are also echoed to stdout"""
+    global _console_level
+    _console_level = _parse_level(level)
+
+def configure(spec):
+    """Apply a level spec such as 'WARNING,snake_logic=DEBUG'"""
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '=' in part:
+                name, level = part.split('=', 1)
+                set_level(level, name.strip())
+            else:
+                set_level(part)
+        except (KeyError, ValueError):
+            print(f"WARNING: debug_log - Ignoring bad log level setting: {part}")
+
+def get_records(min_level=DEBUG):
+    """Return buffered records as formatted strings, oldest first"""
+    lines = []
+    for timestamp, level, name, message, args in list(_ring):
+        if level < min_level:
+            continue
+        stamp = time.strftime('%H:%M:%S', time.localtime(timestamp))
+        lines.append(f"{stamp}.{int(timestamp % 1 * 1000):03d} {LEVEL_NAMES.get(level, level)} {name} - {_format(message, args)}")
+    return lines
+
+def dump_log(stream=None, min_level=DEBUG):
+    """Write the ring buffer to a stream (stdout by default)"""
+    stream = stream or sys.stdout
+    for line in get_records(min_level):
+        stream.write(line + '\n')
+    stream.flush()
+
+def clear_log():
+    _ring.clear()
+
+if os.environ.get('SPOTISNAKE_LOG'):
+    configure(os.environ['SPOTISNAKE_LOG'])
+if os.environ.get('SPOTISNAKE_LOG_CONSOLE'):
+    set_console_level(os.environ['SPOTISNAKE_LOG_CONSOLE'])
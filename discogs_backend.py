@@ -1,21 +1,39 @@
 import os
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import base64
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from flask import Flask, request, jsonify, session
+from urllib.parse import urlparse
+from flask import Flask, request, jsonify, session, Response, stream_with_context, g
 from flask_cors import CORS, cross_origin
 # Don't import shared_constants in backend context
 # from shared_constants import *
 import logging
+try:
+    import brotli  # Optional: preferred over gzip when installed and the client accepts it
+except ImportError:
+    brotli = None
+from backend_cache import TTLCache, SQLiteCache, PopularityTracker, save_snapshot, load_snapshot
+from backend_index import AlbumIndex, record_from_release
+from backend_metrics import Metrics, InstrumentedSession, COUNTER, GAUGE, HISTOGRAM
+from backend_logging import setup_logging
 
-logging.basicConfig(
-    filename='discogs_backend.log',
-    level=logging.DEBUG,
-    format='%(asctime)s %(levelname)s %(message)s'
+# Per-request messages are DEBUG; set LOG_LEVEL=DEBUG to see them. Records are written to disk
+# by a background thread, so logging never blocks a request on file I/O
+log_handler = setup_logging(
+    os.environ.get('LOG_FILE', 'discogs_backend.log'),
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    max_bytes=int(os.environ.get('LOG_MAX_BYTES', str(5 * 1024 * 1024))),
+    backups=int(os.environ.get('LOG_BACKUPS', '3'))
 )
+log = logging.getLogger("discogs_backend")
 
-print("DEBUG: discogs_backend.py - Starting Discogs Flask backend initialization")
+log.info("Starting Discogs Flask backend initialization")
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "supersecretkey")
@@ -29,72 +47,535 @@ CORS(app,
      supports_credentials=False  # Disable credentials for now
      )
 
+# Served at /metrics in the Prometheus text format
+metrics = Metrics('discogs_backend')
+for _name, _kind, _help in (
+        ('requests_total', COUNTER, 'Requests served, by route, method and status'),
+        ('request_duration_seconds', HISTOGRAM, 'Time to build each response, by route'),
+        ('response_bytes_total', COUNTER, 'Response body bytes sent, by route (streamed bodies are not counted)'),
+        ('requests_in_flight', GAUGE, 'Requests being served right now'),
+        ('upstream_requests_total', COUNTER, 'Calls to Discogs and the image CDN, by target and status'),
+        ('upstream_duration_seconds', HISTOGRAM, 'Latency of calls to Discogs and the image CDN'),
+        ('ratelimit_remaining', GAUGE, 'Discogs requests left in the current rate-limit window'),
+        ('ratelimit_limit', GAUGE, 'Discogs requests allowed per rate-limit window'),
+        ('cache_hits_total', COUNTER, 'In-memory cache hits, by cache'),
+        ('cache_misses_total', COUNTER, 'In-memory cache misses, by cache'),
+        ('cache_entries', GAUGE, 'Entries in each in-memory cache'),
+        ('index_releases', GAUGE, 'Releases in the local search index'),
+        ('warmup_done', GAUGE, '1 once the boot warm-up has finished'),
+        ('log_records_dropped_total', COUNTER, 'Log records dropped because the log writer fell behind')):
+    metrics.describe(_name, _kind, _help)
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    metrics.request_started()
+
+# after_request hooks run in reverse order, so this one, registered first, sees the compressed body
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        size = 0 if response.is_streamed else (response.content_length or 0)
+        metrics.request_finished(request.endpoint or 'unmatched', request.method, response.status_code,
+                                 time.perf_counter() - start, size)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    # Runs even when a request fails, and only once a streamed body has been sent
+    if g.pop('request_start', None) is not None:
+        metrics.request_done()
+
 # Discogs API configuration
-DISCOGS_API_URL = "https://api.discogs.com"
+# Overridable so load tests can point the backend at mock_discogs.py
+DISCOGS_API_URL = os.environ.get("DISCOGS_API_URL", "https://api.discogs.com")
 DISCOGS_TOKEN = os.environ.get("DISCOGS_TOKEN", "")
 
+# One pooled session for every upstream call, so DNS and TLS setup happen once per connection
+# instead of once per request
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+
+def upstream_target(url):
+    """Label for an upstream call in /metrics"""
+    if url.startswith(DISCOGS_API_URL):
+        return 'discogs'
+    if KEEPALIVE_URL and url.startswith(KEEPALIVE_URL):
+        return 'keepalive'
+    return 'cdn'
+
+http = InstrumentedSession(metrics, upstream_target)
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+http.mount('https://', _adapter)
+http.mount('http://', _adapter)
+
+# Search results and cover bytes are shared by every player, so popular albums are served from memory.
+# CACHE_BACKEND=sqlite keeps them in one file instead, shared by every worker process (see gunicorn.conf.py)
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "shared_cache.sqlite3")
+
+def make_cache(name, maxsize, ttl, max_bytes=None, path=SHARED_CACHE_PATH):
+    if CACHE_BACKEND == 'sqlite':
+        return SQLiteCache(name, path, maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+    return TTLCache(name, maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+
+search_cache = make_cache('search', maxsize=int(os.environ.get("SEARCH_CACHE_SIZE", "512")),
+                          ttl=float(os.environ.get("SEARCH_CACHE_TTL", "3600")))
+cover_cache = make_cache('cover', maxsize=int(os.environ.get("COVER_CACHE_SIZE", "512")),
+                         ttl=float(os.environ.get("COVER_CACHE_TTL", "86400")),
+                         max_bytes=int(os.environ.get("COVER_CACHE_BYTES", str(64 * 1024 * 1024))))
+# Release details almost never change, so they are kept for a year: the most recently used in memory,
+# and with CACHE_BACKEND=sqlite all of them in a file that survives restarts (the shared cache file by default)
+RELEASE_TTL = float(os.environ.get("RELEASE_CACHE_TTL", str(365 * 86400)))
+release_cache = TTLCache('release', maxsize=int(os.environ.get("RELEASE_CACHE_SIZE", "512")), ttl=RELEASE_TTL)
+release_store = make_cache('release_store', ttl=RELEASE_TTL,
+                           maxsize=int(os.environ.get("RELEASE_STORE_SIZE",
+                                                      "100000" if CACHE_BACKEND == 'sqlite' else "4096")),
+                           path=os.environ.get("RELEASE_STORE_PATH", SHARED_CACHE_PATH))
+MAX_BATCH_IDS = 50
+# Discogs allows 60 requests a minute, so a batch doesn't fetch more than a few releases at a time
+_release_pool = ThreadPoolExecutor(max_workers=int(os.environ.get("RELEASE_FETCH_WORKERS", "4")),
+                                   thread_name_prefix='release')
+
+# Warmed at boot so the first players after a cold start don't pay for the upstream round trips
+WARMUP_QUERIES = [q.strip() for q in os.environ.get(
+    "WARMUP_QUERIES", "Abbey Road,Thriller,Rumours,Nevermind,The Dark Side of the Moon,OK Computer").split(',') if q.strip()]
+WARMUP_THUMBS = int(os.environ.get("WARMUP_THUMBS", "5"))  # The search screen shows 5 results
+# Render's free tier sleeps after 15 idle minutes; pinging our own public URL keeps it awake (0 disables)
+KEEPALIVE_URL = os.environ.get("KEEPALIVE_URL", os.environ.get("RENDER_EXTERNAL_URL", ""))
+KEEPALIVE_INTERVAL = float(os.environ.get("KEEPALIVE_INTERVAL", "600"))
+
+# Covers are only fetched from Discogs' image hosts, plus the API host, which is where mock_discogs.py
+# serves its images; anything else would make /cover an open proxy into the backend's network
+IMAGE_HOSTS = {host.strip().lower() for host in
+               os.environ.get("IMAGE_HOSTS", "i.discogs.com,img.discogs.com,st.discogs.com").split(',') if host.strip()}
+MAX_IMAGE_BYTES = int(os.environ.get("MAX_IMAGE_BYTES", str(2 * 1024 * 1024)))
+
+IMAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': 'https://www.discogs.com/',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# What players search for and which covers they open, used to decide what to precompute
+PRECOMPUTE_TOP_N = int(os.environ.get("PRECOMPUTE_TOP_N", "20"))
+PRECOMPUTE_INTERVAL = float(os.environ.get("PRECOMPUTE_INTERVAL", "900"))
+POPULARITY_HALF_LIFE = float(os.environ.get("POPULARITY_HALF_LIFE", "86400"))
+popularity = {
+    "queries": PopularityTracker(POPULARITY_HALF_LIFE),
+    "covers": PopularityTracker(POPULARITY_HALF_LIFE),
+}
+# Precomputed entries are saved here so a restarted instance starts warm; point it at a persistent disk
+WARM_CACHE_DIR = os.environ.get("WARM_CACHE_DIR", "warm_cache")
+INDEX_FILE = 'album_index.json'
+
+# Every release seen through /search and /album, searchable locally; saved alongside the warm cache
+album_index = AlbumIndex(max_releases=int(os.environ.get("INDEX_MAX_RELEASES", "50000")))
+# Searches with at least this many matches seen within INDEX_MAX_AGE seconds are answered from the index
+INDEX_MIN_HITS = int(os.environ.get("INDEX_MIN_HITS", "5"))
+INDEX_MAX_AGE = float(os.environ.get("INDEX_MAX_AGE", str(7 * 86400)))
+# Offline mode never contacts Discogs: searches use the index and images the cache (for demos and tests)
+OFFLINE = os.environ.get("DISCOGS_OFFLINE", "0") == "1"
+
+warmup_status = {"state": "idle", "started": None, "finished": None, "queries": 0, "covers": 0, "errors": 0,
+                 "restored_searches": 0, "restored_images": 0}
+
+# Cache-Control per endpoint. Discogs image URLs change whenever the image does, and release
+# details barely change, so both can be cached as immutable; anything not listed isn't cached
+CACHE_POLICIES = {
+    'search_albums': 'public, max-age=600',
+    'get_cover': 'public, max-age=31536000, immutable',
+    'get_album_details': 'public, max-age=604800, immutable',
+    'get_albums': 'public, max-age=604800',
+}
+NO_STORE = 'no-store'
+
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF8', 'image/gif'),
+)
+
+SEARCH_PAGE_SIZE = 50  # Results per Discogs search page
+MAX_SEARCH_LIMIT = 100
+# /search returns only what the album picker uses unless ?fields= asks for more (or "full" for everything)
+SEARCH_FIELDS = ('id', 'title', 'artist', 'cover_image', 'thumb')
+FULL_FIELDS = 'full'
+
+# Bodies smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 512
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+
+def split_title(title):
+    """(artist, album) from a Discogs "Artist - Album" title"""
+    if ' - ' in title:
+        artist, album = title.split(' - ', 1)
+        return artist, album
+    return "Unknown", title
+
+def album_key(album):
+    """artist|album for a release result, or None for anything else"""
+    if album.get('type', 'release') != 'release':
+        return None
+    return '|'.join(split_title(album.get('title', 'Unknown Album')))
+
+def project(album, fields):
+    entry = {}
+    for field in fields:
+        if field == 'artist':
+            entry['artist'] = split_title(album.get('title', 'Unknown Album'))[0]
+        elif field in album:
+            entry[field] = album[field]
+    return entry
+
+def format_cursor(position):
+    return f"{position[0]}.{position[1]}"
+
+def parse_cursor(value):
+    """(Discogs page, index in that page) from a cursor; ValueError if it isn't one"""
+    if not value:
+        return (1, 0)
+    page, index = (int(part) for part in value.split('.'))
+    if page < 1 or not 0 <= index <= SEARCH_PAGE_SIZE:
+        raise ValueError(value)
+    return (page, index)
+
+def iter_search(query, start=(1, 0), fields=SEARCH_FIELDS):
+    """Yield (result, position after it) for each unique release from start on, fetching pages as needed
+
+    Results before start still count for deduplication, so paging through
+    gives the same list as one long response. At the end of every page but
+    the last this yields (None, start of the next page), so callers can stop
+    on a page boundary. Each page fetched queues a prefetch of the next one.
+    """
+    seen = set()
+    page = 1
+    while True:
+        data = fetch_search(query, page)
+        results = data.get('results', [])
+        pages = data.get('pagination', {}).get('pages', page)
+        if page < pages:
+            prefetch_search_page(query, page + 1)
+        for index, album in enumerate(results):
+            key = album_key(album)
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            if (page, index) >= start:
+                yield project(album, fields), (page, index + 1)
+        if page >= pages or not results:
+            return
+        page += 1
+        if page > start[0]:
+            yield None, (page, 0)
+
+def parse_fields(value):
+    """SEARCH_FIELDS, FULL_FIELDS or the requested field names from a ?fields= value"""
+    if not value:
+        return SEARCH_FIELDS
+    if value.strip() == FULL_FIELDS:
+        return FULL_FIELDS
+    return tuple(dict.fromkeys(f.strip() for f in value.split(',') if f.strip())) or SEARCH_FIELDS
+
+def image_mimetype(image_data):
+    for signature, mimetype in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return mimetype
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'application/octet-stream'
+
+def discogs_headers():
+    headers = {
+        'Accept': 'application/json'
+    }
+    if DISCOGS_TOKEN:
+        headers['Authorization'] = f'Discogs token={DISCOGS_TOKEN}'
+    return headers
+
+def search_key(query):
+    # Discogs search ignores case and extra spaces, so these share a cache entry
+    return ' '.join(query.lower().split())
+
+def search_page_key(query, page):
+    # Page 1 keeps the bare query as its key, which is what the warm cache snapshot stores
+    return search_key(query) if page == 1 else f"{search_key(query)}#{page}"
+
+def index_page(records):
+    """Index matches shaped like a single-page Discogs search response"""
+    return {
+        "pagination": {"page": 1, "pages": 1, "per_page": len(records), "items": len(records)},
+        "results": records,
+        "source": "index",
+    }
+
+class OfflineError(requests.exceptions.ConnectionError):
+    """Raised instead of contacting Discogs in offline mode"""
+
+class ImageRejected(ValueError):
+    """Raised for image URLs the backend won't fetch and upstream responses it won't serve"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def check_image_url(image_url):
+    """Raise ImageRejected unless image_url is on a Discogs image host (or the configured API host)"""
+    try:
+        parsed = urlparse(image_url)
+        port = parsed.port
+    except ValueError:
+        raise ImageRejected("Malformed image URL")
+    host = (parsed.hostname or '').lower()
+    api = urlparse(DISCOGS_API_URL)
+    if parsed.scheme == 'https' and host in IMAGE_HOSTS and port is None:
+        return
+    if parsed.scheme == api.scheme and host == (api.hostname or '').lower() and port == api.port:
+        return
+    raise ImageRejected("Only Discogs image URLs can be fetched")
+
+def fetch_search(query, page=1):
+    """One page of Discogs search results for query
+
+    Comes from the cache, else from the local index when it has enough fresh
+    matches (as a single page), else from Discogs. If Discogs can't be
+    reached, or in offline mode, the first page falls back to whatever the
+    index has.
+    """
+    key = search_page_key(query, page)
+    data = search_cache.get(key)
+    if data is not None:
+        log.debug("Search cache hit for: %s", key)
+        return data
+    if page == 1:
+        if OFFLINE:
+            return index_page(album_index.search(query, limit=SEARCH_PAGE_SIZE))
+        records = album_index.search(query, limit=SEARCH_PAGE_SIZE, max_age=INDEX_MAX_AGE)
+        if len(records) >= INDEX_MIN_HITS:
+            log.debug("Answered %r from the index (%s matches)", query, len(records))
+            return index_page(records)
+    elif OFFLINE:
+        raise OfflineError("Offline: only the first page of results is available")
+    try:
+        data = _fetch_search_from_discogs(query, page)
+    except requests.exceptions.RequestException:
+        records = album_index.search(query, limit=SEARCH_PAGE_SIZE) if page == 1 else []
+        if not records:
+            raise
+        log.warning("Discogs search for %r failed, answering from the index", query)
+        return index_page(records)
+    album_index.add_many(data.get('results', []))
+    search_cache.set(key, data)
+    return data
+
+def _fetch_search_from_discogs(query, page):
+    params = {
+        'q': query,
+        'type': 'release',
+        'format': 'album',
+        'page': page,
+        'per_page': SEARCH_PAGE_SIZE
+    }
+    response = http.get(f"{DISCOGS_API_URL}/database/search", params=params, headers=discogs_headers(), timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prefetch')
+_prefetching = set()
+_prefetch_lock = threading.Lock()
+
+def prefetch_search_page(query, page):
+    """Fetch a search page into the cache in the background, unless it's cached or on its way"""
+    key = search_page_key(query, page)
+    with _prefetch_lock:
+        if key in _prefetching or key in search_cache:
+            return
+        _prefetching.add(key)
+
+    def run():
+        try:
+            fetch_search(query, page)
+            log.debug("Prefetched search page %s", key)
+        except Exception as e:
+            log.debug("Prefetch of %s failed: %s", key, e)
+        finally:
+            with _prefetch_lock:
+                _prefetching.discard(key)
+
+    _prefetch_pool.submit(run)
+
+def cached_release(album_id):
+    """Release details from memory or the release store, or None"""
+    data = release_cache.get(album_id)
+    if data is None:
+        data = release_store.get(str(album_id))
+        if data is not None:
+            release_cache.set(album_id, data)
+    return data
+
+def fetch_release(album_id):
+    """Discogs /releases/<id> response, from the caches when possible"""
+    data = cached_release(album_id)
+    if data is not None:
+        return data
+    if OFFLINE:
+        raise OfflineError(f"Offline: release {album_id} is not cached")
+    response = http.get(f"{DISCOGS_API_URL}/releases/{album_id}", headers=discogs_headers(), timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    release_cache.set(album_id, data)
+    release_store.set(str(album_id), data)
+    album_index.add(record_from_release(data))
+    return data
+
+def fetch_image(image_url, refresh=False):
+    """Raw bytes of a cover or thumbnail, from the cache when possible (never with refresh)
+
+    Raises ImageRejected for URLs off the Discogs image hosts, and for
+    responses that aren't an image or are over MAX_IMAGE_BYTES.
+    """
+    check_image_url(image_url)
+    image_data = None if refresh else cover_cache.get(image_url)
+    if image_data is not None:
+        log.debug("Cover cache hit for: %s", image_url)
+        return image_data
+    if OFFLINE:
+        raise OfflineError(f"Offline: {image_url} is not cached")
+    # No redirects: they could lead off the allowed hosts
+    response = http.get(image_url, headers=IMAGE_HEADERS, timeout=10, stream=True, allow_redirects=False)
+    try:
+        response.raise_for_status()
+        if response.status_code != 200:
+            raise ImageRejected(f"Image host answered {response.status_code}", status=502)
+        if not response.headers.get('Content-Type', '').lower().startswith('image/'):
+            raise ImageRejected("Image host returned something other than an image", status=502)
+        if int(response.headers.get('Content-Length') or 0) > MAX_IMAGE_BYTES:
+            raise ImageRejected("Image is too large", status=502)
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > MAX_IMAGE_BYTES:
+                raise ImageRejected("Image is too large", status=502)
+            chunks.append(chunk)
+    finally:
+        response.close()
+    image_data = b''.join(chunks)
+    cover_cache.set(image_url, image_data)
+    return image_data
+
 @app.route('/ping', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def ping():
     """Simple ping endpoint to test connectivity"""
-    logging.debug("DEBUG: discogs_backend.py - Ping endpoint called")
-    return jsonify({"status": "ok", "message": "Discogs backend is running"})
+    log.debug("Ping endpoint called")
+    return jsonify({"status": "ok", "message": "Discogs backend is running", "warm": warmup_status["finished"] is not None})
+
+def parse_search_args():
+    """(query, start position, limit, fields) from the request; ValueError for a bad cursor or limit"""
+    query = request.args.get('q', '')
+    start = parse_cursor(request.args.get('cursor'))
+    limit = request.args.get('limit')
+    if limit is not None:
+        limit = int(limit)
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            raise ValueError(f"limit must be 1-{MAX_SEARCH_LIMIT}")
+    if start == (1, 0) and query:
+        popularity["queries"].hit(search_key(query))
+    return query, start, limit, parse_fields(request.args.get('fields'))
 
 @app.route('/search', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def search_albums():
-    """Search for albums using Discogs API"""
-    logging.debug("DEBUG: discogs_backend.py - Search endpoint called")
+    """Search for albums using Discogs API
+
+    Returns up to limit unique releases from the cursor on, or the rest of
+    the cursor's Discogs page without a limit, plus the cursor of the next
+    batch (null after the last page). fields=full returns the cursor's
+    Discogs page unchanged.
+    """
+    log.debug("Search endpoint called")
     
     try:
-        query = request.args.get('q', '')
+        try:
+            query, start, limit, fields = parse_search_args()
+        except ValueError as e:
+            return jsonify({"error": f"Bad cursor or limit: {e}"}), 400
         if not query:
             return jsonify({"error": "No query provided"}), 400
         
-        logging.debug(f"DEBUG: discogs_backend.py - Searching for: {query}")
-        
-        # Build the Discogs API URL
-        search_url = f"{DISCOGS_API_URL}/database/search"
-        params = {
-            'q': query,
-            'type': 'release',
-            'format': 'album'
-        }
-        
-        headers = {
-            'Accept': 'application/json'
-        }
+        log.debug("Searching for: %s from %s", query, start)
+        if fields == FULL_FIELDS:
+            return jsonify(fetch_search(query, start[0]))
         
-        # Add token if available
-        if DISCOGS_TOKEN:
-            headers['Authorization'] = f'Discogs token={DISCOGS_TOKEN}'
-            logging.debug(f"DEBUG: discogs_backend.py - Using token: {DISCOGS_TOKEN[:10]}...")
+        results = []
+        next_position = None
+        for result, position in iter_search(query, start, fields):
+            next_position = position
+            if result is None:
+                if limit is None:
+                    break
+                continue
+            results.append(result)
+            if len(results) == limit:
+                break
         else:
-            logging.debug("DEBUG: discogs_backend.py - No token available")
-        
-        logging.debug(f"DEBUG: discogs_backend.py - Making request to: {search_url}")
-        response = requests.get(search_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        logging.debug(f"DEBUG: discogs_backend.py - Discogs API response received")
+            next_position = None
+        log.debug("Discogs API response received")
         
-        return jsonify(data)
+        return jsonify({"results": results, "next_cursor": format_cursor(next_position) if next_position else None})
         
     except requests.exceptions.RequestException as e:
-        logging.error(f"DEBUG: discogs_backend.py - Request error: {e}")
+        log.error("Request error: %s", e)
         return jsonify({"error": f"Request failed: {str(e)}"}), 500
     except Exception as e:
-        logging.error(f"DEBUG: discogs_backend.py - Unexpected error: {e}")
-        import traceback
-        logging.error(f"DEBUG: discogs_backend.py - Traceback: {traceback.format_exc()}")
+        log.exception("Unexpected error: %s", e)
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
+@app.route('/search/stream', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def stream_search():
+    """Same results as /search, as NDJSON: one release per line as soon as its page is in,
+    then a last line with next_cursor. Stops after limit results (default MAX_SEARCH_LIMIT)."""
+    try:
+        query, start, limit, fields = parse_search_args()
+    except ValueError as e:
+        return jsonify({"error": f"Bad cursor or limit: {e}"}), 400
+    if not query or fields == FULL_FIELDS:
+        return jsonify({"error": "No query provided" if not query else "fields=full can't be streamed"}), 400
+    limit = limit or MAX_SEARCH_LIMIT
+
+    def generate():
+        sent = 0
+        next_position = None
+        try:
+            for result, position in iter_search(query, start, fields):
+                next_position = position
+                if result is None:
+                    continue
+                yield json.dumps(result) + '\n'
+                sent += 1
+                if sent == limit:
+                    break
+            else:
+                next_position = None
+            yield json.dumps({"next_cursor": format_cursor(next_position) if next_position else None}) + '\n'
+        except Exception as e:
+            log.error("Search stream error: %s", e)
+            yield json.dumps({"error": f"Request failed: {str(e)}"}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/download_album_cover', methods=['POST'])
 @cross_origin(supports_credentials=True)
 def download_album_cover():
     """Download and resize album cover image"""
-    logging.debug("DEBUG: discogs_backend.py - Download album cover endpoint called")
+    log.debug("Download album cover endpoint called")
     
     try:
         data = request.get_json()
@@ -106,25 +587,9 @@ def download_album_cover():
         if not image_url:
             return jsonify({"error": "No image URL provided"}), 400
         
-        logging.debug(f"DEBUG: discogs_backend.py - Downloading image from: {image_url}")
-        
-        # Download the image
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Referer': 'https://www.discogs.com/',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        response = requests.get(image_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Get the raw image data first
-        image_data = response.content
+        log.debug("Downloading image from: %s", image_url)
+        image_data = fetch_image(image_url)
+        popularity["covers"].hit(image_url)
         
         # Get target dimensions from request
         target_width = data.get('target_width', 600)
@@ -133,7 +598,7 @@ def download_album_cover():
         # Return raw image data (frontend will handle processing)
         base64_data = base64.b64encode(image_data).decode('utf-8')
         
-        logging.debug(f"DEBUG: discogs_backend.py - Image downloaded, size: {len(image_data)} bytes")
+        log.debug("Image downloaded, size: %s bytes", len(image_data))
         
         return jsonify({
             "status": 200,
@@ -141,60 +606,388 @@ def download_album_cover():
             "size": len(image_data)
         })
         
+    except ImageRejected as e:
+        log.warning("Image rejected: %s (%s)", e, image_url)
+        return jsonify({"error": str(e)}), e.status
     except requests.exceptions.RequestException as e:
-        logging.error(f"DEBUG: discogs_backend.py - Image download error: {e}")
+        log.error("Image download error: %s", e)
         return jsonify({"error": f"Image download failed: {str(e)}"}), 500
     except Exception as e:
-        logging.error(f"DEBUG: discogs_backend.py - Unexpected error in image download: {e}")
-        import traceback
-        logging.error(f"DEBUG: discogs_backend.py - Traceback: {traceback.format_exc()}")
+        log.exception("Unexpected error in image download: %s", e)
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
+@app.route('/cover', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def get_cover():
+    """Raw cover or thumbnail bytes for ?url=, cacheable by browsers and CDNs unlike the POST route"""
+    image_url = request.args.get('url', '')
+    if not image_url.startswith(('http://', 'https://')):
+        return jsonify({"error": "No image URL provided"}), 400
+    log.debug("Cover requested: %s", image_url)
+    try:
+        image_data = fetch_image(image_url)
+    except ImageRejected as e:
+        log.warning("Image rejected: %s (%s)", e, image_url)
+        return jsonify({"error": str(e)}), e.status
+    except requests.exceptions.RequestException as e:
+        log.error("Image download error: %s", e)
+        return jsonify({"error": f"Image download failed: {str(e)}"}), 502
+    # Counted only once fetched, so the precompute task never ranks URLs it can't fetch
+    popularity["covers"].hit(image_url)
+    return Response(image_data, mimetype=image_mimetype(image_data))
+
 @app.route('/album/<int:album_id>', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def get_album_details(album_id):
     """Get detailed information about a specific album"""
-    logging.debug(f"DEBUG: discogs_backend.py - Get album details endpoint called for ID: {album_id}")
+    log.debug("Get album details endpoint called for ID: %s", album_id)
     
     try:
-        # Build the Discogs API URL
-        album_url = f"{DISCOGS_API_URL}/releases/{album_id}"
-        
-        headers = {
-            'Accept': 'application/json'
-        }
-        
-        # Add token if available
-        if DISCOGS_TOKEN:
-            headers['Authorization'] = f'Discogs token={DISCOGS_TOKEN}'
-        
-        response = requests.get(album_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        logging.debug(f"DEBUG: discogs_backend.py - Album details retrieved successfully")
+        data = fetch_release(album_id)
+        log.debug("Album details retrieved successfully")
         
         return jsonify(data)
         
     except requests.exceptions.RequestException as e:
-        logging.error(f"DEBUG: discogs_backend.py - Request error: {e}")
+        # The index only has the search-result fields, but that's enough to show and play the album
+        record = album_index.get(album_id)
+        if record is not None:
+            log.warning("Album %s request failed (%s), answering from the index", album_id, e)
+            response = jsonify(dict(record, source="index"))
+            response.headers['Cache-Control'] = NO_STORE
+            return response
+        log.error("Request error: %s", e)
         return jsonify({"error": f"Request failed: {str(e)}"}), 500
     except Exception as e:
-        logging.error(f"DEBUG: discogs_backend.py - Unexpected error: {e}")
+        log.error("Unexpected error: %s", e)
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
+@app.route('/albums', methods=['GET'])
+@cross_origin(supports_credentials=True)
+def get_albums():
+    """Details for up to MAX_BATCH_IDS releases at once (?ids=1,2,3)
+
+    Cached releases are answered straight away and the rest are fetched
+    concurrently. Releases that can't be fetched come from the index when
+    it has them, and are listed in "errors" otherwise.
+    """
+    try:
+        ids = list(dict.fromkeys(int(value) for value in request.args.get('ids', '').split(',') if value.strip()))
+    except ValueError:
+        return jsonify({"error": "ids must be comma-separated release IDs"}), 400
+    if not ids:
+        return jsonify({"error": "No ids provided"}), 400
+    if len(ids) > MAX_BATCH_IDS:
+        return jsonify({"error": f"At most {MAX_BATCH_IDS} ids per request"}), 400
+    log.debug("Batch album details for %s releases", len(ids))
+
+    found = {}
+    for album_id in ids:
+        data = cached_release(album_id)
+        if data is not None:
+            found[album_id] = data
+    futures = {album_id: _release_pool.submit(fetch_release, album_id) for album_id in ids if album_id not in found}
+    errors = {}
+    partial = False
+    for album_id, future in futures.items():
+        try:
+            found[album_id] = future.result()
+        except requests.exceptions.RequestException as e:
+            partial = True
+            record = album_index.get(album_id)
+            if record is not None:
+                found[album_id] = dict(record, source="index")
+            else:
+                errors[str(album_id)] = f"Request failed: {str(e)}"
+        except Exception as e:
+            partial = True
+            log.error("Unexpected error fetching album %s: %s", album_id, e)
+            errors[str(album_id)] = f"Unexpected error: {str(e)}"
+    log.debug("Batch album details: %s cached, %s fetched, %s failed", len(ids) - len(futures), len(futures), len(errors))
+
+    response = jsonify({"albums": {str(album_id): found[album_id] for album_id in ids if album_id in found},
+                        "errors": errors})
+    if partial:
+        response.headers['Cache-Control'] = NO_STORE
+    return response
+
 @app.route('/health', methods=['GET'])
 @cross_origin(supports_credentials=True)
 def health_check():
     """Health check endpoint"""
-    logging.debug("DEBUG: discogs_backend.py - Health check endpoint called")
+    log.debug("Health check endpoint called")
     return jsonify({
         "status": "healthy",
         "timestamp": time.time(),
-        "discogs_token_configured": bool(DISCOGS_TOKEN)
+        "discogs_token_configured": bool(DISCOGS_TOKEN),
+        "warmup": warmup_status,
+        "caches": {"search": search_cache.stats(), "cover": cover_cache.stats(),
+                   "release": release_cache.stats(), "release_store": release_store.stats()},
+        "index": {"releases": len(album_index), "offline": OFFLINE},
+        "popular": {name: tracker.top(5) for name, tracker in popularity.items()}
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request, upstream and cache metrics in the Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def collect_backend_metrics():
+    """Cache, index and warm-up figures, read when /metrics is scraped"""
+    for cache in (search_cache, cover_cache, release_cache, release_store):
+        labels = (('cache', cache.name),)
+        yield 'cache_hits_total', labels, cache.hits
+        yield 'cache_misses_total', labels, cache.misses
+        yield 'cache_entries', labels, len(cache)
+    yield 'index_releases', (), len(album_index)
+    yield 'warmup_done', (), int(warmup_status["finished"] is not None)
+    yield 'log_records_dropped_total', (), log_handler.dropped
+
+metrics.add_collector(collect_backend_metrics)
+
+def compress_response(response):
+    """Brotli- or gzip-encode a text body when the client accepts it"""
+    if (response.is_streamed or response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        response.set_data(brotli.compress(body))
+        response.headers['Content-Encoding'] = 'br'
+    elif accepted['gzip']:
+        # mtime=0 keeps the output, and so the ETag, the same for the same body
+        response.set_data(gzip.compress(body, compresslevel=6, mtime=0))
+        response.headers['Content-Encoding'] = 'gzip'
+
+@app.after_request
+def apply_cache_headers(response):
+    """Compress the body, give every response a Cache-Control policy, and successful GETs a strong ETag
+
+    The ETag is taken over the encoded body, so each encoding gets its own.
+    A GET whose If-None-Match matches the ETag becomes an empty 304.
+    """
+    compress_response(response)
+    cacheable = response.status_code == 200 and request.method in ('GET', 'HEAD')
+    if 'Cache-Control' not in response.headers:  # A route can set its own, e.g. for a partial answer
+        response.headers['Cache-Control'] = CACHE_POLICIES.get(request.endpoint, NO_STORE) if cacheable else NO_STORE
+    if cacheable and not response.is_streamed:
+        response.add_etag()
+        response.make_conditional(request)
+    response.vary.add('Accept-Encoding')
+    return response
+
+def warm_up(queries=None):
+    """Fill the caches with the popular searches and covers; returns the (queries, image URLs) it covered
+
+    Covers WARMUP_QUERIES plus the PRECOMPUTE_TOP_N most searched queries,
+    with the thumbnails and top cover of each, and the most opened covers.
+    Opens the pooled connections to the API and the image CDN on the way.
+    Entries that are already cached cost nothing, so the precompute loop
+    runs this again to refresh whatever has expired.
+    """
+    if queries is None:
+        queries = list(dict.fromkeys(WARMUP_QUERIES + popularity["queries"].top(PRECOMPUTE_TOP_N)))
+    warmup_status.update(state="running", started=time.time(), queries=0, covers=0, errors=0)
+    log.info("Warming up: %s popular queries", len(queries))
+    search_keys = []
+    urls = []
+    for query in queries:
+        try:
+            results = fetch_search(query).get('results', [])
+            search_keys.append(search_key(query))
+            warmup_status["queries"] += 1
+        except Exception as e:
+            log.warning("Warm-up search for %r failed: %s", query, e)
+            warmup_status["errors"] += 1
+            continue
+        urls.extend(r.get('thumb') for r in results[:WARMUP_THUMBS])
+        if results:
+            urls.append(results[0].get('cover_image'))
+    urls.extend(popularity["covers"].top(PRECOMPUTE_TOP_N))
+
+    warmed_urls = []
+    for url in dict.fromkeys(urls):
+        if not url:
+            continue
+        try:
+            fetch_image(url)
+            warmed_urls.append(url)
+            warmup_status["covers"] += 1
+        except Exception as e:
+            log.warning("Warm-up download of %s failed: %s", url, e)
+            warmup_status["errors"] += 1
+    warmup_status.update(state="done", finished=time.time())
+    log.info("Warm-up finished in %.1fs: %s queries, %s images, %s errors",
+             warmup_status["finished"] - warmup_status["started"], warmup_status["queries"],
+             warmup_status["covers"], warmup_status["errors"])
+    return search_keys, warmed_urls
+
+_restored = False
+
+def restore_warm_cache():
+    """Load the entries saved by save_warm_cache(), if any, once per process
+
+    Under gunicorn the master calls this before forking, so every worker
+    starts with the search index already loaded.
+    """
+    global _restored
+    if _restored:
+        return
+    _restored = True
+    try:
+        searches, images = load_snapshot(WARM_CACHE_DIR, popularity, search_cache, cover_cache)
+    except Exception as e:
+        log.warning("Could not restore warm cache from %s: %s", WARM_CACHE_DIR, e)
+        return
+    warmup_status.update(restored_searches=searches, restored_images=images)
+    if searches or images:
+        log.info("Restored %s searches and %s images from %s", searches, images, WARM_CACHE_DIR)
+    try:
+        releases = album_index.load(os.path.join(WARM_CACHE_DIR, INDEX_FILE))
+        log.info("Loaded %s releases into the search index", releases)
+    except Exception as e:
+        log.warning("Could not load the search index: %s", e)
+
+def save_warm_cache(search_keys, image_urls):
+    """Save the precomputed entries and popularity scores to WARM_CACHE_DIR"""
+    for tracker in popularity.values():
+        tracker.prune(PRECOMPUTE_TOP_N * 10)
+    if OFFLINE:
+        return  # Nothing new was fetched, and index answers must not replace saved Discogs results
+    try:
+        searches, images = save_snapshot(WARM_CACHE_DIR, popularity, search_cache, search_keys, cover_cache, image_urls)
+        album_index.save(os.path.join(WARM_CACHE_DIR, INDEX_FILE))
+        log.debug("Saved %s searches, %s images and %s indexed releases to %s",
+                  searches, images, len(album_index), WARM_CACHE_DIR)
+    except Exception as e:
+        log.warning("Could not save warm cache to %s: %s", WARM_CACHE_DIR, e)
+
+def precompute():
+    """Warm the caches from popularity and persist the result"""
+    search_keys, image_urls = warm_up()
+    save_warm_cache(search_keys, image_urls)
+
+def boot_warm_up():
+    restore_warm_cache()
+    precompute()
+
+def precompute_loop():
+    """Re-run precompute() so newly trending albums get cached and expired entries refreshed"""
+    while True:
+        time.sleep(PRECOMPUTE_INTERVAL)
+        try:
+            precompute()
+        except Exception as e:
+            log.exception("Precompute failed: %s", e)
+
+def refresh_expiring(within):
+    """Refetch the popular searches and covers that expire in the next within seconds, or already have
+
+    Returns how many entries were refreshed. Unlike warm_up(), entries that
+    are still cached are fetched again, so players never see them go cold.
+    """
+    if OFFLINE:
+        return 0
+    deadline = time.time() + within
+    refreshed = 0
+    for query in dict.fromkeys(WARMUP_QUERIES + popularity["queries"].top(PRECOMPUTE_TOP_N)):
+        key = search_key(query)
+        expires = search_cache.expires_at(key)
+        if expires is not None and expires > deadline:
+            continue
+        try:
+            data = _fetch_search_from_discogs(query, 1)
+            album_index.add_many(data.get('results', []))
+            search_cache.set(key, data)
+            refreshed += 1
+        except Exception as e:
+            log.warning("Refresh of search %r failed: %s", query, e)
+    for url in popularity["covers"].top(PRECOMPUTE_TOP_N):
+        expires = cover_cache.expires_at(url)
+        if expires is not None and expires > deadline:
+            continue
+        try:
+            fetch_image(url, refresh=True)
+            refreshed += 1
+        except Exception as e:
+            log.warning("Refresh of cover %s failed: %s", url, e)
+    return refreshed
+
+def keep_alive_loop():
+    """Ping our own public URL so the host doesn't put us to sleep, and refresh popular entries about to expire"""
+    while True:
+        time.sleep(KEEPALIVE_INTERVAL)
+        try:
+            http.get(f"{KEEPALIVE_URL.rstrip('/')}/ping", timeout=10)
+            log.debug("Keep-alive ping sent")
+        except Exception as e:
+            log.warning("Keep-alive ping failed: %s", e)
+        try:
+            # Anything expiring before the next ping would otherwise go cold in between
+            refreshed = refresh_expiring(KEEPALIVE_INTERVAL)
+            if refreshed:
+                log.info("Keep-alive refreshed %s expiring entries", refreshed)
+        except Exception as e:
+            log.exception("Keep-alive refresh failed: %s", e)
+
+_background_started = False
+
+def start_background_tasks():
+    """Start the warm-up, precompute and keep-alive threads once per process"""
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
+    threading.Thread(target=boot_warm_up, name='warmup', daemon=True).start()
+    if PRECOMPUTE_INTERVAL > 0:
+        threading.Thread(target=precompute_loop, name='precompute', daemon=True).start()
+    if KEEPALIVE_URL and KEEPALIVE_INTERVAL > 0:
+        threading.Thread(target=keep_alive_loop, name='keepalive', daemon=True).start()
+
+_background_lock = None
+
+def start_background_tasks_in_one_worker():
+    """Start the background tasks in whichever worker process holds the lock
+
+    Called by gunicorn.conf.py in every worker. The caches are shared, so one
+    worker warming them is enough. The others wait for the lock in a thread,
+    so when the holder exits (or is replaced on a reload) another takes over.
+    """
+    global _background_lock
+    if os.environ.get("BACKEND_WARMUP", "1") == "0":
+        return
+    try:
+        import fcntl
+    except ImportError:
+        start_background_tasks()  # No flock (Windows): every worker warms up
+        return
+    _background_lock = open(SHARED_CACHE_PATH + '.lock', 'w')
+
+    def wait_for_lock():
+        fcntl.flock(_background_lock, fcntl.LOCK_EX)
+        log.info("Worker %s runs the warm-up, precompute and keep-alive tasks", os.getpid())
+        start_background_tasks()
+
+    threading.Thread(target=wait_for_lock, name='background-lock', daemon=True).start()
+
+DEBUG = os.environ.get("FLASK_DEBUG", "0") == "1"
+
+def _should_start_background_tasks():
+    # Only the server entrypoints start the tasks (this file run as a script, and gunicorn.conf.py in a
+    # worker), so importing the module from tests or tools never contacts Discogs
+    if os.environ.get("BACKEND_WARMUP", "1") == "0":
+        return False
+    # `FLASK_DEBUG=1 python discogs_backend.py` runs under the debug reloader, which runs this file in
+    # a watcher process as well; only the child that serves requests (WERKZEUG_RUN_MAIN) should warm up
+    return not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
 if __name__ == '__main__':
-    print("DEBUG: discogs_backend.py - Starting Discogs backend server")
+    # Development server only; deploy with `gunicorn -c gunicorn.conf.py`
+    log.info("Starting Discogs backend server")
+    if _should_start_background_tasks():
+        start_background_tasks()
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=DEBUG, threaded=True)
@@ -1,6 +1,11 @@
+from debug_log import get_logger
+from frame_profiler import get_profiler, SEARCH_SCOPES
+from idle_presenter import IdlePresenter
+from cover_loader import CoverJobs, THUMB_SIZE, remember_thumb
 
-print("discogs_handling.py loaded")
-print("DEBUG: discogs_handling.py - Starting module initialization")
+log = get_logger("discogs_handling")
+log.info("discogs_handling.py loaded")
+log.debug("Starting module initialization")
 
 import pygame
 from shared_constants import *
@@ -9,10 +14,13 @@ import random
 import asyncio
 import os
 import time
-import js
 import json
+try:
+    import js
+except ImportError:
+    js = None  # Desktop build: no browser bridge
 import urllib.parse
-print("DEBUG: discogs_handling.py - All imports completed")
+log.debug("All imports completed")
 
 # Discogs API configuration
 DISCOGS_API_URL = "https://api.discogs.com"
@@ -27,6 +35,16 @@ pygame.init()
 
 USER_ABORT_GAME_FROM_SEARCH = "USER_ABORT_GAME_FROM_SEARCH"
 
+SEARCH_TIMEOUT_SECONDS = 15.0
+SEARCH_POLL_SECONDS = 0.05
+RESULTS_PER_SCREEN = 5
+COVER_TIMEOUT_SECONDS = 10.0
+COVER_DECODE_TIMEOUT_SECONDS = 5.0
+_js_request_id = 0
+
+# Desktop covers awaited through download_and_resize_album_cover_async
+_desktop_covers = CoverJobs()
+
 def is_pyodide():
     """Check if we're running in a browser environment (pygbag/pyodide)"""
     try:
@@ -39,22 +57,26 @@ def is_pyodide():
         # In pygbag/pyodide, we should have all these
         is_browser = has_window and has_fetch and has_eval
         
-        print(f"DEBUG: discogs_handling.py - Environment check: window={has_window}, fetch={has_fetch}, eval={has_eval}, is_browser={is_browser}")
+        log.debug("Environment check: window=%s, fetch=%s, eval=%s, is_browser=%s", has_window, has_fetch, has_eval, is_browser)
         return is_browser
     except ImportError:
-        print("DEBUG: discogs_handling.py - js module not available")
+        log.debug("js module not available")
         return False
     except AttributeError:
-        print("DEBUG: discogs_handling.py - js module available but missing required attributes")
+        log.debug("js module available but missing required attributes")
         return False
 
-async def search_album_via_discogs(query, max_retries=2):
-    """Search for albums using Discogs API with retry logic for backend wake-up"""
-    print(f"DEBUG: discogs_handling.py - search_album_via_discogs called with query: {query}")
+async def search_album_via_discogs(query, max_retries=2, cursor=None):
+    """Search for albums using Discogs API with retry logic for backend wake-up
+
+    cursor is the next_cursor of an earlier backend response, to get the
+    batch after it; the result's next_cursor is None when there are no more.
+    """
+    log.debug("search_album_via_discogs called with query: %s, cursor: %s", query, cursor)
     
     # Check if we're in a browser environment
     if not is_pyodide():
-        print("DEBUG: discogs_handling.py - Not in browser environment, using desktop fallback for search")
+        log.debug("Not in browser environment, using desktop fallback for search")
         # For desktop, return a mock search result
         return {
             'results': [
@@ -77,21 +99,21 @@ async def search_album_via_discogs(query, max_retries=2):
     
     # Try multiple times in case backend is slow to wake up
     for attempt in range(max_retries):
-        print(f"DEBUG: discogs_handling.py - Search attempt {attempt + 1}/{max_retries}")
+        log.debug("Search attempt %s/%s", attempt + 1, max_retries)
         
-        result = await _search_album_single_attempt(query)
+        result = await _search_album_single_attempt(query, cursor)
         if result and 'results' in result:
-            print(f"DEBUG: discogs_handling.py - Search successful on attempt {attempt + 1}")
+            log.debug("Search successful on attempt %s", attempt + 1)
             return result
         
         if attempt < max_retries - 1:
-            print(f"DEBUG: discogs_handling.py - Search failed, retrying in 2 seconds...")
+            log.warning("Search failed, retrying in 2 seconds...")
             await asyncio.sleep(2)
     
-    print(f"DEBUG: discogs_handling.py - All search attempts failed")
+    log.warning("All search attempts failed")
     return None
 
-async def _search_album_single_attempt(query):
+async def _search_album_single_attempt(query, cursor=None):
     """Single attempt to search for albums using Discogs API"""
     try:
         import js
@@ -99,132 +121,118 @@ async def _search_album_single_attempt(query):
         # URL encode the query to handle special characters
         encoded_query = urllib.parse.quote(query)
         
-        # Try to use backend first, fallback to direct API
+        # Try to use backend first, fallback to direct API (first page only: cursors are the backend's)
         search_url = f"{BACKEND_URL}/search?q={encoded_query}"
-        print(f"DEBUG: discogs_handling.py - Backend URL: {search_url}")
+        if cursor:
+            search_url += f"&cursor={urllib.parse.quote(cursor)}"
+        log.debug("Backend URL: %s", search_url)
+        
+        # Each request gets its own result slot, so a background "load more" can't clobber a new search
+        # and a late answer to a search that timed out can't be taken for the next one
+        result_name = _new_js_slot("discogs_search_result")
         
         js_code = f'''
         console.log("JS: Starting Discogs search for: {query}");
         console.log("JS: Fetching from backend URL: {search_url}");
+        window.{result_name}_pending = true;
         
-        fetch("{search_url}", {{
-            method: "GET",
-            headers: {{
-                "Accept": "application/json"
-            }},
-            mode: "cors"
-        }})
-        .then(response => {{
-            console.log("JS: Backend response status:", response.status);
-            console.log("JS: Backend response ok:", response.ok);
-            
-            if (!response.ok) {{
-                console.log("JS: Backend failed, trying direct API");
-                throw new Error(`Backend HTTP error! status: ${{response.status}}`);
-            }}
-            
-            return response.json();
-        }})
-        .then(data => {{
-            console.log("JS: Backend search data received:", data);
-            console.log("JS: Backend data type:", typeof data);
-            console.log("JS: Backend data keys:", Object.keys(data));
-            console.log("JS: Backend data results length:", data.results ? data.results.length : "no results");
-            console.log("JS: Setting window.discogs_search_result");
-            window.discogs_search_result = data;
-            console.log("JS: window.discogs_search_result set:", window.discogs_search_result);
-            return Promise.resolve(); // Don't continue to fallback
-        }})
-        .catch(error => {{
-            console.log("JS: Backend search error:", error);
-            // Fallback to direct Discogs API
-            console.log("JS: Falling back to direct Discogs API");
-            const directUrl = "{DISCOGS_API_URL}/database/search?q={encoded_query}&type=release&format=album";
-            console.log("JS: Direct API URL:", directUrl);
-            
-            return fetch(directUrl, {{
+        (() => {{
+            const deliver = (result) => {{
+                if (window.{result_name}_pending) {{
+                    window.{result_name} = JSON.stringify(result);
+                }}
+            }};
+            fetch("{search_url}", {{
                 method: "GET",
                 headers: {{
-                    "User-Agent": "{DISCOGS_USER_AGENT}",
                     "Accept": "application/json"
                 }},
                 mode: "cors"
             }})
             .then(response => {{
-                if (response && response.ok) {{
-                    console.log("JS: Direct API response ok");
-                    return response.json();
+                console.log("JS: Backend response status:", response.status);
+                console.log("JS: Backend response ok:", response.ok);
+            
+                if (!response.ok) {{
+                    console.log("JS: Backend failed, trying direct API");
+                    throw new Error(`Backend HTTP error! status: ${{response.status}}`);
                 }}
-                console.log("JS: Direct API failed, status:", response ? response.status : "no response");
-                throw new Error("Both backend and direct API failed");
+            
+                return response.json();
             }})
             .then(data => {{
-                console.log("JS: Direct Discogs API data received:", data);
-                window.discogs_search_result = data;
+                console.log("JS: Backend data results length:", data.results ? data.results.length : "no results");
+                deliver(data);
+                return Promise.resolve(); // Don't continue to fallback
+            }})
+            .catch(error => {{
+                console.log("JS: Backend search error:", error);
+                if ({'true' if cursor else 'false'}) {{
+                    throw error;
+                }}
+                // Fallback to direct Discogs API
+                console.log("JS: Falling back to direct Discogs API");
+                const directUrl = "{DISCOGS_API_URL}/database/search?q={encoded_query}&type=release&format=album";
+                console.log("JS: Direct API URL:", directUrl);
+            
+                return fetch(directUrl, {{
+                    method: "GET",
+                    headers: {{
+                        "User-Agent": "{DISCOGS_USER_AGENT}",
+                        "Accept": "application/json"
+                    }},
+                    mode: "cors"
+                }})
+                .then(response => {{
+                    if (response && response.ok) {{
+                        console.log("JS: Direct API response ok");
+                        return response.json();
+                    }}
+                    console.log("JS: Direct API failed, status:", response ? response.status : "no response");
+                    throw new Error("Both backend and direct API failed");
+                }})
+                .then(data => {{
+                    console.log("JS: Direct Discogs API results length:", data.results ? data.results.length : "no results");
+                    deliver(data);
+                }});
+            }})
+            .catch(error => {{
+                console.log("JS: All search methods failed:", error);
+                deliver({{ error: error.toString() }});
             }});
-        }})
-        .catch(error => {{
-            console.log("JS: All search methods failed:", error);
-            window.discogs_search_result = {{ error: error.toString() }};
-        }});
+        }})();
         '''
         
         js.eval(js_code)
-        await asyncio.sleep(0.5)  # Wait for the fetch to complete
-        
-        if hasattr(js.window, 'discogs_search_result'):
-            result = js.window.discogs_search_result
-            print(f"DEBUG: discogs_handling.py - Discogs search result: {result}")
-            print(f"DEBUG: discogs_handling.py - Result type: {type(result)}")
-            print(f"DEBUG: discogs_handling.py - Result string representation: {str(result)}")
-            
-            # Handle different result types
-            if isinstance(result, dict):
-                if 'results' in result:
-                    return result
-                elif 'error' in result:
-                    print(f"DEBUG: discogs_handling.py - Discogs search error: {result['error']}")
-                    return None
-            else:
-                print(f"DEBUG: discogs_handling.py - Unexpected result type: {type(result)}")
-                # Try to convert browser Object to Python dict
-                try:
-                    # Use JavaScript to convert the object to JSON string
-                    js_code = '''
-                    try {
-                        const jsonStr = JSON.stringify(window.discogs_search_result);
-                        window.converted_discogs_result = jsonStr;
-                    } catch(e) {
-                        window.converted_discogs_result = null;
-                    }
-                    '''
-                    js.eval(js_code)
-                    await asyncio.sleep(0.1)
-                    
-                    if hasattr(js.window, 'converted_discogs_result') and js.window.converted_discogs_result:
-                        import json
-                        converted_result = json.loads(js.window.converted_discogs_result)
-                        print(f"DEBUG: discogs_handling.py - Converted result: {converted_result}")
-                        if 'results' in converted_result:
-                            return converted_result
-                        elif 'error' in converted_result:
-                            print(f"DEBUG: discogs_handling.py - Converted Discogs search error: {converted_result['error']}")
-                            return None
-                except Exception as e:
-                    print(f"DEBUG: discogs_handling.py - Error converting browser object: {e}")
-                return None
-        else:
-            print("DEBUG: discogs_handling.py - No Discogs search result available")
+        # Poll rather than sleep a fixed time, so results show as soon as they arrive. The JS side hands
+        # results over as JSON text, which avoids converting browser objects
+        result = await _wait_for_js_slot(result_name, SEARCH_TIMEOUT_SECONDS)
+        if result is None:
+            log.debug("No Discogs search result available")
             return None
+        if 'results' in result:
+            log.debug("Discogs search returned %s entries", len(result['results']))
+            return result
+        log.warning("Discogs search error: %s", result.get('error'))
+        return None
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error in _search_album_single_attempt: {e}")
+        log.warning("Error in _search_album_single_attempt: %s", e)
         return None
 
-async def download_and_resize_album_cover_async(url, target_width, target_height):
-    """Download and resize album cover asynchronously"""
+async def download_and_resize_album_cover_async(url, target_width, target_height, fallback=True):
+    """Download and resize album cover asynchronously
 
+    A failed download gives a generated cover, or None with fallback=False.
+    """
     if not url:
-        return create_fallback_album_cover(target_width, target_height)
+        return create_fallback_album_cover(target_width, target_height) if fallback else None
+    image = await _download_album_cover(url, target_width, target_height)
+    if image is None and fallback:
+        return create_visual_album_cover(url, target_width, target_height)
+    return image
+
+async def _download_album_cover(url, target_width, target_height):
+    """The cover scaled to the target size, or None if it couldn't be downloaded"""
 
     # Try to load the actual image using direct fetch
     try:
@@ -233,78 +241,54 @@ async def download_and_resize_album_cover_async(url, target_width, target_height
 
         # Check if we're in a proper browser environment (pygbag/pyodide)
         if is_pyodide():
-            print(f"DEBUG: discogs_handling.py - Running in pygbag/pyodide environment, using browser download")
+            log.debug("Running in pygbag/pyodide environment, using browser download")
         else:
-            print(f"DEBUG: discogs_handling.py - Desktop environment detected, using Python download")
+            log.debug("Desktop environment detected, using Python download")
             raise ImportError("Desktop environment - use Python fallback")
     except ImportError:
-        print(f"DEBUG: discogs_handling.py - js module not available, trying Python download")
-        # Try to download using Python requests if available
-        try:
-            import requests
-            print(f"DEBUG: discogs_handling.py - Using Python requests to download image")
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                try:
-                    image_data = response.content
-                    import io
-                    image_stream = io.BytesIO(image_data)
-                    image = pygame.image.load(image_stream)
-                    resized_image = pygame.transform.scale(image, (target_width, target_height))
-                    print(f"DEBUG: discogs_handling.py - Successfully downloaded image via Python")
-                    return resized_image
-                except Exception as e:
-                    print(f"DEBUG: discogs_handling.py - Failed to load image from Python download: {e}")
-                    return create_visual_album_cover(url, target_width, target_height)
-            else:
-                print(f"DEBUG: discogs_handling.py - Python download failed with status: {response.status_code}")
-                return create_visual_album_cover(url, target_width, target_height)
-        except ImportError:
-            print(f"DEBUG: discogs_handling.py - requests module not available, using fallback cover")
-            return create_visual_album_cover(url, target_width, target_height)
-        except Exception as e:
-            print(f"DEBUG: discogs_handling.py - Python download failed: {e}")
-            return create_visual_album_cover(url, target_width, target_height)
-
-    # Browser-based download - try backend first, fallback to direct download
+        log.debug("js module not available, downloading on the cover pool")
+        # Fetch, decode and scale run on a worker thread; the event loop keeps going meanwhile
+        image = await _desktop_covers.wait((url, target_width, target_height), url, (target_width, target_height))
+        if image is not None:
+            log.debug("Successfully downloaded image via Python")
+        return image
+
+    # Browser-based download - try backend first, fallback to direct download.
+    # Each download gets its own result slot, so a late answer to one that timed out can't
+    # be taken for another (a slow thumbnail swapped in as the full cover).
+    result_name = _new_js_slot("image_download_result")
     js_code = f'''
     console.log("Starting album cover download for: {url}");
+    window.{result_name}_pending = true;
     
     (async () => {{
+        const deliver = (result) => {{
+            if (window.{result_name}_pending) {{
+                window.{result_name} = JSON.stringify(result);
+            }}
+        }};
         try {{
-            // Try backend first
+            // Try the backend first; its GET /cover is immutable-cacheable, so repeat visits come from the browser cache
             console.log("Trying backend download");
-            const backendResponse = await fetch("{BACKEND_URL}/download_album_cover", {{
-                method: "POST",
-                headers: {{
-                    "Content-Type": "application/json"
-                }},
-                mode: "cors",
-                body: JSON.stringify({{
-                    "image_url": "{url}",
-                    "target_width": {target_width},
-                    "target_height": {target_height}
-                }})
-            }});
-            
-            if (backendResponse.ok) {{
-                const backendData = await backendResponse.json();
-                if (backendData.status === 200 && backendData.data) {{
-                    window.image_download_result = {{ status: 200, data: backendData.data }};
-                    window.image_download_complete = true;
-                    console.log("Backend image download completed successfully");
-                    return;
-                }}
+            let response = null;
+            try {{
+                response = await fetch("{BACKEND_URL}/cover?url=" + encodeURIComponent("{url}"), {{
+                    method: "GET",
+                    mode: "cors"
+                }});
+            }} catch (error) {{
+                console.log("Backend download error:", error);
             }}
             
-            // Fallback to direct download
-            console.log("Backend failed, trying direct download");
-            const response = await fetch("{url}", {{
-                method: "GET"
-            }});
+            if (!response || !response.ok) {{
+                // Fallback to direct download
+                console.log("Backend failed, trying direct download");
+                response = await fetch("{url}", {{
+                    method: "GET"
+                }});
+            }}
             
-            console.log("Direct response status:", response.status);
-            console.log("Direct response ok:", response.ok);
+            console.log("Response status:", response.status);
             
             if (!response.ok) {{
                 throw new Error(`HTTP error! status: ${{response.status}}`);
@@ -314,110 +298,65 @@ async def download_and_resize_album_cover_async(url, target_width, target_height
             const reader = new FileReader();
             
             reader.onload = function() {{
-                const base64data = reader.result.split(',')[1];
-                window.image_download_result = {{ status: 200, data: base64data }};
-                window.image_download_complete = true;
-                console.log("Direct image download completed successfully");
+                deliver({{ status: 200, data: reader.result.split(',')[1] }});
+                console.log("Image download completed successfully");
             }};
             
             reader.onerror = function() {{
                 console.log("FileReader error");
-                window.image_download_result = {{ status: 500, error: "FileReader error" }};
-                window.image_download_complete = true;
+                deliver({{ status: 500, error: "FileReader error" }});
             }};
             
             reader.readAsDataURL(blob);
             
         }} catch (error) {{
             console.log("Album cover download error:", error);
-            window.image_download_result = {{ status: 500, error: error.toString() }};
-            window.image_download_complete = true;
+            deliver({{ status: 500, error: error.toString() }});
         }}
     }})();
     '''
 
     try:
-        print(f"DEBUG: discogs_handling.py - Executing JavaScript code for {url}")
+        log.debug("Executing JavaScript code for %s", url)
         js.eval(js_code)
-        print(f"DEBUG: discogs_handling.py - JavaScript code executed, waiting for result")
-
-        # Wait for the async JavaScript to complete
-        for i in range(10):  # Wait up to 1 second
-            await asyncio.sleep(0.1)  # Wait 100ms each time
-
-            # Check if the download is complete
-            if hasattr(js.window, 'image_download_complete') and js.window.image_download_complete:
-                break
-
-            # Also check if we have a result (in case complete flag isn't set)
-            if hasattr(js.window, 'image_download_result') and js.window.image_download_result is not None:
-                break
-
-        # Get the result and clean up
-        result = None
-        if hasattr(js.window, 'image_download_result'):
-            js_result = js.window.image_download_result
-
-            # Convert JavaScript object to Python dictionary
-            try:
-                if hasattr(js_result, 'status'):
-                    status = js_result.status
-                    data = getattr(js_result, 'data', None)
-                    error = getattr(js_result, 'error', None)
-                    result = {
-                        'status': status,
-                        'data': data,
-                        'error': error
-                    }
-                elif isinstance(js_result, dict):
-                    result = js_result
-                else:
-                    result = None
-
-            except Exception as e:
-                print(f"DEBUG: discogs_handling.py - Error in conversion process: {e}")
-                result = None
-
-            # Clean up the flags for next download
-            try:
-                js.window.image_download_result = None
-                js.window.image_download_complete = False
-            except Exception as e:
-                print(f"DEBUG: discogs_handling.py - Error cleaning up flags: {e}")
-        else:
-            print(f"DEBUG: discogs_handling.py - No image_download_result found in window")
-            return create_visual_album_cover(url, target_width, target_height)
-
-        # Handle different result types
-        if isinstance(result, dict):
-            status = result.get('status', 500)
-            if status == 200:
-                base64_data = result.get('data')
-                if base64_data:
-                    try:
-                        # Convert base64 to pygame surface
-                        resized_image = await base64_to_pygame_surface_pygbag(base64_data, target_width, target_height)
-                        if resized_image:
-                            return resized_image
-                        else:
-                            return create_visual_album_cover(url, target_width, target_height)
-                    except Exception as e:
-                        return create_visual_album_cover(url, target_width, target_height)
-                else:
-                    return create_visual_album_cover(url, target_width, target_height)
-            else:
-                return create_visual_album_cover(url, target_width, target_height)
-        else:
-            return create_visual_album_cover(url, target_width, target_height)
+        result = await _wait_for_js_slot(result_name, COVER_TIMEOUT_SECONDS)
+        if result is None:
+            log.warning("Cover download timed out: %s", url)
+            return None
+        if result.get('status') != 200 or not result.get('data'):
+            log.warning("Cover download failed: %s", result.get('error'))
+            return None
+        # Convert base64 to pygame surface
+        return await base64_to_pygame_surface_pygbag(result['data'], target_width, target_height)
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error in download_and_resize_album_cover_async: {e}")
-        return create_visual_album_cover(url, target_width, target_height)
+        log.warning("Error in download_and_resize_album_cover_async: %s", e)
+        return None
+
+def _new_js_slot(prefix):
+    """A fresh window property name for one browser request's result"""
+    global _js_request_id
+    _js_request_id += 1
+    return f"{prefix}_{_js_request_id}"
+
+async def _wait_for_js_slot(name, timeout):
+    """Poll window.<name> until the JS side fills it with JSON text; returns the decoded value or None
+
+    The slot and its _pending flag are removed either way, so an answer that
+    arrives after the timeout is dropped instead of lingering on window.
+    """
+    import js
+    deadline = time.monotonic() + timeout
+    while getattr(js.window, name, None) is None and time.monotonic() < deadline:
+        await asyncio.sleep(SEARCH_POLL_SECONDS)
+    raw_result = getattr(js.window, name, None)
+    js.eval(f"delete window.{name}; delete window.{name}_pending;")
+    return json.loads(str(raw_result)) if raw_result is not None else None
 
 def download_and_resize_album_cover(url, target_width, target_height):
-    print(f"DEBUG: discogs_handling.py - download_and_resize_album_cover called with url: {url}")
+    log.debug("download_and_resize_album_cover called with url: %s", url)
 
     if not url:
-        print(f"DEBUG: discogs_handling.py - No URL provided, creating fallback")
+        log.debug("No URL provided, creating fallback")
         return create_fallback_album_cover(target_width, target_height)
 
     # Use the async version for browser builds
@@ -428,12 +367,12 @@ def download_and_resize_album_cover(url, target_width, target_height):
         if loop.is_running():
             # If we're already in an async context, we can't use run_until_complete
             # So we'll use the fallback for now
-            print(f"DEBUG: discogs_handling.py - Using fallback cover (async context)")
+            log.debug("Using fallback cover (async context)")
             return create_fallback_album_cover(target_width, target_height)
         else:
             return loop.run_until_complete(download_and_resize_album_cover_async(url, target_width, target_height))
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error in sync wrapper: {e}")
+        log.warning("Error in sync wrapper: %s", e)
         return create_fallback_album_cover(target_width, target_height)
 
 def create_fallback_album_cover(target_width, target_height):
@@ -482,7 +421,7 @@ def create_fallback_album_cover(target_width, target_height):
 
         return surface
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error creating fallback album cover: {e}")
+        log.warning("Error creating fallback album cover: %s", e)
         return None
 
 def create_visual_album_cover(image_url, target_width, target_height):
@@ -491,7 +430,7 @@ def create_visual_album_cover(image_url, target_width, target_height):
         # Generate a unique color pattern based on the image URL
         import hashlib
         hash_value = hashlib.md5(image_url.encode()).hexdigest()
-        print(f"DEBUG: discogs_handling.py - Hash value: {hash_value}")
+        log.debug("Hash value: %s", hash_value)
         
         # Create a surface
         surface = pygame.Surface((target_width, target_height))
@@ -502,11 +441,11 @@ def create_visual_album_cover(image_url, target_width, target_height):
         g_base = int(hash_value[2:4], 16)
         b_base = int(hash_value[4:6], 16)
         
-        print(f"DEBUG: discogs_handling.py - Creating visual cover with base colors: R={r_base}, G={g_base}, B={b_base}")
+        log.debug("Creating visual cover with base colors: R=%s, G=%s, B=%s", r_base, g_base, b_base)
         
         # If all colors are 0, use a fallback
         if r_base == 0 and g_base == 0 and b_base == 0:
-            print(f"DEBUG: discogs_handling.py - All base colors are 0, using fallback colors")
+            log.debug("All base colors are 0, using fallback colors")
             r_base = 128
             g_base = 64
             b_base = 192
@@ -536,7 +475,7 @@ def create_visual_album_cover(image_url, target_width, target_height):
         
         return surface
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error creating visual album cover: {e}")
+        log.warning("Error creating visual album cover: %s", e)
         return create_fallback_album_cover(target_width, target_height)
 
 async def base64_to_pygame_surface_pygbag(base64_data, target_width, target_height):
@@ -547,13 +486,25 @@ async def base64_to_pygame_surface_pygbag(base64_data, target_width, target_heig
         # Decode base64 data
         image_data = base64.b64decode(base64_data)
         
-        # Since pygame.image.load() doesn't work in browser, we'll create a surface
-        # and manually set pixels based on the image data
+        # On desktop pygame can decode the image itself
+        if not is_pyodide():
+            image = pygame.image.load(BytesIO(image_data))
+            return pygame.transform.scale(image, (target_width, target_height))
+        
+        # Since pygame.image.load() doesn't work in browser, a canvas decodes the image and
+        # hands back its RGBA pixels as base64 text, which is copied into a surface in one step
         surface = pygame.Surface((target_width, target_height))
+        result_name = _new_js_slot("album_cover_pixels")
         
         # Use JavaScript to get pixel data from the image
         js_code = f'''
+        window.{result_name}_pending = true;
         try {{
+            const deliver = (result) => {{
+                if (window.{result_name}_pending) {{
+                    window.{result_name} = JSON.stringify(result);
+                }}
+            }};
             // Create a canvas element
             const canvas = document.createElement('canvas');
             canvas.width = {target_width};
@@ -568,16 +519,19 @@ async def base64_to_pygame_surface_pygbag(base64_data, target_width, target_heig
                 // Draw the image on the canvas, scaled to fit
                 ctx.drawImage(img, 0, 0, {target_width}, {target_height});
                 
-                // Get the pixel data
-                const imageData = ctx.getImageData(0, 0, {target_width}, {target_height});
-                window.album_cover_pixels = imageData.data;
-                window.album_cover_loaded = true;
+                // Get the pixel data as base64, built in chunks to stay under the argument limit
+                const pixels = ctx.getImageData(0, 0, {target_width}, {target_height}).data;
+                let binary = "";
+                for (let i = 0; i < pixels.length; i += 0x8000) {{
+                    binary += String.fromCharCode.apply(null, pixels.subarray(i, i + 0x8000));
+                }}
+                deliver({{ status: 200, data: btoa(binary) }});
                 console.log("Album cover pixels extracted successfully");
             }};
             
             img.onerror = function() {{
                 console.log("Failed to load album cover image");
-                window.album_cover_loaded = false;
+                deliver({{ status: 500, error: "Image decode failed" }});
             }};
             
             // Set the base64 data as src
@@ -585,48 +539,38 @@ async def base64_to_pygame_surface_pygbag(base64_data, target_width, target_heig
             
         }} catch(e) {{
             console.log("Error creating canvas:", e);
-            window.album_cover_loaded = false;
+            window.{result_name} = JSON.stringify({{ status: 500, error: e.toString() }});
         }}
         '''
         
         import js
         js.eval(js_code)
         
-        # Wait for the image to load and be drawn to canvas
-        import asyncio
-        await asyncio.sleep(0.3)
-        
-        # Check if the image was loaded successfully
-        if hasattr(js.window, 'album_cover_loaded') and js.window.album_cover_loaded:
-            print(f"DEBUG: discogs_handling.py - Real album cover loaded and drawn to canvas")
-            
-            # Get the pixel data from JavaScript
-            if hasattr(js.window, 'album_cover_pixels'):
-                pixels = js.window.album_cover_pixels
-                
-                # Convert JavaScript array to Python and set pixels
-                for y in range(target_height):
-                    for x in range(target_width):
-                        idx = (y * target_width + x) * 4  # RGBA format
-                        r = int(pixels[idx])
-                        g = int(pixels[idx + 1])
-                        b = int(pixels[idx + 2])
-                        a = int(pixels[idx + 3])
-                        surface.set_at((x, y), (r, g, b, a))
-                
-                print(f"DEBUG: discogs_handling.py - Real album cover surface created: {surface.get_size()}")
-                return surface
-            else:
-                print(f"DEBUG: discogs_handling.py - No pixel data found, using visual representation")
-                return create_visual_album_cover_from_data(image_data, target_width, target_height)
+        # Wait for the image to be decoded and drawn to the canvas
+        result = await _wait_for_js_slot(result_name, COVER_DECODE_TIMEOUT_SECONDS)
+        if result and result.get('status') == 200:
+            log.debug("Real album cover loaded and drawn to canvas")
+            rgba_pixels_to_surface(base64.b64decode(result['data']), surface, target_width, target_height)
+            log.debug("Real album cover surface created: %s", surface.get_size())
+            return surface
         else:
-            print(f"DEBUG: discogs_handling.py - Failed to load real album cover, using visual representation")
+            log.warning("Failed to load real album cover, using visual representation")
             return create_visual_album_cover_from_data(image_data, target_width, target_height)
             
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error creating pygame surface from base64: {e}")
+        log.warning("Error creating pygame surface from base64: %s", e)
         return create_visual_album_cover_from_data(image_data, target_width, target_height)
 
+def rgba_pixels_to_surface(pixels, surface, target_width, target_height):
+    """Copy flat RGBA pixel bytes (canvas ImageData layout) into a surface
+
+    The bytes are wrapped as a surface and blitted in one call, rather than
+    set pixel by pixel, so a 300x300 cover doesn't hold up the event loop.
+    """
+    image = pygame.image.frombuffer(bytes(pixels), (target_width, target_height), 'RGBA')
+    surface.blit(image, (0, 0))
+    return surface
+
 def create_visual_album_cover_from_data(image_data, target_width, target_height):
     """Create a visual album cover from image data when pygame.image.load fails"""
     try:
@@ -676,11 +620,20 @@ def create_visual_album_cover_from_data(image_data, target_width, target_height)
         
         return surface
     except Exception as e:
-        print(f"DEBUG: discogs_handling.py - Error creating visual cover from data: {e}")
+        log.warning("Error creating visual cover from data: %s", e)
         return create_fallback_album_cover(target_width, target_height)
 
 async def get_album_search_input(screen, font):
-    print("DEBUG: discogs_handling.py - get_album_search_input called (START)")
+    # Thumbnails load on the cover pool on desktop; whatever is still loading is dropped on leaving
+    cover_jobs = None if is_pyodide() else CoverJobs()
+    try:
+        return await _album_search_screen(screen, font, cover_jobs)
+    finally:
+        if cover_jobs:
+            cover_jobs.cancel()
+
+async def _album_search_screen(screen, font, cover_jobs):
+    log.debug("get_album_search_input called (START)")
     
     input_box = pygame.Rect(width // 2 - 200, 100, 400, 50)
     results_area = pygame.Rect(width // 2 - 200, 160, 400, 300)
@@ -693,21 +646,31 @@ async def get_album_search_input(screen, font):
     album_covers = {}
     quit_button_font = pygame.font.SysFont("Press Start 2P", 20)
     quit_button_rect_local = pygame.Rect(20, height - 70, 250, 50)
+    count_font = pygame.font.SysFont('corbel', 12)
     
     # Cursor variables
     cursor_visible = True
-    cursor_timer = 0
-    cursor_blink_rate = 500  # milliseconds
+    cursor_blink_rate = 0.5  # seconds
     
     # Loading state variable
     is_searching = False
+    
+    # Every unique album found so far; search_results is the slice on screen. More batches are
+    # fetched in the background through the backend's cursor before the player scrolls to them.
+    all_results = []
+    seen_combinations = set()
+    scroll = 0
+    next_cursor = None
+    search_query = ''
+    search_generation = 0
+    more_task = None
 
     async def draw_search_results_local():
         nonlocal album_covers
         
         # Show loading message if searching
         if is_searching:
-            print(f"DEBUG: discogs_handling.py - Displaying loading message")
+            log.debug("Displaying loading message")
             loading_font = pygame.font.SysFont("Press Start 2P", 20)
             loading_text = loading_font.render("Searching for album... hang on", True, WHITE)
             loading_rect = loading_text.get_rect(center=(width // 2, 250))
@@ -724,20 +687,32 @@ async def get_album_search_input(screen, font):
                     pygame.draw.rect(screen, WHITE, result_rect)
                 pygame.draw.rect(screen, DARK_BLUE, result_rect, 1)
 
-                # Download cover on-demand if needed
-                if album['image_url'] and album['id'] not in album_covers:
+                # Download cover on-demand if needed; the small thumbnail is enough here, and
+                # it is remembered so the game can start on it (see start_game)
+                thumb_url = album.get('thumb') or album['image_url']
+                if thumb_url and album['id'] not in album_covers and cover_jobs:
+                    # Poll the pool job; a full pool means trying again on the next redraw
+                    future = cover_jobs.submit(album['id'], thumb_url, (THUMB_SIZE, THUMB_SIZE))
+                    if future is not None and future.done():
+                        thumb = cover_jobs.result(future)
+                        if thumb:
+                            remember_thumb(thumb_url, thumb)
+                            album_covers[album['id']] = pygame.transform.scale(thumb, (60, 60))
+                        else:
+                            album_covers[album['id']] = create_fallback_album_cover(50, 50)
+                elif thumb_url and album['id'] not in album_covers:
                     try:
-                        print(f"DEBUG: discogs_handling.py - Downloading cover on-demand for {album['title']}")
-                        # Download the real cover at higher quality
-                        real_cover = await download_and_resize_album_cover_async(album['image_url'], 120, 120)
+                        log.debug("Downloading cover on-demand for %s", album['title'])
+                        real_cover = await download_and_resize_album_cover_async(thumb_url, THUMB_SIZE, THUMB_SIZE, fallback=False)
                         if real_cover:
-                            album_covers[album['id']] = real_cover
-                            print(f"DEBUG: discogs_handling.py - Downloaded real cover for {album['title']}")
+                            remember_thumb(thumb_url, real_cover)
+                            album_covers[album['id']] = pygame.transform.scale(real_cover, (60, 60))
+                            log.debug("Downloaded real cover for %s", album['title'])
                         else:
-                            print(f"DEBUG: discogs_handling.py - Failed to download real cover for {album['title']}, using fallback")
-                            album_covers[album['id']] = create_fallback_album_cover(50, 50)
+                            log.warning("Failed to download real cover for %s, using fallback", album['title'])
+                            album_covers[album['id']] = create_visual_album_cover(thumb_url, 60, 60)
                     except Exception as e:
-                        print(f"DEBUG: discogs_handling.py - Exception in on-demand download: {e}")
+                        log.warning("Exception in on-demand download: %s", e)
                         album_covers[album['id']] = create_fallback_album_cover(50, 50)
 
                 # Draw the cover
@@ -747,9 +722,13 @@ async def get_album_search_input(screen, font):
                     cover_rect = pygame.Rect(result_rect.x + 10, result_rect.y + 10, 60, 60)
                     pygame.draw.rect(screen, (100, 100, 100), cover_rect)  # Gray background
                     # Scale the cover to be larger and more visible
-                    scaled_cover = pygame.transform.scale(cover, (60, 60))
+                    scaled_cover = cover if cover.get_size() == (60, 60) else pygame.transform.scale(cover, (60, 60))
                     screen.blit(scaled_cover, (result_rect.x + 10, result_rect.y + 10))
                     text_start_x = result_rect.x + 80
+                elif cover_jobs and thumb_url:
+                    # Still loading or waiting for a pool slot: keep it gray until the cover is ready
+                    pygame.draw.rect(screen, (100, 100, 100), pygame.Rect(result_rect.x + 10, result_rect.y + 10, 60, 60))
+                    text_start_x = result_rect.x + 80
                 else:
                     # Create a fallback cover for albums without images
                     fallback_cover = create_fallback_album_cover(50, 50)
@@ -775,13 +754,83 @@ async def get_album_search_input(screen, font):
             no_results_surf = font.render("Press Enter to search", True, WHITE)
             screen.blit(no_results_surf, (results_area.x + 10, results_area.y + 10))
 
+    def clear_covers():
+        album_covers.clear()
+        if cover_jobs:
+            cover_jobs.cancel()
+
+    def add_results(discogs_results):
+        """Append the new unique releases and remember the cursor for the next batch"""
+        nonlocal next_cursor
+        next_cursor = discogs_results.get('next_cursor')
+        for album in discogs_results['results']:
+            # Only include releases; the backend's slim results are all releases and omit the type
+            if album.get('type', 'release') != 'release':
+                continue
+            title = album.get('title', 'Unknown Album')
+            
+            # Extract artist from title (usually "Artist - Album" format)
+            if ' - ' in title:
+                artist, album_name = title.split(' - ', 1)
+            else:
+                artist = "Unknown"
+                album_name = title
+            
+            # Create a unique key for artist + album combination
+            key = f"{artist}|{album_name}"
+            
+            if key not in seen_combinations:
+                seen_combinations.add(key)
+                all_results.append({
+                    'title': title,
+                    'id': album.get('id', 0),
+                    'image_url': album.get('cover_image', album.get('thumb', None)),
+                    'thumb': album.get('thumb'),
+                    'artist': artist
+                })
+
+    def show_results():
+        nonlocal search_results, scroll
+        scroll = max(0, min(scroll, len(all_results) - RESULTS_PER_SCREEN))
+        search_results = all_results[scroll:scroll + RESULTS_PER_SCREEN]
+        presenter.invalidate()
+
+    async def load_more(generation):
+        results = await search_album_via_discogs(search_query, max_retries=1, cursor=next_cursor)
+        # Drop the batch if a new search started meanwhile
+        if generation == search_generation and results and 'results' in results:
+            add_results(results)
+            log.debug("Loaded more results, %s albums total", len(all_results))
+            show_results()
+
+    def maybe_load_more():
+        """Fetch the next batch once the player is within a screen of the end"""
+        nonlocal more_task
+        if not next_cursor or (more_task and not more_task.done()):
+            return
+        if scroll + 2 * RESULTS_PER_SCREEN >= len(all_results):
+            more_task = asyncio.create_task(load_more(search_generation))
+
+    def hovered_result_index():
+        mouse_pos = pygame.mouse.get_pos()
+        for i in range(len(search_results)):
+            result_rect = pygame.Rect(results_area.x + 5, results_area.y + 10 + i * 80, results_area.width - 10, 70)
+            if result_rect.collidepoint(mouse_pos):
+                return i
+        return None
+
+    profiler = get_profiler("get_album_search_input", SEARCH_SCOPES)
+    presenter = IdlePresenter()
+
     loop_iteration = 0
     while True:
         loop_iteration += 1
-        for event in pygame.event.get():
+        events = await presenter.wait_for_events()
+        profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
-                print("DEBUG: discogs_handling.py - User quit during album search UI")
-                print("DEBUG: discogs_handling.py - get_album_search_input returning USER_ABORT_GAME_FROM_SEARCH")
+                log.debug("User quit during album search UI")
+                log.debug("get_album_search_input returning USER_ABORT_GAME_FROM_SEARCH")
                 return USER_ABORT_GAME_FROM_SEARCH
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if input_box.collidepoint(event.pos):
@@ -790,27 +839,41 @@ async def get_album_search_input(screen, font):
                     active = False
                 color = color_active if active else color_inactive
                 if quit_button_rect_local.collidepoint(event.pos):
-                    print("DEBUG: discogs_handling.py - User clicked BACK TO MENU during album search UI")
-                    print("DEBUG: discogs_handling.py - get_album_search_input returning BACK_TO_MENU")
+                    log.debug("User clicked BACK TO MENU during album search UI")
+                    log.debug("get_album_search_input returning BACK_TO_MENU")
                     return "BACK_TO_MENU"
                 if search_results:
                     y_offset_click = results_area.y + 10
                     for album_click in search_results:
                         result_rect_click = pygame.Rect(results_area.x + 5, y_offset_click, results_area.width - 10, 70)
                         if result_rect_click.collidepoint(event.pos):
-                            print(f"DEBUG: discogs_handling.py - User selected album: {album_click}")
-                            print("DEBUG: discogs_handling.py - get_album_search_input returning album result")
+                            log.debug("User selected album: %s", album_click)
+                            log.debug("get_album_search_input returning album result")
                             return album_click
                         y_offset_click += 80
+            if event.type == pygame.KEYDOWN and profiler.handle_key(event.key):
+                continue
+            # Mouse wheel or up/down arrows scroll through the results
+            scroll_step = 0
+            if event.type == pygame.MOUSEWHEEL:
+                scroll_step = -event.y
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_UP, pygame.K_DOWN):
+                scroll_step = 1 if event.key == pygame.K_DOWN else -1
+            if scroll_step:
+                if all_results:
+                    scroll += scroll_step
+                    show_results()
+                    maybe_load_more()
+                continue
             if event.type == pygame.KEYDOWN:
                 if active:
                     if event.key == pygame.K_RETURN:
                         if text:
-                            print(f"DEBUG: discogs_handling.py - Searching for: {text}")
+                            log.debug("Searching for: %s", text)
                             
                             # Set loading state and search
                             is_searching = True
-                            print("DEBUG: discogs_handling.py - Loading state set to True")
+                            log.debug("Loading state set to True")
                             
                             # Force a UI update to show loading message
                             screen.fill((30, 30, 30))
@@ -831,55 +894,31 @@ async def get_album_search_input(screen, font):
                             screen.blit(quit_text_surf, quit_text_rect)
                             pygame.display.flip()
                             
-                            # Small delay to make loading message visible
-                            await asyncio.sleep(0.3)
-                            
                             # Use Discogs search
+                            search_generation += 1
+                            if more_task and not more_task.done():
+                                more_task.cancel()
+                            search_query = text
+                            all_results = []
+                            seen_combinations = set()
+                            next_cursor = None
+                            scroll = 0
                             search_results = []
                             discogs_results = await search_album_via_discogs(text)
                             
                             if discogs_results and 'results' in discogs_results:
-                                albums_found = len(discogs_results['results'])
-                                
-                                # Filter and deduplicate albums by title and artist
-                                unique_albums = []
-                                seen_combinations = set()
-                                
-                                for album in discogs_results['results']:
-                                    if album.get('type') == 'release':  # Only include releases
-                                        title = album.get('title', 'Unknown Album')
-                                        
-                                        # Extract artist from title (usually "Artist - Album" format)
-                                        if ' - ' in title:
-                                            artist, album_name = title.split(' - ', 1)
-                                        else:
-                                            artist = "Unknown"
-                                            album_name = title
-                                        
-                                        # Create a unique key for artist + album combination
-                                        key = f"{artist}|{album_name}"
-                                        
-                                        if key not in seen_combinations:
-                                            seen_combinations.add(key)
-                                            album_data = {
-                                                'title': title,
-                                                'id': album.get('id', 0),
-                                                'image_url': album.get('cover_image', album.get('thumb', None)),
-                                                'artist': artist
-                                            }
-                                            unique_albums.append(album_data)
-                                
-                                # Take only the first 5 unique albums
-                                search_results = unique_albums[:5]
-                                print(f"DEBUG: discogs_handling.py - Found {albums_found} albums, displaying top 5")
+                                add_results(discogs_results)
+                                show_results()
+                                log.debug("Found %s albums, displaying top %s", len(all_results), RESULTS_PER_SCREEN)
+                                maybe_load_more()
                                 # Clear any old covers - we'll download them on-demand in the drawing function
-                                album_covers.clear()
+                                clear_covers()
                                 
                                 # Clear loading state after search completes - covers will download on-demand
                                 is_searching = False
-                                print("DEBUG: discogs_handling.py - Loading state set to False (search complete)")
+                                log.debug("Loading state set to False (search complete)")
                             else:
-                                print(f"DEBUG: discogs_handling.py - No albums found in search results")
+                                log.debug("No albums found in search results")
                                 # Create a fallback result if search fails
                                 search_results = [
                                     {
@@ -889,23 +928,33 @@ async def get_album_search_input(screen, font):
                                         'artist': 'Unknown Artist'
                                     }
                                 ]
-                                album_covers.clear()
+                                clear_covers()
                                 
                                 # Clear loading state after everything is complete
                                 is_searching = False
-                                print("DEBUG: discogs_handling.py - Loading state set to False (no results)")
+                                log.debug("Loading state set to False (no results)")
                     elif event.key == pygame.K_BACKSPACE:
                         text = text[:-1]
                         if not text:
                             search_results = []
-                            album_covers.clear()
+                            all_results = []
+                            clear_covers()
                     else:
                         text += event.unicode
+                    presenter.restart_blink()
+        profiler.mark('events')
+        
+        # Only redraw for input, a hover change or the next cursor blink
+        presenter.watch('hover', hovered_result_index())
+        cursor_visible = active and presenter.blink(cursor_blink_rate)
+        if not presenter.needs_redraw():
+            continue
         screen.fill((30, 30, 30))
         if game_bg:
             screen.blit(game_bg, (0, 0))
         else:
             screen.fill(DARK_GREY)
+        profiler.mark('draw_background')
         label_font = pygame.font.SysFont("Press Start 2P", 25)
         label = label_font.render("Search for an album:", True, WHITE)
         screen.blit(label, (input_box.x, input_box.y - 40))
@@ -922,44 +971,49 @@ async def get_album_search_input(screen, font):
             pygame.draw.line(screen, BLACK, (cursor_x, cursor_y), (cursor_x, cursor_y + cursor_height), 2)
         
         pygame.draw.rect(screen, color, input_box, 2)
+        profiler.mark('hud')
         await draw_search_results_local()
+        if len(all_results) > RESULTS_PER_SCREEN and not is_searching:
+            more = "+" if next_cursor else ""
+            count_surf = count_font.render(f"{scroll + 1}-{scroll + len(search_results)} of {len(all_results)}{more} (scroll for more)", True, WHITE)
+            screen.blit(count_surf, (input_box.right - count_surf.get_width(), input_box.bottom + 1))
+        profiler.mark('draw_results')
         pygame.draw.rect(screen, LIGHT_BLUE, quit_button_rect_local)
         quit_text_surf = quit_button_font.render("BACK TO MENU", True, BLACK)
         quit_text_rect = quit_text_surf.get_rect(center=quit_button_rect_local.center)
         screen.blit(quit_text_surf, quit_text_rect)
-        # Update cursor blinking
-        cursor_timer += 16  # Approximately 60 FPS
-        if cursor_timer >= cursor_blink_rate:
-            cursor_visible = not cursor_visible
-            cursor_timer = 0
+        profiler.draw_overlay(screen)
+        profiler.mark('hud')
         
         pygame.display.flip()
-        await asyncio.sleep(0.01)
-    print("DEBUG: discogs_handling.py - get_album_search_input called (END, should never reach here)")
+        presenter.presented()
+        profiler.mark('flip')
+        profiler.end_frame()
+    log.debug("get_album_search_input called (END, should never reach here)")
 
 # Placeholder functions for compatibility (no playback in Discogs)
 async def play_random_track_from_album(album_id, song_info_updater_callback):
     """Placeholder function - Discogs doesn't have playback"""
-    print(f"DEBUG: discogs_handling.py - play_random_track_from_album called (no playback in Discogs)")
+    log.debug("play_random_track_from_album called (no playback in Discogs)")
     song_info_updater_callback("Discogs Album", "No Playback Available", False)
 
 def play_uri_with_details(track_uri, position_ms=0):
     """Placeholder function - Discogs doesn't have playback"""
-    print(f"DEBUG: discogs_handling.py - play_uri_with_details called (no playback in Discogs)")
+    log.debug("play_uri_with_details called (no playback in Discogs)")
     return False, "No Playback", "Discogs"
 
 async def safe_pause_playback():
     """Placeholder function - Discogs doesn't have playback"""
-    print("DEBUG: discogs_handling.py - safe_pause_playback called (no playback in Discogs)")
+    log.debug("safe_pause_playback called (no playback in Discogs)")
     return True
 
 async def cleanup():
     """Placeholder function - Discogs doesn't have playback"""
-    print("DEBUG: discogs_handling.py - cleanup called (no playback in Discogs)")
+    log.debug("cleanup called (no playback in Discogs)")
     return True
 
 def setup_page_unload_handler():
     """Placeholder function - Discogs doesn't have playback"""
-    print("DEBUG: discogs_handling.py - setup_page_unload_handler called (no playback in Discogs)")
+    log.debug("setup_page_unload_handler called (no playback in Discogs)")
     pass
 
@@ -0,0 +1,200 @@
+"""Per-frame timing instrumentation for the game and search loops.
+
+A loop calls begin_frame() at the top, mark(scope) after each section and
+end_frame() at the bottom. mark() charges the time since the previous mark
+to the named scope, so instrumenting a loop costs one perf_counter() call
+per section. Finished frames go into a fixed-size ring buffer.
+
+F3 toggles an overlay with p50/p95/p99 frame times and per-scope means,
+F4 dumps the buffer to JSON so desktop and WebAssembly runs can be compared.
+"""
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from time import perf_counter
+
+import pygame
+from debug_log import get_logger
+
+log = get_logger("frame_profiler")
+
+DEFAULT_CAPACITY = 600
+OVERLAY_REFRESH_FRAMES = 15
+
+GAME_SCOPES = ('events', 'simulate', 'draw_background', 'draw_tiles', 'draw_snake', 'hud', 'flip', 'sleep')
+# The search screen only draws when something changed, so it has no sleep scope
+SEARCH_SCOPES = ('events', 'draw_background', 'draw_results', 'hud', 'flip')
+
+TOGGLE_OVERLAY_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+
+_profilers = {}
+
+def is_browser():
+    return sys.platform == 'emscripten'
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+class FrameProfiler:
+    """Ring buffer of per-scope frame timings"""
+
+    def __init__(self, name, scopes, capacity=DEFAULT_CAPACITY):
+        self.name = name
+        self.scopes = tuple(scopes)
+        self.capacity = capacity
+        self._scope_index = {scope: i for i, scope in enumerate(self.scopes)}
+        self._samples = [array('d', bytes(8 * capacity)) for _ in self.scopes]
+        self._frame_times = array('d', bytes(8 * capacity))
+        self._current = [0.0] * len(self.scopes)
+        self._count = 0
+        self._frame_start = None
+        self._last = 0.0
+        self.overlay_visible = False
+        self._overlay_font = None
+        self._overlay_surface = None
+        self._overlay_built_at = -1
+
+    def begin_frame(self):
+        self._frame_start = self._last = perf_counter()
+        current = self._current
+        for i in range(len(current)):
+            current[i] = 0.0
+
+    def mark(self, scope):
+        """Charge the time since the previous mark to scope"""
+        now = perf_counter()
+        self._current[self._scope_index[scope]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        slot = self._count % self.capacity
+        for samples, value in zip(self._samples, self._current):
+            samples[slot] = value
+        self._frame_times[slot] = self._last - self._frame_start
+        self._count += 1
+        self._frame_start = None
+
+    def reset(self):
+        self._count = 0
+        self._frame_start = None
+        self._overlay_built_at = -1
+
+    @property
+    def frame_count(self):
+        return min(self._count, self.capacity)
+
+    def _chronological(self, values):
+        """Return buffered values oldest first"""
+        if self._count <= self.capacity:
+            return list(values[:self._count])
+        start = self._count % self.capacity
+        return list(values[start:]) + list(values[:start])
+
+    def summary(self):
+        """Frame time percentiles and per-scope statistics, in milliseconds"""
+        frames = sorted(self._chronological(self._frame_times))
+        result = {
+            'frames': len(frames),
+            'frame_ms': {
+                'p50': percentile(frames, 0.50) * 1000,
+                'p95': percentile(frames, 0.95) * 1000,
+                'p99': percentile(frames, 0.99) * 1000,
+                'max': (frames[-1] if frames else 0.0) * 1000,
+            },
+            'scopes_ms': {},
+        }
+        for scope, samples in zip(self.scopes, self._samples):
+            values = sorted(self._chronological(samples))
+            result['scopes_ms'][scope] = {
+                'mean': (sum(values) / len(values) * 1000) if values else 0.0,
+                'p95': percentile(values, 0.95) * 1000,
+            }
+        return result
+
+    def to_dict(self):
+        return {
+            'profiler': self.name,
+            'platform': 'wasm' if is_browser() else sys.platform,
+            'python': sys.version.split()[0],
+            'pygame': pygame.version.ver,
+            'timestamp': time.time(),
+            'capacity': self.capacity,
+            'summary': self.summary(),
+            'frame_ms': [value * 1000 for value in self._chronological(self._frame_times)],
+            'scope_ms': {
+                scope: [value * 1000 for value in self._chronological(samples)]
+                for scope, samples in zip(self.scopes, self._samples)
+            },
+        }
+
+    def dump_json(self, path=None):
+        """Write the buffer as JSON; in the browser it goes to the console instead"""
+        text = json.dumps(self.to_dict())
+        if is_browser() and path is None:
+            print(f"PROFILE_JSON {text}")
+            return text
+        if path is None:
+            path = f"profile_{self.name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w') as f:
+            f.write(text)
+        log.info("Profile for %s written to %s", self.name, os.path.abspath(path))
+        return text
+
+    def handle_key(self, key):
+        """Handle the profiler hotkeys; returns True if the key was used"""
+        if key == TOGGLE_OVERLAY_KEY:
+            self.overlay_visible = not self.overlay_visible
+            self._overlay_built_at = -1
+            return True
+        if key == DUMP_KEY:
+            self.dump_json()
+            return True
+        return False
+
+    def draw_overlay(self, surface):
+        """Draw the stats box in the top-right corner if the overlay is on"""
+        if not self.overlay_visible:
+            return
+        if self._overlay_surface is None or self._count - self._overlay_built_at >= OVERLAY_REFRESH_FRAMES:
+            self._overlay_surface = self._build_overlay()
+            self._overlay_built_at = self._count
+        surface.blit(self._overlay_surface, (surface.get_width() - self._overlay_surface.get_width() - 5, 5))
+
+    def _build_overlay(self):
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.SysFont("Courier New", 12, bold=True)
+        stats = self.summary()
+        frame = stats['frame_ms']
+        lines = [
+            f"{self.name} ({stats['frames']} frames)",
+            f"p50 {frame['p50']:6.2f} ms",
+            f"p95 {frame['p95']:6.2f} ms",
+            f"p99 {frame['p99']:6.2f} ms",
+        ]
+        for scope, scope_stats in stats['scopes_ms'].items():
+            lines.append(f"{scope[:15]:<15} {scope_stats['mean']:6.2f}")
+        rendered = [self._overlay_font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self._overlay_font.get_linesize()
+        box = pygame.Surface((max(r.get_width() for r in rendered) + 10, line_height * len(rendered) + 10), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 180))
+        for i, text in enumerate(rendered):
+            box.blit(text, (5, 5 + i * line_height))
+        return box
+
+def get_profiler(name, scopes, capacity=DEFAULT_CAPACITY):
+    """Return the named profiler, creating it on first use"""
+    profiler = _profilers.get(name)
+    if profiler is None:
+        profiler = FrameProfiler(name, scopes, capacity)
+        _profilers[name] = profiler
+    return profiler
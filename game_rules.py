@@ -0,0 +1,249 @@
+"""Snake movement, food and album-reveal rules, independent of any drawing.
+
+start_game drives a SnakeGame once per frame and renders its state; the
+benchmarks (and anything else that needs to play games without a screen)
+use the same class directly. Board and tile sizes are constructor arguments
+and the revealed pieces live in a TileGrid bitset, so a 64x64-tile puzzle
+costs the same per tick as the default 10x10 one.
+"""
+import random
+import time
+from functools import lru_cache
+
+from shared_constants import width, height, GRID_SIZE, ALBUM_GRID_SIZE, SNAKE_SPEED
+from debug_log import get_logger
+
+log = get_logger("game_rules")
+
+SNAKE_LENGTH = 5  # The snake is a fixed size and does not grow
+SPEED_INCREASE_INTERVAL = 5  # Speed goes up every 5 pieces
+FOOD_RANDOM_ATTEMPTS = 100
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# Results of SnakeGame.step()
+MOVED = "MOVED"
+ATE = "ATE"
+HIT_WALL = "HIT_WALL"
+HIT_SELF = "HIT_SELF"
+WON = "WON"
+
+class TileGrid:
+    """Set of (col, row) cells on a fixed grid, stored one bit per cell
+
+    Supports the set operations the game uses (in, add, discard, len,
+    iteration) with O(1) membership and a running count.
+    """
+    __slots__ = ('cols', 'rows', '_bits', '_count')
+
+    def __init__(self, cols, rows, cells=()):
+        self.cols = cols
+        self.rows = rows
+        self._bits = bytearray((cols * rows + 7) // 8)
+        self._count = 0
+        for cell in cells:
+            self.add(cell)
+
+    def _index(self, cell):
+        col, row = cell
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def __contains__(self, cell):
+        # Inlined _index(): this is on the food-placement hot path
+        col, row = cell
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            index = row * self.cols + col
+            return (self._bits[index >> 3] >> (index & 7)) & 1 == 1
+        return False
+
+    def add(self, cell):
+        index = self._index(cell)
+        if index < 0:
+            raise ValueError(f"{cell} is outside the {self.cols}x{self.rows} grid")
+        mask = 1 << (index & 7)
+        if not self._bits[index >> 3] & mask:
+            self._bits[index >> 3] |= mask
+            self._count += 1
+
+    def discard(self, cell):
+        index = self._index(cell)
+        if index >= 0:
+            mask = 1 << (index & 7)
+            if self._bits[index >> 3] & mask:
+                self._bits[index >> 3] &= ~mask
+                self._count -= 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        cols = self.cols
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            base = byte_index << 3
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield divmod(base + bit, cols)[::-1]
+
+    def is_full(self):
+        return self._count == self.cols * self.rows
+
+    def copy(self):
+        grid = TileGrid(self.cols, self.rows)
+        grid._bits[:] = self._bits
+        grid._count = self._count
+        return grid
+
+    def __repr__(self):
+        return f"TileGrid({self.cols}x{self.rows}, {self._count} set)"
+
+@lru_cache(maxsize=None)
+def eatable_pieces(food_width, food_height, grid_size, album_grid_size):
+    """Album pieces that contain at least one snake cell
+
+    The eatable cells are a product of columns and rows, so the count is the
+    number of piece columns hit by a snake column times the same for rows.
+    """
+    def hit(extent):
+        return len({x // album_grid_size for x in range(0, extent, grid_size)})
+    return hit(food_width) * hit(food_height)
+
+class SnakeGame:
+    """State of a single game; step() advances it by one tick"""
+
+    def __init__(self, seed=None, board_width=width, board_height=height,
+                 grid_size=GRID_SIZE, album_grid_size=ALBUM_GRID_SIZE, start_speed=SNAKE_SPEED,
+                 speed_increase_interval=SPEED_INCREASE_INTERVAL):
+        if album_grid_size < grid_size:
+            raise ValueError(f"Album pieces of {album_grid_size}px are smaller than a {grid_size}px snake cell")
+        self.seed = seed if seed is not None else int(time.time() * 1000)
+        self.rng = random.Random(self.seed)
+        self.board_width = board_width
+        self.board_height = board_height
+        self.grid_size = grid_size
+        self.album_grid_size = album_grid_size
+        self.cols = board_width // grid_size
+        self.rows = board_height // grid_size
+        self.album_cols = board_width // album_grid_size
+        self.album_rows = board_height // album_grid_size
+        # Food only spawns over whole album pieces, in case the board isn't an exact multiple
+        self.food_width = min(board_width, self.album_cols * album_grid_size)
+        self.food_height = min(board_height, self.album_rows * album_grid_size)
+        # Only pieces that contain a snake cell can be eaten, so the win condition counts those
+        self.total_pieces = eatable_pieces(self.food_width, self.food_height, grid_size, album_grid_size)
+
+        start_x = (self.cols // 2) * grid_size
+        start_y = (self.rows // 2) * grid_size
+        self.snake_body = [(start_x - i * grid_size, start_y) for i in range(SNAKE_LENGTH)]
+        self.direction = RIGHT
+        self._turned_this_tick = False
+
+        self.food = None
+        self.revealed_pieces = TileGrid(self.album_cols, self.album_rows)
+        self.score = 0
+        self.pieces_eaten = 0
+        self.current_speed = start_speed
+        self.speed_increase_interval = speed_increase_interval
+        self.tick = 0
+        self.food_rejections = 0
+        self.game_over = False
+        self.won = False
+        self.death_cause = None
+
+        self.generate_food()
+
+    def change_direction(self, direction):
+        """Queue a turn for the next tick; reversing and double turns are ignored"""
+        if self._turned_this_tick or self.game_over:
+            return False
+        if direction[0] == -self.direction[0] and direction[1] == -self.direction[1]:
+            return False
+        if direction == self.direction:
+            return False
+        self.direction = direction
+        self._turned_this_tick = True
+        return True
+
+    def album_cell(self, pos):
+        return (pos[0] // self.album_grid_size, pos[1] // self.album_grid_size)
+
+    def is_free_food_cell(self, pos):
+        # The body is always SNAKE_LENGTH segments, so a list check is already constant time
+        album_grid = self.album_grid_size
+        return pos not in self.snake_body and (pos[0] // album_grid, pos[1] // album_grid) not in self.revealed_pieces
+
+    def generate_food(self):
+        """Place food on a random cell that is not under the snake or a revealed piece"""
+        grid = self.grid_size
+        for _ in range(FOOD_RANDOM_ATTEMPTS):
+            pos = (self.rng.randrange(0, self.food_width, grid), self.rng.randrange(0, self.food_height, grid))
+            if self.is_free_food_cell(pos):
+                self.food = pos
+                if log.debug_enabled:
+                    log.debug("Generated food at %s, revealed pieces: %s", pos, len(self.revealed_pieces))
+                return pos
+            self.food_rejections += 1
+
+        log.debug("Could not find valid food position after %s attempts", FOOD_RANDOM_ATTEMPTS)
+        # Fallback: scan for any available position
+        for x in range(0, self.food_width, grid):
+            for y in range(0, self.food_height, grid):
+                if self.is_free_food_cell((x, y)):
+                    self.food = (x, y)
+                    log.debug("Fallback food at %s", self.food)
+                    return self.food
+        self.food = None
+        return None
+
+    def step(self):
+        """Advance one tick and return what happened"""
+        if self.game_over:
+            return self.death_cause or WON
+        self.tick += 1
+        self._turned_this_tick = False
+
+        head_x, head_y = self.snake_body[0]
+        new_head = (head_x + self.direction[0] * self.grid_size, head_y + self.direction[1] * self.grid_size)
+
+        if not (0 <= new_head[0] < self.board_width and 0 <= new_head[1] < self.board_height):
+            return self._end(HIT_WALL)
+        if new_head in self.snake_body:
+            return self._end(HIT_SELF)
+        if len(self.revealed_pieces) >= self.total_pieces:
+            self.won = True
+            return self._end(WON)
+
+        # Fixed size: drop the tail and add the new head
+        self.snake_body.pop()
+        self.snake_body.insert(0, new_head)
+
+        if new_head != self.food:
+            return MOVED
+
+        self.score += 10
+        self.pieces_eaten += 1
+        piece = self.album_cell(new_head)
+        if piece not in self.revealed_pieces:
+            self.revealed_pieces.add(piece)
+            log.debug("Food eaten, score: %s, revealed piece at grid %s", self.score, piece)
+        else:
+            log.warning("Grid position %s already revealed!", piece)
+
+        if self.speed_increase_interval and self.pieces_eaten % self.speed_increase_interval == 0:
+            self.current_speed += 1
+            log.debug("Speed increased to %s", self.current_speed)
+
+        self.generate_food()
+        return ATE
+
+    def _end(self, cause):
+        self.game_over = True
+        self.death_cause = None if cause == WON else cause
+        log.debug("Game over (%s) at tick %s", cause, self.tick)
+        return cause
@@ -0,0 +1,41 @@
+"""Production server profile for discogs_backend.py.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app), which also loads the
+saved search index, and is then forked into WEB_CONCURRENCY workers of
+GUNICORN_THREADS threads each. Workers share one SQLite cache file, so a
+search or cover fetched by one worker is a cache hit in all of them. One
+worker runs the warm-up, precompute and keep-alive tasks.
+
+`kill -HUP <master pid>` replaces the workers one by one with new ones and
+re-reads this file. Because the app is preloaded, code changes need a full
+restart (or USR2 followed by QUIT for the old master).
+"""
+import multiprocessing
+import os
+
+# Read by discogs_backend.py when the master imports it
+os.environ.setdefault("CACHE_BACKEND", "sqlite")
+# Every worker would rotate the same file, so log to stderr unless a file is asked for
+os.environ.setdefault("LOG_FILE", "-")
+
+wsgi_app = "discogs_backend:app"
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+# Most of a request is spent waiting on Discogs, so each worker serves several at once
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+preload_app = True
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+def when_ready(server):
+    import discogs_backend
+    # Loaded once here, the index is shared copy-on-write by every worker
+    discogs_backend.restore_warm_cache()
+
+def post_fork(server, worker):
+    import discogs_backend
+    discogs_backend.start_background_tasks_in_one_worker()
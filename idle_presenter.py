@@ -0,0 +1,115 @@
+"""Redraw-on-change helper for static screens (menus, prompts, search).
+
+Instead of redrawing and flipping every 10 ms, a screen asks the presenter
+for events and only draws when needs_redraw() says something visible changed:
+an input event, a hover change, a cursor blink or a scheduled deadline.
+Between those it blocks on the event queue on desktop, or sleeps in longer
+steps in the browser, where the page must keep getting control back.
+
+    presenter = IdlePresenter()
+    while True:
+        for event in await presenter.wait_for_events():
+            ...
+        presenter.watch('hover', hovered_button)
+        if presenter.needs_redraw():
+            draw()
+            pygame.display.flip()
+            presenter.presented()
+"""
+import asyncio
+import sys
+import time
+
+import pygame
+import scene_manager
+
+# Longest single block on desktop, so other asyncio tasks still get to run
+DESKTOP_MAX_WAIT = 0.1
+# Browser poll interval while idle; the event queue can't be blocked on there
+BROWSER_IDLE_SLEEP = 1 / 30
+
+# Mouse motion only matters through the hover state a screen watches
+_PASSIVE_EVENTS = (pygame.MOUSEMOTION,)
+
+_UNSEEN = object()
+
+def is_browser():
+    return sys.platform == 'emscripten'
+
+class IdlePresenter:
+    """Tracks whether a screen needs redrawing and waits efficiently when it doesn't"""
+
+    def __init__(self):
+        self.dirty = True
+        self.frames_drawn = 0
+        self._deadline = None
+        self._watched = {}
+        self._blink_start = time.monotonic()
+
+    def invalidate(self):
+        """Force a redraw on the next check"""
+        self.dirty = True
+
+    def watch(self, key, value):
+        """Redraw when value differs from the last one seen under key (hover, cursor, ...)"""
+        if self._watched.get(key, _UNSEEN) != value:
+            self.dirty = True
+        self._watched[key] = value
+
+    def schedule_at(self, when):
+        """Wake up and redraw at time.monotonic() value when"""
+        if self._deadline is None or when < self._deadline:
+            self._deadline = when
+
+    def schedule(self, seconds):
+        self.schedule_at(time.monotonic() + seconds)
+
+    def restart_blink(self):
+        """Make the blink visible again, e.g. after typing"""
+        self._blink_start = time.monotonic()
+        self.dirty = True
+
+    def blink(self, period):
+        """On/off state of a blink that toggles every period seconds; wakes up for the next toggle"""
+        elapsed = time.monotonic() - self._blink_start
+        phase = int(elapsed / period)
+        self.schedule_at(self._blink_start + (phase + 1) * period)
+        visible = phase % 2 == 0
+        self.watch('_blink', visible)
+        return visible
+
+    def needs_redraw(self):
+        return self.dirty or (self._deadline is not None and time.monotonic() >= self._deadline)
+
+    def presented(self):
+        """Call after flipping; clears the dirty flag and any deadline that has passed"""
+        self.dirty = False
+        self.frames_drawn += 1
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self._deadline = None
+
+    def _time_until_deadline(self, cap):
+        if self._deadline is None:
+            return cap
+        return max(0.0, min(cap, self._deadline - time.monotonic()))
+
+    async def wait_for_events(self):
+        """Return pending events, waiting for input or the next deadline if there's nothing to draw"""
+        events = pygame.event.get()
+        if not events and not self.needs_redraw():
+            if is_browser() or not scene_manager.time_scale:
+                # Soak runs (time_scale 0) feed events from another task, so never block there
+                await scene_manager.scene_sleep(self._time_until_deadline(BROWSER_IDLE_SLEEP))
+                events = pygame.event.get()
+            else:
+                event = pygame.event.wait(max(1, int(self._time_until_deadline(DESKTOP_MAX_WAIT) * 1000)))
+                if event.type != pygame.NOEVENT:
+                    events = [event] + pygame.event.get()
+                await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(0)
+        for event in events:
+            if event.type not in _PASSIVE_EVENTS:
+                self.dirty = True
+                break
+        return events
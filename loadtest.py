@@ -0,0 +1,236 @@
+"""Load generator for discogs_backend.py, run entirely offline against mock_discogs.py.
+
+Starts the mock Discogs server and the backend in-process, then has N virtual
+users replay a realistic mix of sessions: ping, search, a burst of 5
+thumbnail downloads and one full cover. It reports throughput, latency
+percentiles per route and upstream call amplification, meaning how many
+Discogs/CDN calls each backend request caused.
+
+    python loadtest.py --users 20 --duration 30
+    python loadtest.py --backend-url http://127.0.0.1:5000 --mock-url http://127.0.0.1:5100
+    python loadtest.py --json loadtest_results.json --max-error-rate 0.01
+"""
+import argparse
+import atexit
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from mock_discogs import MockDiscogsServer, add_config_arguments, config_from_args
+
+QUERIES = ["radiohead", "daft punk", "kendrick", "rumours", "homogenic", "selected ambient works",
+           "abbey road", "blonde", "dummy", "remain in light"]
+THUMBNAIL_BURST = 5
+
+# Session kinds and how often they occur
+SESSION_MIX = [
+    ('full_game', 0.70),      # ping, search, thumbnail burst, full cover
+    ('search_only', 0.20),    # ping, search, thumbnail burst, then leave
+    ('bounce', 0.10),         # ping only
+]
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Recorder:
+    """Thread-safe latency and status collection per route"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+        self.sessions = 0
+
+    def record(self, route, seconds, status):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            key = (route, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def session_done(self):
+        with self.lock:
+            self.sessions += 1
+
+def timed_request(session, recorder, route, method, url, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, timeout=30, **kwargs)
+        status = response.status_code
+    except requests.RequestException:
+        response = None
+        status = 'error'
+    recorder.record(route, time.perf_counter() - start, status)
+    return response
+
+def run_session(kind, session, backend_url, recorder, rng):
+    timed_request(session, recorder, 'ping', 'GET', f"{backend_url}/ping")
+    if kind == 'bounce':
+        return
+    response = timed_request(session, recorder, 'search', 'GET', f"{backend_url}/search",
+                             params={'q': rng.choice(QUERIES)})
+    results = []
+    if response is not None and response.ok:
+        try:
+            results = [r for r in response.json().get('results', []) if r.get('type', 'release') == 'release']
+        except ValueError:
+            results = []
+    for album in results[:THUMBNAIL_BURST]:
+        image_url = album.get('thumb') or album.get('cover_image')
+        if image_url:
+            timed_request(session, recorder, 'thumbnail', 'GET', f"{backend_url}/cover", params={'url': image_url})
+    if kind == 'full_game' and results:
+        album = rng.choice(results[:THUMBNAIL_BURST])
+        image_url = album.get('cover_image') or album.get('thumb')
+        if image_url:
+            timed_request(session, recorder, 'cover', 'GET', f"{backend_url}/cover", params={'url': image_url})
+
+def virtual_user(user_id, backend_url, recorder, deadline, sessions_per_user, seed):
+    rng = random.Random(seed * 1000 + user_id)
+    kinds = [kind for kind, _ in SESSION_MIX]
+    weights = [weight for _, weight in SESSION_MIX]
+    session = requests.Session()
+    done = 0
+    while time.monotonic() < deadline and (not sessions_per_user or done < sessions_per_user):
+        run_session(rng.choices(kinds, weights)[0], session, backend_url, recorder, rng)
+        recorder.session_done()
+        done += 1
+
+def start_backend(mock_url, warmup=False):
+    """Import the backend against the mock and serve it on a free local port
+
+    Its boot-time warm-up is off so upstream counts only cover the test; with
+    warmup=True it runs synchronously over this test's queries first. Its
+    cache files go to a temporary directory, so mock data never ends up in
+    the real shared cache.
+    """
+    os.environ['DISCOGS_API_URL'] = mock_url
+    os.environ['BACKEND_WARMUP'] = '0'
+    cache_dir = tempfile.mkdtemp(prefix='loadtest-cache-')
+    atexit.register(shutil.rmtree, cache_dir, True)
+    os.environ['SHARED_CACHE_PATH'] = os.path.join(cache_dir, 'shared_cache.sqlite3')
+    os.environ['RELEASE_STORE_PATH'] = os.environ['SHARED_CACHE_PATH']
+    from werkzeug.serving import make_server
+    import discogs_backend
+    discogs_backend.DISCOGS_API_URL = mock_url
+    if warmup:
+        discogs_backend.warm_up(QUERIES)
+        requests.post(f"{mock_url}/_reset", timeout=5)
+    server = make_server('127.0.0.1', 0, discogs_backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='backend', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def build_report(recorder, elapsed, upstream, users):
+    routes = {}
+    total_requests = 0
+    total_errors = 0
+    for route, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        statuses = {str(status): count for (r, status), count in recorder.statuses.items() if r == route}
+        errors = sum(count for status, count in statuses.items() if not status.startswith('2'))
+        total_requests += len(values)
+        total_errors += errors
+        routes[route] = {
+            'requests': len(values),
+            'throughput_rps': len(values) / elapsed,
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+            'max_ms': values[-1] * 1000,
+            'statuses': statuses,
+            'errors': errors,
+        }
+    upstream_calls = upstream.get('total_calls', 0)
+    return {
+        'users': users,
+        'duration_s': elapsed,
+        'sessions': recorder.sessions,
+        'requests': total_requests,
+        'throughput_rps': total_requests / elapsed,
+        'error_rate': total_errors / total_requests if total_requests else 0.0,
+        'routes': routes,
+        'upstream': upstream,
+        # Upstream calls per backend request that needs Discogs at all (ping never does)
+        'amplification': upstream_calls / max(1, total_requests - routes.get('ping', {}).get('requests', 0)),
+    }
+
+def print_report(report):
+    print(f"\n{report['users']} users, {report['duration_s']:.1f}s, {report['sessions']} sessions, "
+          f"{report['requests']} requests, {report['throughput_rps']:.1f} req/s, "
+          f"error rate {report['error_rate']:.2%}")
+    print(f"{'route':<10} {'reqs':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for route, stats in report['routes'].items():
+        print(f"{route:<10} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}  {stats['statuses']}")
+    print(f"upstream calls: {report['upstream'].get('calls', {})}  "
+          f"amplification: {report['amplification']:.2f} upstream calls per backend request")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for discogs_backend.py")
+    parser.add_argument('--users', type=int, default=10, help="concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds to run")
+    parser.add_argument('--sessions-per-user', type=int, default=0, help="stop each user after this many sessions")
+    parser.add_argument('--backend-url', help="test an already running backend instead of starting one")
+    parser.add_argument('--mock-url', help="use an already running mock_discogs.py")
+    parser.add_argument('--warmup', action='store_true', help="warm the backend's caches before the run")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--max-error-rate', type=float, help="exit with status 1 above this error rate")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    mock = None
+    if args.mock_url:
+        mock_url = args.mock_url.rstrip('/')
+        requests.post(f"{mock_url}/_reset", timeout=5)
+    else:
+        mock = MockDiscogsServer(config_from_args(args)).start()
+        mock_url = mock.url
+
+    backend = None
+    if args.backend_url:
+        backend_url = args.backend_url.rstrip('/')
+    else:
+        backend, backend_url = start_backend(mock_url, args.warmup)
+    print(f"backend {backend_url}, mock Discogs {mock_url}")
+
+    recorder = Recorder()
+    start = time.monotonic()
+    deadline = start + args.duration
+    threads = [threading.Thread(target=virtual_user, daemon=True,
+                                args=(i, backend_url, recorder, deadline, args.sessions_per_user, args.seed))
+               for i in range(args.users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    upstream = requests.get(f"{mock_url}/_stats", timeout=5).json()
+    report = build_report(recorder, elapsed, upstream, args.users)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if backend:
+        backend.shutdown()
+    if mock:
+        mock.stop()
+
+    if args.max_error_rate is not None and report['error_rate'] > args.max_error_rate:
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,42 +1,49 @@
-print("PYTHON MAIN STARTED")
-print("DEBUG: main.py - Starting application initialization")
+from debug_log import get_logger, dump_log
 
-print("DEBUG: main.py - About to import ui module")
-from ui import start_menu
-print("DEBUG: main.py - ui module imported successfully")
+log = get_logger("main")
+log.info("PYTHON MAIN STARTED")
+log.debug("Starting application initialization")
+
+log.debug("About to import ui module")
+from ui import screen, quit_game_async
+from scene_manager import run_scenes, START_MENU
+log.debug("ui module imported successfully")
 import asyncio
 import pygame
 
-print("DEBUG: main.py - Importing pygame")
+log.debug("Importing pygame")
 pygame.init()
-print("DEBUG: main.py - Pygame initialized successfully")
+log.debug("Pygame initialized successfully")
 pygame.font.init()
-print("DEBUG: main.py - Pygame font initialized successfully")
+log.debug("Pygame font initialized successfully")
 
 async def main():
-    print("DEBUG: main.py - main() function entered")
+    log.debug("main() function entered")
     try:
-        print("DEBUG: main.py - About to call start_menu()")
-        await start_menu()
-        print("DEBUG: main.py - start_menu() completed successfully")
+        log.debug("About to run scenes from the start menu")
+        await run_scenes(screen, START_MENU)
+        log.debug("Scene loop completed successfully")
+        await quit_game_async()
     except SystemExit:
-        print("DEBUG: main.py - SystemExit caught in main()")
+        log.debug("SystemExit caught in main()")
         pass
     except KeyboardInterrupt:
-        print("DEBUG: main.py - KeyboardInterrupt caught in main()")
+        log.debug("KeyboardInterrupt caught in main()")
         print("\nApplication interrupted by me (Ctrl+C).")
     except Exception as e:
-        print(f"DEBUG: main.py - Unexpected exception in main(): {e}")
+        log.warning("Unexpected exception in main(): %s", e)
         import traceback
         traceback.print_exc()
-    print("DEBUG: main.py - About to sleep in main()")
+        # Write out the recent log history to help diagnose the crash
+        dump_log()
+    log.debug("About to sleep in main()")
     await asyncio.sleep(0)
-    print("DEBUG: main.py - main() function completed")
+    log.debug("main() function completed")
 
 if __name__ == "__main__":
-    print("DEBUG: main.py - __main__ block running")
-    print("DEBUG: main.py - About to call asyncio.run(main())")
+    log.debug("__main__ block running")
+    log.debug("About to call asyncio.run(main())")
     asyncio.run(main())
-    print("DEBUG: main.py - asyncio.run(main()) completed")
+    log.debug("asyncio.run(main()) completed")
 
 
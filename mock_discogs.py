@@ -0,0 +1,273 @@
+"""Local stand-in for the Discogs API and image CDN, for offline load tests.
+
+Serves /database/search, /releases/<id> and /images/<name> with configurable
+latency, Discogs-style rate-limit headers and injected 429 responses.
+Responses are generated deterministically from the request, so runs are
+repeatable. /_stats reports how many upstream calls were made per route.
+
+    python mock_discogs.py --port 5100 --latency-ms 120 --rate-limit 60
+    DISCOGS_API_URL=http://127.0.0.1:5100 python discogs_backend.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+ARTISTS = ["Radiohead", "Daft Punk", "Kendrick Lamar", "Fleetwood Mac", "Bjork",
+           "Aphex Twin", "The Beatles", "Frank Ocean", "Portishead", "Talking Heads"]
+WORDS = ["Blue", "Night", "Paper", "Echo", "Gold", "Static", "Garden", "Signal", "River", "Glass"]
+
+class MockConfig:
+    """Tunable behaviour of the mock server"""
+
+    def __init__(self, latency_ms=80, jitter_ms=20, cdn_latency_ms=40, results_per_page=50,
+                 rate_limit=60, rate_window_s=60.0, error_rate=0.0, image_bytes=30000, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.cdn_latency_ms = cdn_latency_ms
+        self.results_per_page = results_per_page
+        self.rate_limit = rate_limit  # Requests per window before 429s; 0 disables the limit
+        self.rate_window_s = rate_window_s
+        self.error_rate = error_rate  # Fraction of API requests answered with an injected 429
+        self.image_bytes = image_bytes
+        self.seed = seed
+
+class MockState:
+    """Request counters and the rate-limit window, shared by all handler threads"""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+            self.status_counts = {}
+            self.window_start = time.monotonic()
+            self.window_used = 0
+
+    def record(self, route, status):
+        with self.lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            key = f"{route} {status}"
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+    def take_rate_budget(self):
+        """Count one API request; returns (allowed, used, remaining)"""
+        config = self.config
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= config.rate_window_s:
+                self.window_start = now
+                self.window_used = 0
+            self.window_used += 1
+            injected = config.error_rate and self.rng.random() < config.error_rate
+            if not config.rate_limit:
+                return not injected, self.window_used, 0
+            remaining = max(0, config.rate_limit - self.window_used)
+            return self.window_used <= config.rate_limit and not injected, self.window_used, remaining
+
+    def delay(self, base_ms):
+        with self.lock:
+            jitter = self.rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        time.sleep(max(0.0, base_ms + jitter) / 1000)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'calls': dict(self.calls),
+                'status_counts': dict(self.status_counts),
+                'total_calls': sum(self.calls.values()),
+            }
+
+def _release_id(query, index):
+    digest = hashlib.md5(f"{query}|{index}".encode('utf-8')).hexdigest()
+    return 100000 + int(digest[:8], 16) % 9000000
+
+def _release_title(release_id):
+    rng = random.Random(release_id)
+    return f"{rng.choice(ARTISTS)} - {rng.choice(WORDS)} {rng.choice(WORDS)}"
+
+def make_search_response(base_url, query, page, per_page):
+    results = []
+    for i in range(per_page):
+        release_id = _release_id(query, (page - 1) * per_page + i)
+        results.append({
+            'id': release_id,
+            'type': 'release',
+            'title': _release_title(release_id),
+            'thumb': f"{base_url}/images/{release_id}-thumb.jpg",
+            'cover_image': f"{base_url}/images/{release_id}.jpg",
+            'year': str(1960 + release_id % 60),
+            'format': ['Vinyl', 'LP', 'Album'],
+            'label': ['Mock Records'],
+            'barcode': [str(release_id) * 2],
+            'community': {'want': release_id % 1000, 'have': release_id % 3000},
+            'resource_url': f"{base_url}/releases/{release_id}",
+        })
+    return {
+        'pagination': {'page': page, 'pages': 20, 'per_page': per_page, 'items': per_page * 20, 'urls': {}},
+        'results': results,
+    }
+
+def make_release_response(base_url, release_id):
+    title = _release_title(release_id)
+    artist, album = title.split(' - ', 1)
+    return {
+        'id': release_id,
+        'title': album,
+        'artists': [{'name': artist, 'id': release_id % 10000}],
+        'year': 1960 + release_id % 60,
+        'genres': ['Electronic', 'Rock'],
+        'tracklist': [{'position': str(i + 1), 'title': f"Track {i + 1}", 'duration': '3:30'} for i in range(10)],
+        'images': [{'type': 'primary', 'uri': f"{base_url}/images/{release_id}.jpg",
+                    'uri150': f"{base_url}/images/{release_id}-thumb.jpg", 'width': 600, 'height': 600}],
+    }
+
+def make_image(name, size):
+    """Deterministic pseudo-image bytes with a JPEG header"""
+    rng = random.Random(name)
+    return b'\xff\xd8\xff\xe0' + rng.randbytes(max(0, size - 6)) + b'\xff\xd9'
+
+class MockDiscogsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None  # Set on the per-server subclass
+
+    def log_message(self, format, *args):
+        pass  # Keep load-test output readable
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _api_gate(self, route):
+        """Apply latency and rate limiting; returns headers, or None if a 429 was sent"""
+        state = self.state
+        state.delay(state.config.latency_ms)
+        allowed, used, remaining = state.take_rate_budget()
+        headers = {
+            'X-Discogs-Ratelimit': state.config.rate_limit,
+            'X-Discogs-Ratelimit-Used': used,
+            'X-Discogs-Ratelimit-Remaining': remaining,
+        }
+        if not allowed:
+            state.record(route, 429)
+            headers['Retry-After'] = int(state.config.rate_window_s)
+            self._send(429, {'message': "You are making requests too quickly."}, headers=headers)
+            return None
+        return headers
+
+    def do_GET(self):
+        state = self.state
+        parsed = urlparse(self.path)
+        path = parsed.path
+        params = parse_qs(parsed.query)
+
+        if path == '/_stats':
+            self._send(200, state.snapshot())
+        elif path == '/database/search':
+            headers = self._api_gate('search')
+            if headers is None:
+                return
+            query = params.get('q', [''])[0]
+            page = int(params.get('page', ['1'])[0])
+            per_page = int(params.get('per_page', [str(state.config.results_per_page)])[0])
+            state.record('search', 200)
+            self._send(200, make_search_response(self._base_url(), query, page, per_page), headers=headers)
+        elif path.startswith('/releases/'):
+            headers = self._api_gate('release')
+            if headers is None:
+                return
+            try:
+                release_id = int(path.rsplit('/', 1)[1])
+            except ValueError:
+                state.record('release', 404)
+                self._send(404, {'message': "Release not found."}, headers=headers)
+                return
+            state.record('release', 200)
+            self._send(200, make_release_response(self._base_url(), release_id), headers=headers)
+        elif path.startswith('/images/'):
+            state.delay(state.config.cdn_latency_ms)
+            name = path.rsplit('/', 1)[1]
+            size = state.config.image_bytes // 4 if '-thumb' in name else state.config.image_bytes
+            state.record('image', 200)
+            self._send(200, make_image(name, size), content_type='image/jpeg')
+        else:
+            self._send(404, {'message': "Not found."})
+
+    def do_POST(self):
+        if urlparse(self.path).path == '/_reset':
+            self.state.reset()
+            self._send(200, {'status': 'ok'})
+        else:
+            self._send(404, {'message': "Not found."})
+
+class MockDiscogsServer:
+    """Runs the mock on a background thread; port 0 picks a free port"""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or MockConfig()
+        self.state = MockState(self.config)
+        handler = type('BoundMockDiscogsHandler', (MockDiscogsHandler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='mock-discogs', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def add_config_arguments(parser):
+    parser.add_argument('--latency-ms', type=float, default=80, help="API response latency")
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--cdn-latency-ms', type=float, default=40, help="image CDN latency")
+    parser.add_argument('--rate-limit', type=int, default=60, help="requests per window before 429s (0 = unlimited)")
+    parser.add_argument('--rate-window', type=float, default=60.0, help="rate-limit window in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of API requests answered with 429")
+    parser.add_argument('--image-bytes', type=int, default=30000)
+    parser.add_argument('--seed', type=int, default=0)
+
+def config_from_args(args):
+    return MockConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, cdn_latency_ms=args.cdn_latency_ms,
+                      rate_limit=args.rate_limit, rate_window_s=args.rate_window, error_rate=args.error_rate,
+                      image_bytes=args.image_bytes, seed=args.seed)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local mock of the Discogs API and image CDN")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5100)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = MockDiscogsServer(config_from_args(args), args.host, args.port)
+    print(f"Mock Discogs listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,272 @@
+"""Record games as compact input logs and replay them deterministically.
+
+A game is fully determined by its RNG seed and the turns the player made,
+so a recording is just the seed, the album ID, the board geometry and a list
+of (tick, direction) pairs. Playback drives a fresh SnakeGame with the same
+seed and geometry and applies each turn at its tick, which reproduces every
+move, food spawn and reveal.
+
+Recordings encode to a short text code that fits in a bug report:
+
+    2.<seed>.<album id>.<width>x<height>x<grid>x<album grid>.<ticks>.<score>.<turns>
+
+where <turns> is a run of <ticks since previous turn, base 36><U|D|L|R>.
+The final tick count and score let playback check it reproduced the game.
+Version 1 codes have no geometry field and were all played on the default
+600x600 board with 30px cells and 60px pieces.
+
+    python replay.py 2.1712345678901.249504.600x600x30x60.1f.40.4U6Lb...   # fast-forward and verify
+    python replay.py last_replay.txt --watch                 # watch it on screen
+    python replay.py last_replay.txt --render --repeat 20    # fixed rendering workload
+"""
+import os
+import sys
+
+from game_rules import SnakeGame, UP, DOWN, LEFT, RIGHT
+from shared_constants import width, height, GRID_SIZE, ALBUM_GRID_SIZE
+from debug_log import get_logger
+
+log = get_logger("replay")
+
+FORMAT_VERSION = 2
+# Board width, height, snake cell and album piece size of version 1 codes
+V1_GEOMETRY = (600, 600, 30, 60)
+LAST_REPLAY_FILE = 'last_replay.txt'
+
+_DIRECTION_CODES = {UP: 'U', DOWN: 'D', LEFT: 'L', RIGHT: 'R'}
+_CODE_DIRECTIONS = {code: direction for direction, code in _DIRECTION_CODES.items()}
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+class ReplayError(ValueError):
+    """Raised for replay codes that can't be decoded"""
+
+def _to_base36(value):
+    if value == 0:
+        return '0'
+    digits = []
+    while value:
+        value, rest = divmod(value, 36)
+        digits.append(_DIGITS[rest])
+    return ''.join(reversed(digits))
+
+class Recording:
+    """Seed, album, board geometry and turn log of one game, plus the outcome it should reproduce
+
+    geometry is (board width, board height, grid size, album grid size) and
+    defaults to this build's settings.
+    """
+
+    def __init__(self, seed, album_id=0, inputs=None, ticks=None, score=None, geometry=None):
+        self.seed = seed
+        self.album_id = album_id
+        self.geometry = tuple(geometry) if geometry else (width, height, GRID_SIZE, ALBUM_GRID_SIZE)
+        self.inputs = list(inputs or [])  # (tick, direction) pairs in tick order
+        self.ticks = ticks
+        self.score = score
+
+    def encode(self):
+        parts = []
+        last_tick = 0
+        for tick, direction in self.inputs:
+            parts.append(_to_base36(tick - last_tick) + _DIRECTION_CODES[direction])
+            last_tick = tick
+        ticks = '' if self.ticks is None else _to_base36(self.ticks)
+        score = '' if self.score is None else str(self.score)
+        geometry = 'x'.join(str(value) for value in self.geometry)
+        return f"{FORMAT_VERSION}.{self.seed}.{self.album_id}.{geometry}.{ticks}.{score}.{''.join(parts)}"
+
+    def game_settings(self):
+        """SnakeGame keyword arguments for the recorded board"""
+        board_width, board_height, grid_size, album_grid_size = self.geometry
+        return {'board_width': board_width, 'board_height': board_height,
+                'grid_size': grid_size, 'album_grid_size': album_grid_size}
+
+    @classmethod
+    def decode(cls, code):
+        fields = code.strip().split('.')
+        if len(fields) == 6 and fields[0] == '1':
+            fields.insert(3, 'x'.join(str(value) for value in V1_GEOMETRY))
+        elif len(fields) != 7 or fields[0] != str(FORMAT_VERSION):
+            raise ReplayError(f"Not a version {FORMAT_VERSION} replay code: {code[:40]!r}")
+        try:
+            seed = int(fields[1])
+            album_id = int(fields[2])
+            geometry = tuple(int(value) for value in fields[3].split('x'))
+            ticks = int(fields[4], 36) if fields[4] else None
+            score = int(fields[5]) if fields[5] else None
+            inputs = []
+            tick = 0
+            number = ''
+            for char in fields[6]:
+                if char in _CODE_DIRECTIONS:
+                    tick += int(number, 36)
+                    inputs.append((tick, _CODE_DIRECTIONS[char]))
+                    number = ''
+                else:
+                    number += char
+        except (ValueError, KeyError) as e:
+            raise ReplayError(f"Corrupt replay code: {e}")
+        if number:
+            raise ReplayError("Replay code ends in the middle of a turn")
+        if len(geometry) != 4 or min(geometry) < 1 or geometry[3] < geometry[2]:
+            raise ReplayError(f"Corrupt board geometry: {fields[3]!r}")
+        return cls(seed, album_id, inputs, ticks, score, geometry)
+
+    def __repr__(self):
+        return (f"Recording(seed={self.seed}, album_id={self.album_id}, board={'x'.join(map(str, self.geometry))}, "
+                f"turns={len(self.inputs)}, ticks={self.ticks})")
+
+class ReplayRecorder:
+    """Wraps a live SnakeGame and logs every turn it accepts"""
+
+    def __init__(self, game, album_id=0):
+        self.game = game
+        self.recording = Recording(game.seed, album_id, geometry=(game.board_width, game.board_height,
+                                                                  game.grid_size, game.album_grid_size))
+
+    def change_direction(self, direction):
+        # Turns are applied before the next step(), so they belong to the current tick
+        if self.game.change_direction(direction):
+            self.recording.inputs.append((self.game.tick, direction))
+            return True
+        return False
+
+    def finish(self):
+        self.recording.ticks = self.game.tick
+        self.recording.score = self.game.score
+        return self.recording
+
+def play_back(recording, max_ticks=None, on_tick=None):
+    """Replay a recording headlessly as fast as possible and return the finished game
+
+    on_tick(game) is called after every step, e.g. to render each frame.
+    """
+    game = SnakeGame(seed=recording.seed, **recording.game_settings())
+    inputs = recording.inputs
+    next_input = 0
+    limit = max_ticks if max_ticks is not None else recording.ticks
+    while not game.game_over and (limit is None or game.tick < limit):
+        while next_input < len(inputs) and inputs[next_input][0] == game.tick:
+            game.change_direction(inputs[next_input][1])
+            next_input += 1
+        game.step()
+        if on_tick:
+            on_tick(game)
+    return game
+
+def matches(recording, game):
+    """True if a played-back game ended the way the recording says it did"""
+    return (recording.ticks is None or game.tick == recording.ticks) and \
+           (recording.score is None or game.score == recording.score)
+
+def verify(recording):
+    """Replay and check the outcome matches what was recorded; returns (ok, game)"""
+    game = play_back(recording)
+    return matches(recording, game), game
+
+def save_last_replay(recording, path=LAST_REPLAY_FILE):
+    """Keep the most recent game's replay code for bug reports"""
+    code = recording.encode()
+    if sys.platform == 'emscripten':
+        # No useful file system in the browser; the console is where reports come from
+        print(f"REPLAY {code}")
+        return code
+    try:
+        with open(path, 'w') as f:
+            f.write(code + '\n')
+    except OSError as e:
+        log.warning("Could not save replay to %s: %s", path, e)
+    return code
+
+def load_recording(code_or_path):
+    if os.path.exists(code_or_path):
+        with open(code_or_path) as f:
+            code_or_path = f.read()
+    return Recording.decode(code_or_path)
+
+def _render_setup(headless):
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import ui  # Imported before snake_logic to resolve the ui <-> snake_logic import cycle
+    import snake_logic
+    from shared_constants import width, height, ALBUM_GRID_SIZE
+    from tile_atlas import TileAtlas
+    # Covers aren't part of the recording; a seeded stand-in keeps the workload fixed
+    import random
+    state = random.getstate()
+    random.seed(0)
+    cover = snake_logic.create_fallback_album_cover(width, height)
+    random.setstate(state)
+    atlas = TileAtlas(cover, ALBUM_GRID_SIZE)
+    return pygame, ui.screen, snake_logic, atlas
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay a recorded game")
+    parser.add_argument('replay', nargs='?', default=LAST_REPLAY_FILE, help="replay code or a file containing one")
+    parser.add_argument('--watch', action='store_true', help="play it back on screen at game speed")
+    parser.add_argument('--render', action='store_true', help="render every frame headlessly (profiling workload)")
+    parser.add_argument('--repeat', type=int, default=1, help="play the replay this many times")
+    args = parser.parse_args(argv)
+
+    try:
+        recording = load_recording(args.replay)
+    except ReplayError as e:
+        print(e)
+        return 2
+    print(recording)
+
+    on_tick = None
+    if (args.watch or args.render) and recording.geometry != (width, height, GRID_SIZE, ALBUM_GRID_SIZE):
+        # The screen is sized from the environment at import, so it can't follow the recording
+        board_width, board_height, grid_size, album_grid_size = recording.geometry
+        print(f"Recorded on a different board; rerun with SPOTISNAKE_BOARD={board_width}x{board_height} "
+              f"SPOTISNAKE_GRID_SIZE={grid_size} SPOTISNAKE_TILES={board_width // album_grid_size}")
+        return 2
+    if args.watch or args.render:
+        pygame, screen, snake_logic, atlas = _render_setup(headless=args.render)
+        from frame_profiler import get_profiler, GAME_SCOPES
+        profiler = get_profiler("replay", GAME_SCOPES)
+
+        def on_tick(game):
+            profiler.begin_frame()
+            pygame.event.pump()
+            snake_logic.draw_game_frame(screen, game, atlas, f"Replay {recording.album_id}", profiler=profiler)
+            pygame.display.flip()
+            profiler.mark('flip')
+            if args.watch:
+                time.sleep(1 / game.current_speed)
+                profiler.mark('sleep')
+            profiler.end_frame()
+
+    start = time.perf_counter()
+    ticks = 0
+    for _ in range(args.repeat):
+        game = play_back(recording, on_tick=on_tick)
+        ticks += game.tick
+    elapsed = time.perf_counter() - start
+
+    real_time = sum(1 / speed for speed in _speeds_for(recording)) * args.repeat
+    print(f"{ticks} ticks in {elapsed * 1000:.1f} ms ({ticks / elapsed:,.0f} ticks/s, "
+          f"{real_time / elapsed:,.0f}x real time); score {game.score}, "
+          f"{'won' if game.won else game.death_cause} at tick {game.tick}")
+    if on_tick:
+        frame = profiler.summary()['frame_ms']
+        print(f"frame p50 {frame['p50']:.2f} ms, p95 {frame['p95']:.2f} ms, p99 {frame['p99']:.2f} ms")
+    if not matches(recording, game):
+        print(f"MISMATCH: recorded {recording.ticks} ticks / score {recording.score}")
+        return 1
+    return 0
+
+def _speeds_for(recording):
+    """Tick rate the original game ran at on every tick, for the real-time comparison"""
+    speeds = []
+    play_back(recording, on_tick=lambda game: speeds.append(game.current_speed))
+    return speeds
+
+if __name__ == '__main__':
+    sys.exit(main())
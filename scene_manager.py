@@ -0,0 +1,66 @@
+"""Flat scene loop for the game's screens.
+
+Every screen is a scene: a coroutine ``scene(screen, **kwargs)`` that returns
+a Transition naming the next scene instead of awaiting it. run_scenes()
+drives one scene at a time, so a finished scene's surfaces, closures and
+album pieces are freed before the next one starts, and the coroutine stack
+stays the same depth for the whole session.
+"""
+import asyncio
+from collections import namedtuple
+
+from debug_log import get_logger
+
+log = get_logger("scene_manager")
+
+# Scene names
+START_MENU = "START_MENU"
+MAIN_MENU = "MAIN_MENU"
+GAME = "GAME"
+GAME_OVER = "GAME_OVER"
+QUIT = "QUIT"
+
+Transition = namedtuple('Transition', ['scene', 'kwargs'])
+
+_scenes = {}
+
+# Multiplier for every scene_sleep(); 0 runs screens as fast as possible (soak tests)
+time_scale = 1.0
+
+current_scene = None
+scene_counts = {}
+
+def go_to(scene, **kwargs):
+    """Build the transition a scene returns to hand over to the next one"""
+    return Transition(scene, kwargs)
+
+def register_scene(name):
+    """Decorator that makes a coroutine function available as a scene"""
+    def register(fn):
+        _scenes[name] = fn
+        return fn
+    return register
+
+async def scene_sleep(seconds):
+    """Frame delay for scenes, scaled by time_scale"""
+    await asyncio.sleep(seconds * time_scale)
+
+async def run_scenes(screen, first_scene, **kwargs):
+    """Run scenes until one transitions to QUIT"""
+    global current_scene
+    transition = go_to(first_scene, **kwargs)
+    while transition.scene != QUIT:
+        scene = _scenes[transition.scene]
+        current_scene = transition.scene
+        scene_counts[current_scene] = scene_counts.get(current_scene, 0) + 1
+        log.debug("Entering scene %s", current_scene)
+        scene_kwargs = transition.kwargs
+        # Drop our reference before running so the previous scene's data can be freed
+        transition = None
+        transition = await scene(screen, **scene_kwargs)
+        scene_kwargs = None
+        if transition is None:
+            log.warning("Scene %s returned no transition, going to the start menu", current_scene)
+            transition = go_to(START_MENU)
+    current_scene = QUIT
+    log.debug("Scene loop finished")
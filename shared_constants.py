@@ -1,6 +1,10 @@
 # Check if we're running in a backend context (no display)
 import os
 import sys
+from math import gcd as _gcd
+from debug_log import get_logger
+
+_log = get_logger("shared_constants")
 
 # Check if we're in a backend context by looking at the calling module
 def is_backend_context():
@@ -41,16 +45,36 @@ if not is_backend_context():
 else:
     # Backend context - don't import pygame
     pygame = None
-    print("DEBUG: shared_constants.py - Running in backend context, skipping pygame import")
+    _log.debug("Running in backend context, skipping pygame import")
 
 # Discogs API configuration
 DISCOGS_API_URL = "https://api.discogs.com"
 DISCOGS_USER_AGENT = "DiscogSnake/1.0 +https://github.com/yourusername/discogsnake"
 DISCOGS_TOKEN = os.environ.get("DISCOGS_TOKEN", "")  # Optional personal access token
 
-# Game dimensions
-width = 600
-height = 600
+def _env_int(name, default, minimum=1):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        _log.warning("Ignoring %s=%r, expected a whole number", name, value)
+        return default
+
+def _env_size(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        w, h = (int(part) for part in value.lower().split('x'))
+        return max(1, w), max(1, h)
+    except ValueError:
+        _log.warning("Ignoring %s=%r, expected WIDTHxHEIGHT", name, value)
+        return default
+
+# Game dimensions (SPOTISNAKE_BOARD=WIDTHxHEIGHT overrides them at startup)
+width, height = _env_size('SPOTISNAKE_BOARD', (600, 600))
 
 # Colors
 WHITE = (255, 255, 255)
@@ -64,8 +88,24 @@ DARK_GREY = (30,30,30)
 
 # Game settings
 SNAKE_SPEED = 7  # How often the snake moves
-GRID_SIZE = 30  # Size for snake movement
-ALBUM_GRID_SIZE = 60  # Size for album pieces
+GRID_SIZE = _env_int('SPOTISNAKE_GRID_SIZE', 30)  # Size for snake movement
+# Puzzle density: SPOTISNAKE_TILES=N cuts the cover into N pieces across (10 -> 10x10 pieces of 60px)
+ALBUM_TILES = _env_int('SPOTISNAKE_TILES', 10)
+if width // ALBUM_TILES < GRID_SIZE:
+    # A piece smaller than a snake cell may hold no cell at all, and then it can never be eaten
+    _log.warning("SPOTISNAKE_TILES=%s makes album pieces smaller than a %spx snake cell, using %s",
+                 ALBUM_TILES, GRID_SIZE, max(1, width // GRID_SIZE))
+    ALBUM_TILES = max(1, width // GRID_SIZE)
+ALBUM_GRID_SIZE = max(GRID_SIZE, width // ALBUM_TILES)  # Size for album pieces
+
+# Snap the board to whole snake cells and album pieces so every edge piece is a full tile
+_BOARD_STEP = ALBUM_GRID_SIZE * GRID_SIZE // _gcd(ALBUM_GRID_SIZE, GRID_SIZE)
+_requested = (width, height)
+width = max(_BOARD_STEP, width - width % _BOARD_STEP)
+height = max(_BOARD_STEP, height - height % _BOARD_STEP)
+if (width, height) != _requested:
+    _log.warning("Board %sx%s is not a multiple of %spx (snake cells of %spx, album pieces of %spx), using %sx%s",
+                 _requested[0], _requested[1], _BOARD_STEP, GRID_SIZE, ALBUM_GRID_SIZE, width, height)
 
 # Game states
 USER_QUIT_ALBUM_SEARCH = "USER_QUIT_ALBUM_SEARCH"
@@ -75,48 +115,106 @@ USER_ABORT_GAME_FROM_SEARCH = "USER_ABORT_GAME_FROM_SEARCH"
 OUTLINE_COLOR = BLACK
 OUTLINE_THICKNESS = 2 
 
+# Pre-baked asset bundle (see bake_assets.py)
+ASSET_BUNDLE = 'assets.bundle'
+ASSET_BUNDLE_MAGIC = b'SSNB'
+ASSET_BUNDLE_VERSION = 1
+
 # Game backgrounds (load by filename only for browser compatibility)
-print("DEBUG: shared_constants.py - Starting to load background images")
-print("DEBUG: shared_constants.py - Module loaded successfully")
+_log.debug("Starting to load background images")
+_log.debug("Module loaded successfully")
 
 def load_image_simple(filename):
     """Load an image with simple error handling"""
     if pygame is None:
-        print(f"DEBUG: shared_constants.py - Skipping {filename} load (backend context)")
+        _log.debug("Skipping %s load (backend context)", filename)
         return None
     try:
-        print(f"DEBUG: shared_constants.py - Loading {filename}")
+        _log.debug("Loading %s", filename)
         image = pygame.image.load(filename)
         image = pygame.transform.scale(image, (width, height))
-        print(f"DEBUG: shared_constants.py - {filename} loaded successfully")
+        _log.debug("%s loaded successfully", filename)
         return image
     except Exception as e:
-        print(f"DEBUG: shared_constants.py - Failed to load {filename}: {e}")
+        _log.warning("Failed to load %s: %s", filename, e)
         return None
 
 def load_fruit_image():
     """Load the custom fruit image for the game"""
     if pygame is None:
-        print("DEBUG: shared_constants.py - Skipping fruit image load (backend context)")
+        _log.debug("Skipping fruit image load (backend context)")
         return None
     try:
-        print("DEBUG: shared_constants.py - Loading fruit.png")
-        print(f"DEBUG: shared_constants.py - Current working directory: {os.getcwd()}")
-        print(f"DEBUG: shared_constants.py - fruit.png exists: {os.path.exists('fruit.png')}")
+        _log.debug("Loading fruit.png")
+        _log.debug("Current working directory: %s", os.getcwd())
+        _log.debug("fruit.png exists: %s", os.path.exists('fruit.png'))
         fruit_image = pygame.image.load("fruit.png")
         # Scale to GRID_SIZE x GRID_SIZE
         fruit_image = pygame.transform.scale(fruit_image, (GRID_SIZE, GRID_SIZE))
-        print(f"DEBUG: shared_constants.py - fruit.png loaded successfully, size: {fruit_image.get_size()}")
+        _log.debug("fruit.png loaded successfully, size: %s", fruit_image.get_size())
         return fruit_image
     except Exception as e:
-        print(f"DEBUG: shared_constants.py - Failed to load fruit.png: {e}")
-        print("DEBUG: shared_constants.py - Will use white rectangle as fallback")
+        _log.warning("Failed to load fruit.png: %s", e)
+        _log.debug("Will use white rectangle as fallback")
         return None
 
+def load_asset_bundle(filename):
+    """Load every image in the pre-baked bundle with a single read, no decode or scaling"""
+    if pygame is None:
+        return {}
+    try:
+        import json
+        import struct
+        import zlib
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        if raw[:4] != ASSET_BUNDLE_MAGIC or raw[4] != ASSET_BUNDLE_VERSION:
+            _log.debug("%s has an unknown format, ignoring it", filename)
+            return {}
+        payload = zlib.decompress(raw[5:])
+        (index_length,) = struct.unpack_from('<I', payload, 0)
+        index = json.loads(payload[4:4 + index_length].decode('utf-8'))
+        blob = memoryview(payload)[4 + index_length:]
+
+        images = {}
+        for entry in index['entries']:
+            flags = pygame.SRCALPHA if entry['alpha'] else 0
+            surface = pygame.Surface(tuple(entry['size']), flags, 32)
+            # Pixels are stored in the surface layout, so they can be copied in as-is
+            if list(surface.get_masks()) != entry['masks'] or surface.get_pitch() != entry['pitch']:
+                _log.debug("Pixel format mismatch for %s, skipping", entry['name'])
+                continue
+            start = entry['offset']
+            surface.get_buffer().write(bytes(blob[start:start + entry['length']]), 0)
+            images[entry['name']] = surface
+        _log.debug("Loaded %s images from %s", len(images), filename)
+        return images
+    except FileNotFoundError:
+        _log.debug("No %s, loading individual images", filename)
+        return {}
+    except Exception as e:
+        _log.warning("Failed to load %s: %s", filename, e)
+        return {}
+
 # Load images with simple error handling
-print("DEBUG: shared_constants.py - Starting to load all images")
-game_bg = load_image_simple('background.png')
-start_menu_bg = load_image_simple('SpotipyStart.png')
-print("DEBUG: shared_constants.py - About to load fruit image")
-fruit_image = load_fruit_image()
-print(f"DEBUG: shared_constants.py - Fruit image loaded: {fruit_image is not None}")
\ No newline at end of file
+_log.debug("Starting to load all images")
+_baked_images = load_asset_bundle(ASSET_BUNDLE)
+
+def _baked_image(filename, size):
+    """Return a baked image if the bundle has it at the expected size"""
+    image = _baked_images.get(filename)
+    if image is not None and image.get_size() == size:
+        return image
+    return None
+
+game_bg = _baked_image('background.png', (width, height))
+if game_bg is None:
+    game_bg = load_image_simple('background.png')
+start_menu_bg = _baked_image('SpotipyStart.png', (width, height))
+if start_menu_bg is None:
+    start_menu_bg = load_image_simple('SpotipyStart.png')
+_log.debug("About to load fruit image")
+fruit_image = _baked_image('fruit.png', (GRID_SIZE, GRID_SIZE))
+if fruit_image is None:
+    fruit_image = load_fruit_image()
+_log.debug("Fruit image loaded: %s", fruit_image is not None)
\ No newline at end of file
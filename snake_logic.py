@@ -6,10 +6,29 @@ import traceback
 import math
 from discogs_handling import (
     get_album_search_input, download_and_resize_album_cover, download_and_resize_album_cover_async,
-    play_random_track_from_album, play_uri_with_details, safe_pause_playback
+    create_visual_album_cover, is_pyodide, play_random_track_from_album, play_uri_with_details, safe_pause_playback
 )
 from shared_constants import * 
-from ui import start_menu, main_menu, quit_game_async
+import scene_manager
+from scene_manager import (
+    register_scene, go_to, scene_sleep, START_MENU, MAIN_MENU, GAME, GAME_OVER, QUIT
+)
+from idle_presenter import IdlePresenter
+from debug_log import get_logger
+from frame_profiler import get_profiler, GAME_SCOPES
+from game_rules import SnakeGame, UP, DOWN, LEFT, RIGHT
+from tile_atlas import TileAtlas
+from cover_loader import CoverJobs, cached_thumb
+from sprite_batch import Button, block_sprite, draw_blocks
+from replay import ReplayRecorder, save_last_replay
+import autopilot
+from autopilot import Autopilot
+
+log = get_logger("snake_logic")
+
+# Longest the game waits for an unanswered wake-up ping before searching anyway
+BACKEND_WAKE_WAIT_SECONDS = 10.0
+BACKEND_WAKE_POLL_SECONDS = 0.25
 
 def render_text_with_outline(text_str, font, main_color, outline_color, thickness):
     """Renders text with a specified outline color and thickness."""
@@ -38,17 +57,6 @@ def render_text_with_outline(text_str, font, main_color, outline_color, thicknes
     
     return final_surface
 
-def cut_image_into_pieces(image_surface, piece_width, piece_height):
-    """Divides a Pygame surface into a grid of smaller pieces (subsurfaces)."""
-    pieces = {}
-    for row in range(0, image_surface.get_height(), piece_height):
-        for col in range(0, image_surface.get_width(), piece_width):
-            rect = pygame.Rect(col, row, piece_width, piece_height)
-            piece = image_surface.subsurface(rect).copy()
-            grid_pos = (col // piece_width, row // piece_height)
-            pieces[grid_pos] = piece
-    return pieces  # {(x, y): surface, ...}
-
 def create_high_quality_pieces_improved(image_surface, piece_width, piece_height):
     """Creates high-quality pieces with better scaling and anti-aliasing."""
     pieces = {}
@@ -101,15 +109,97 @@ def create_high_quality_pieces(image_surface, piece_width, piece_height):
     
     return pieces  # {(x, y): surface, ...}
 
-async def wake_up_backend():
-    """Wake up the backend by making a simple ping request and wait for confirmation"""
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
+AUTOPILOT_KEY = pygame.K_F6
+
+def draw_album_pieces(surface, album_atlas, revealed_pieces):
+    """Draw the background with the revealed album pieces on it, as one blit"""
+    surface.blit(album_atlas.composite(revealed_pieces, game_bg), (0, 0))
+
+def draw_food(surface, food):
+    if food:
+        # Add bouncing animation to fruit
+        bounce_offset = int(5 * abs(math.sin(time.time() * 3)))  # Bounce up and down
+        
+        if fruit_image:
+            surface.blit(fruit_image, (food[0], food[1] - bounce_offset))
+        else:
+            surface.blit(block_sprite(RED, GRID_SIZE, BLACK), (food[0], food[1] - bounce_offset))
+
+def draw_hud(surface, score, album_title, current_speed, is_easter_egg=False):
+    # Use better retro fonts
+    try:
+        score_font = pygame.font.SysFont("Courier New", 20, bold=True)
+        info_font = pygame.font.SysFont("Courier New", 16, bold=True)
+    except:
+        try:
+            score_font = pygame.font.SysFont("Monaco", 18, bold=True)
+            info_font = pygame.font.SysFont("Monaco", 14, bold=True)
+        except:
+            score_font = pygame.font.SysFont("Arial", 18, bold=True)
+            info_font = pygame.font.SysFont("Arial", 14, bold=True)
+    
+    # Draw score
+    score_text = score_font.render(f"SCORE: {score}", True, WHITE)
+    surface.blit(score_text, (10, 10))
+    
+    # Draw album and speed info
+    album_text = info_font.render(f"ALBUM: {album_title}", True, WHITE)
+    speed_text = info_font.render(f"SPEED: {current_speed:.1f}", True, WHITE)
+    surface.blit(album_text, (10, 40))
+    surface.blit(speed_text, (10, 60))
+    
+    # Draw easter egg indicator
+    if is_easter_egg:
+        easter_text = info_font.render("EASTER EGG!", True, RED)
+        surface.blit(easter_text, (10, 80))
+
+def draw_game_frame(surface, game, album_atlas, album_title, is_easter_egg=False, profiler=None):
+    """Draw one frame of the game (everything except the display flip)"""
+    # The background image with the revealed album pieces pasted in, updated when a piece is revealed
+    board = album_atlas.composite(game.revealed_pieces, game_bg)
+    if profiler:
+        profiler.mark('draw_tiles')
+    surface.blit(board, (0, 0))
+    if profiler:
+        profiler.mark('draw_background')
+    
+    # Draw snake as individual blocks, one prebuilt sprite blitted in a single batch
+    draw_blocks(surface, block_sprite(GREEN, GRID_SIZE), game.snake_body)
+    
+    # Draw food on top
+    draw_food(surface, game.food)
+    if profiler:
+        profiler.mark('draw_snake')
+    
+    draw_hud(surface, game.score, album_title, game.current_speed, is_easter_egg)
+    if profiler:
+        profiler.draw_overlay(surface)
+        profiler.mark('hud')
+
+def wake_up_backend():
+    """Fire a /ping so a sleeping backend starts booting, without waiting for the reply
+
+    The backend warms its own caches at boot, so nothing here needs the answer;
+    backend_wake_status() reports how far it got. Only the browser build talks
+    to the backend, and a ping already in flight (or answered) isn't resent.
+    """
+    if backend_wake_status() in ('pending', 'ready'):
+        return
+    try:
+        import js
+    except ImportError:
+        log.debug("No browser, skipping backend wake-up")
+        return
     try:
-        print("DEBUG: snake_logic.py - Waking up backend...")
-        # Import BACKEND_URL from discogs_handling
         from discogs_handling import BACKEND_URL
-        
-        # Make a request to wake up the backend and wait for response
-        js_code = f'''
+        log.debug("Waking up backend...")
+        js.eval(f'''
         window.backend_wake_up_status = "pending";
         fetch("{BACKEND_URL}/ping", {{
             method: "GET",
@@ -123,38 +213,28 @@ async def wake_up_backend():
             console.log("Backend wake-up failed:", error);
             window.backend_wake_up_status = "error";
         }});
-        '''
-        import js
-        js.eval(js_code)
-        
-        # Wait for backend to respond (up to 10 seconds)
-        max_attempts = 20  # 20 attempts * 0.5 seconds = 10 seconds
-        for attempt in range(max_attempts):
-            await asyncio.sleep(0.5)
-            
-            # Check if backend responded
-            try:
-                status = js.window.backend_wake_up_status
-                if status == 200:
-                    print("DEBUG: snake_logic.py - Backend is ready!")
-                    return True
-                elif status == "error":
-                    print("DEBUG: snake_logic.py - Backend wake-up failed")
-                    return False
-                # If still pending, continue waiting
-            except:
-                # If status not set yet, continue waiting
-                pass
-        
-        print("DEBUG: snake_logic.py - Backend wake-up timeout")
-        return False
+        ''')
     except Exception as e:
-        print(f"DEBUG: snake_logic.py - Backend wake-up failed: {e}")
-        return False
+        log.warning("Backend wake-up failed: %s", e)
+
+def backend_wake_status():
+    """'idle' (no ping sent), 'pending', 'ready' or 'error'"""
+    try:
+        import js
+        status = js.window.backend_wake_up_status
+    except Exception:
+        return 'idle'
+    if status == 200:
+        return 'ready'
+    if status == "pending":
+        return 'pending'
+    if status in (None, "") or str(status) == "undefined":
+        return 'idle'
+    return 'error'
 
 async def show_backend_loading_screen(screen):
-    """Show a loading screen while backend starts up"""
-    print("DEBUG: snake_logic.py - Showing backend loading screen")
+    """Show a loading screen while the wake-up ping is still in flight; returns False if the user quit"""
+    log.debug("Showing backend loading screen")
     
     # Use better retro fonts
     try:
@@ -174,12 +254,16 @@ async def show_backend_loading_screen(screen):
     loading_rect = loading_text.get_rect(center=(width//2, height//2))
     info_rect = info_text.get_rect(center=(width//2, height//2 + 50))
     
-    # Show loading screen for a short time
-    for i in range(20):  # Show for 1 second (20 * 0.05)
-        for event in pygame.event.get():
+    # Wait until the ping is answered or the wait runs out; the text only needs drawing once
+    presenter = IdlePresenter()
+    end_time = time.monotonic() + BACKEND_WAKE_WAIT_SECONDS * scene_manager.time_scale
+    while time.monotonic() < end_time and backend_wake_status() == 'pending':
+        presenter.schedule(BACKEND_WAKE_POLL_SECONDS)
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return False
+        if not presenter.needs_redraw():
+            continue
         
         # Draw background
         if game_bg:
@@ -192,13 +276,14 @@ async def show_backend_loading_screen(screen):
         screen.blit(info_text, info_rect)
         
         pygame.display.flip()
-        await asyncio.sleep(0.05)
+        presenter.presented()
     
-    print("DEBUG: snake_logic.py - Backend loading screen completed")
+    log.debug("Backend loading screen completed")
+    return True
 
 async def show_click_to_start_screen(screen):
-    """Show click to start screen before game begins"""
-    print("DEBUG: snake_logic.py - Showing click to start screen")
+    """Show click to start screen before game begins; returns False if the user quit"""
+    log.debug("Showing click to start screen")
     
     # Use better retro font
     try:
@@ -212,12 +297,12 @@ async def show_click_to_start_screen(screen):
     click_text = font.render("CLICK TO START", True, WHITE)
     click_rect = click_text.get_rect(center=(width//2, height//2))
     
+    presenter = IdlePresenter()
     waiting_for_click = True
     while waiting_for_click:
-        for event in pygame.event.get():
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 waiting_for_click = False
                 break
@@ -225,6 +310,8 @@ async def show_click_to_start_screen(screen):
                 if event.key in [pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE]:
                     waiting_for_click = False
                     break
+        if not waiting_for_click or not presenter.needs_redraw():
+            continue
         
         # Draw background
         if game_bg:
@@ -236,13 +323,14 @@ async def show_click_to_start_screen(screen):
         screen.blit(click_text, click_rect)
         
         pygame.display.flip()
-        await asyncio.sleep(0.01)
+        presenter.presented()
     
-    print("DEBUG: snake_logic.py - Click to start completed")
+    log.debug("Click to start completed")
+    return True
 
 async def show_click_to_continue_screen(screen, score):
-    """Show click to continue screen after death"""
-    print("DEBUG: snake_logic.py - Showing click to continue screen")
+    """Show click to continue screen after death; returns False if the user quit"""
+    log.debug("Showing click to continue screen")
     
     # Use better retro font
     try:
@@ -259,12 +347,12 @@ async def show_click_to_continue_screen(screen, score):
     continue_rect = continue_text.get_rect(center=(width//2, height//2))
     score_rect = score_text.get_rect(center=(width//2, height//2 + 50))
     
+    presenter = IdlePresenter()
     waiting_for_click = True
     while waiting_for_click:
-        for event in pygame.event.get():
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 waiting_for_click = False
                 break
@@ -272,6 +360,8 @@ async def show_click_to_continue_screen(screen, score):
                 if event.key in [pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE]:
                     waiting_for_click = False
                     break
+        if not waiting_for_click or not presenter.needs_redraw():
+            continue
         
         # Draw background
         if game_bg:
@@ -284,16 +374,18 @@ async def show_click_to_continue_screen(screen, score):
         screen.blit(score_text, score_rect)
         
         pygame.display.flip()
-        await asyncio.sleep(0.01)
+        presenter.presented()
     
-    print("DEBUG: snake_logic.py - Click to continue completed")
+    log.debug("Click to continue completed")
+    return True
 
-async def show_game_over_screen(screen, score, album_result, album_pieces, revealed_pieces, won_game=False):
+@register_scene(GAME_OVER)
+async def show_game_over_screen(screen, score, album_result, album_atlas, revealed_pieces, won_game=False):
     """Show game over or win screen with two buttons"""
     if won_game:
-        print("DEBUG: snake_logic.py - Showing WIN screen")
+        log.debug("Showing WIN screen")
     else:
-        print("DEBUG: snake_logic.py - Showing game over screen")
+        log.debug("Showing game over screen")
     
     # Use better retro fonts
     try:
@@ -323,87 +415,137 @@ async def show_game_over_screen(screen, score, album_result, album_pieces, revea
     
     retry_text = button_font.render("RETRY ALBUM", True, BLACK)
     new_game_text = button_font.render("NEW GAME", True, BLACK)
-    
-    retry_text_rect = retry_text.get_rect(center=retry_button.center)
-    new_game_text_rect = new_game_text.get_rect(center=new_game_button.center)
+    retry_button = Button(retry_button, retry_text, LIGHT_BLUE, DARK_BLUE)
+    new_game_button = Button(new_game_button, new_game_text, LIGHT_BLUE, DARK_BLUE)
     
     game_over_rect = game_over_text.get_rect(center=(width//2, height//2 - 50))
     score_rect = final_score_text.get_rect(center=(width//2, height//2))
     
     # Game over screen loop
-    waiting_for_input = True
-    while waiting_for_input:
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for event in pygame.event.get():
+    presenter = IdlePresenter()
+    while True:
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return go_to(QUIT)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if retry_button.collidepoint(event.pos):
-                    print("DEBUG: snake_logic.py - Retry button clicked, restarting game with same album")
-                    waiting_for_input = False
+                    log.debug("Retry button clicked, restarting game with same album")
                     # Restart the game with the same album
-                    await start_game(screen, album_result)
-                    return
+                    return go_to(GAME, album_result=album_result)
                 elif new_game_button.collidepoint(event.pos):
-                    print("DEBUG: snake_logic.py - New game button clicked, going to search")
-                    waiting_for_input = False
+                    log.debug("New game button clicked, going to search")
                     # Go back to album search
-                    await start_game(screen)
-                    return
+                    return go_to(GAME)
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    print("DEBUG: snake_logic.py - R key pressed, restarting game")
-                    waiting_for_input = False
-                    await start_game(screen, album_result)
-                    return
+                    log.debug("R key pressed, restarting game")
+                    return go_to(GAME, album_result=album_result)
                 elif event.key == pygame.K_n:
-                    print("DEBUG: snake_logic.py - N key pressed, going to search")
-                    waiting_for_input = False
-                    await start_game(screen)
-                    return
+                    log.debug("N key pressed, going to search")
+                    return go_to(GAME)
         
-        # Draw game over screen
-        if game_bg:
-            screen.blit(game_bg, (0, 0))
-        else:
-            screen.fill(BLACK)
+        mouse_pos = pygame.mouse.get_pos()
+        retry_hovered = retry_button.collidepoint(mouse_pos)
+        new_game_hovered = new_game_button.collidepoint(mouse_pos)
+        presenter.watch('hover', (retry_hovered, new_game_hovered))
+        if not presenter.needs_redraw():
+            continue
         
-        # Draw revealed album pieces
-        for pos in revealed_pieces:
-            # Draw the piece at its proper grid position
-            px, py = pos[0] * ALBUM_GRID_SIZE, pos[1] * ALBUM_GRID_SIZE
-            if pos in album_pieces:
-                screen.blit(album_pieces[pos], (px, py))
+        # Draw game over screen over the revealed album pieces
+        draw_album_pieces(screen, album_atlas, revealed_pieces)
         
-        screen.blit(game_over_text, game_over_rect)
-        screen.blit(final_score_text, score_rect)
+        # Draw the text and the buttons with hover effects in one batch
+        screen.blits([(game_over_text, game_over_rect), (final_score_text, score_rect),
+                      retry_button.sprite(retry_hovered), new_game_button.sprite(new_game_hovered)], doreturn=False)
         
-        # Draw buttons with hover effects
-        retry_color = DARK_BLUE if retry_button.collidepoint(mouse_pos) else LIGHT_BLUE
-        new_game_color = DARK_BLUE if new_game_button.collidepoint(mouse_pos) else LIGHT_BLUE
+        pygame.display.flip()
+        presenter.presented()
+
+async def load_album_atlas(album_image_url):
+    """Desktop: the album's atlas, built on the cover pool while the window keeps handling events
+
+    Returns (atlas, None), with atlas None if the download failed, or
+    (None, transition) if the player closed the window or pressed Escape
+    before it was ready, in which case the job is cancelled.
+    """
+    jobs = CoverJobs()
+    # Same two steps as download_album_atlas: a 300x300 download scaled up to the board
+    future = jobs.submit(album_image_url, album_image_url, (300, 300), scale_to=(width, height), tile_size=ALBUM_GRID_SIZE)
+    while not future.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                jobs.cancel()
+                return None, go_to(QUIT)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                jobs.cancel()
+                return None, go_to(START_MENU)
+        await scene_sleep(0.02)
+    album_atlas = jobs.result(future)
+    if album_atlas is None:
+        log.warning("Failed to download original image, using fallback")
+        album_atlas = TileAtlas(pygame.transform.scale(create_visual_album_cover(album_image_url, 300, 300), (width, height)), ALBUM_GRID_SIZE)
+    return album_atlas, None
+
+async def load_full_cover(album_image_url):
+    """The full-size cover scaled to the board, or None; runs behind a game started on the thumbnail"""
+    if is_pyodide():
+        cover = await download_and_resize_album_cover_async(album_image_url, 300, 300, fallback=False)
+        return pygame.transform.scale(cover, (width, height)) if cover else None
+    return await CoverJobs().wait(album_image_url, album_image_url, (300, 300), scale_to=(width, height))
+
+def sharpen_album(album_atlas, full_cover):
+    """Swap a finished load_full_cover task's image into the atlas the game is drawing"""
+    cover = None if full_cover.cancelled() or full_cover.exception() else full_cover.result()
+    if cover is None:
+        log.warning("Full-size cover failed to load, keeping the thumbnail")
+        return
+    album_atlas.replace_image(cover)
+    log.debug("Sharpened album cover")
+
+async def download_album_atlas(album_image_url):
+    """The album's atlas, downloaded on the event loop (browser build, or no cover URL)"""
+    try:
+        # Download the original image and upscale it for better quality pieces
+        log.debug("Original URL: %s", album_image_url)
         
-        pygame.draw.rect(screen, retry_color, retry_button)
-        pygame.draw.rect(screen, new_game_color, new_game_button)
-        pygame.draw.rect(screen, BLACK, retry_button, 2)
-        pygame.draw.rect(screen, BLACK, new_game_button, 2)
-        screen.blit(retry_text, retry_text_rect)
-        screen.blit(new_game_text, new_game_text_rect)
+        # Try a more conservative approach - download at original size and scale less aggressively
+        log.debug("Using conservative scaling approach")
         
-        pygame.display.flip()
-        await asyncio.sleep(0.01)
-    
-    print("DEBUG: snake_logic.py - Game over screen completed")
+        # Download at higher quality 300x300 size first
+        original_cover = await download_and_resize_album_cover_async(album_image_url, 300, 300)
+        if original_cover:
+            log.debug("Downloaded original 300x300 image")
+            
+            # Scale directly to final size for better quality
+            album_cover = pygame.transform.scale(original_cover, (width, height))
+            log.debug("Final scale to %sx%s", width, height)
+        else:
+            log.warning("Failed to download original image, using fallback")
+            album_cover = create_fallback_album_cover(width, height)
+        if album_cover:
+            log.debug("Downloaded %sx%s image directly", width, height)
+            log.debug("Album cover downloaded successfully")
+        else:
+            log.warning("Failed to download image, using fallback")
+            album_cover = create_fallback_album_cover(width, height)
+    except Exception as e:
+        log.warning("Error downloading album cover: %s", e)
+        album_cover = create_fallback_album_cover(width, height)
 
+    # The cover stays one surface; pieces are drawn from it by rect
+    return TileAtlas(album_cover, ALBUM_GRID_SIZE)
+
+@register_scene(GAME)
 async def start_game(screen, album_result=None):
     """Initializes and runs the main DiscogSnake game loop, including setup and event handling."""
-    print("DEBUG: snake_logic.py - start_game called")
-    print(f"DEBUG: snake_logic.py - fruit_image available: {fruit_image is not None}")
+    log.debug("start_game called")
+    log.debug("fruit_image available: %s", fruit_image is not None)
     pygame.display.set_caption('DiscogSnake')
 
-    # Show loading screen (backend wake-up moved to start menu)
-    await show_backend_loading_screen(screen)
+    # The menu fires the wake-up ping without waiting; only hold the search back if it's still in flight
+    if album_result is None and backend_wake_status() == 'pending':
+        if not await show_backend_loading_screen(screen):
+            return go_to(QUIT)
 
     test_font_object = None
 
@@ -411,50 +553,45 @@ async def start_game(screen, album_result=None):
     if album_result is None:
         try:
             test_font_object = pygame.font.SysFont('corbel', 20)
-            print("DEBUG: snake_logic.py - Font loaded successfully")
+            log.debug("Font loaded successfully")
         except Exception as e:
-            print(f"DEBUG: snake_logic.py - Font loading failed: {e}")
+            log.warning("Font loading failed: %s", e)
             traceback.print_exc()
-            await asyncio.sleep(1)
+            await scene_sleep(1)
             try:
                 fallback_font = pygame.font.SysFont('sans', 20) 
-                print("DEBUG: snake_logic.py - Using fallback font")
+                log.debug("Using fallback font")
                 album_result = await get_album_search_input(screen, fallback_font)
             except Exception as e:
-                print(f"DEBUG: snake_logic.py - Fallback font also failed: {e}")
+                log.warning("Fallback font also failed: %s", e)
                 traceback.print_exc()
-                await start_menu()
-                return
+                return go_to(START_MENU)
         else:
             try:
-                print("DEBUG: snake_logic.py - Getting album search input")
+                log.debug("Getting album search input")
                 album_result = await get_album_search_input(screen, test_font_object)
-                print(f"DEBUG: snake_logic.py - Album search result: {album_result}")
+                log.debug("Album search result: %s", album_result)
             except Exception as e:
-                print(f"DEBUG: snake_logic.py - Album search failed: {e}")
+                log.warning("Album search failed: %s", e)
                 traceback.print_exc()
-                await start_menu()
-                return
+                return go_to(START_MENU)
     else:
-        print("DEBUG: snake_logic.py - Using provided album_result for retry")
+        log.debug("Using provided album_result for retry")
 
     # Extra debug: ensure album_result is valid
     if album_result == USER_ABORT_GAME_FROM_SEARCH:
-        print("DEBUG: snake_logic.py - User aborted from search (album_result == USER_ABORT_GAME_FROM_SEARCH)")
-        await quit_game_async()
-        return
+        log.debug("User aborted from search (album_result == USER_ABORT_GAME_FROM_SEARCH)")
+        return go_to(QUIT)
     
     if album_result == "BACK_TO_MENU":
-        print("DEBUG: snake_logic.py - User chose back to menu (album_result == BACK_TO_MENU)")
-        await start_menu()
-        return
+        log.debug("User chose back to menu (album_result == BACK_TO_MENU)")
+        return go_to(START_MENU)
     
     if not album_result:
-        print("DEBUG: snake_logic.py - No album selected, returning to menu")
-        await start_menu()
-        return
+        log.debug("No album selected, returning to menu")
+        return go_to(START_MENU)
 
-    print(f"DEBUG: snake_logic.py - Album selected: {album_result}")
+    log.debug("Album selected: %s", album_result)
     
     # Extract album information
     album_title = album_result.get('title', 'Unknown Album')
@@ -462,63 +599,29 @@ async def start_game(screen, album_result=None):
     album_image_url = album_result.get('image_url', None)
     album_id = album_result.get('id', 0)
     
-    print(f"DEBUG: snake_logic.py - Album title: {album_title}")
-    print(f"DEBUG: snake_logic.py - Album artist: {album_artist}")
-    print(f"DEBUG: snake_logic.py - Album image URL: {album_image_url}")
-    print(f"DEBUG: snake_logic.py - Album ID: {album_id}")
+    log.debug("Album title: %s", album_title)
+    log.debug("Album artist: %s", album_artist)
+    log.debug("Album image URL: %s", album_image_url)
+    log.debug("Album ID: %s", album_id)
 
     # Download and process the album cover
-    print("DEBUG: snake_logic.py - Downloading album cover")
-    try:
-        # Download the original image and upscale it for better quality pieces
-        print(f"DEBUG: snake_logic.py - Original URL: {album_image_url}")
-        
-        # Try a more conservative approach - download at original size and scale less aggressively
-        print(f"DEBUG: snake_logic.py - Using conservative scaling approach")
-        
-        # Download at higher quality 300x300 size first
-        original_cover = await download_and_resize_album_cover_async(album_image_url, 300, 300)
-        if original_cover:
-            print(f"DEBUG: snake_logic.py - Downloaded original 300x300 image")
-            
-            # Scale directly to final size for better quality
-            album_cover = pygame.transform.scale(original_cover, (width, height))
-            print(f"DEBUG: snake_logic.py - Final scale to {width}x{height}")
-        else:
-            print(f"DEBUG: snake_logic.py - Failed to download original image, using fallback")
-            album_cover = create_fallback_album_cover(width, height)
-        if album_cover:
-            print(f"DEBUG: snake_logic.py - Downloaded {width}x{height} image directly")
-            print("DEBUG: snake_logic.py - Album cover downloaded successfully")
-        else:
-            print(f"DEBUG: snake_logic.py - Failed to download image, using fallback")
-            album_cover = create_fallback_album_cover(width, height)
-    except Exception as e:
-        print(f"DEBUG: snake_logic.py - Error downloading album cover: {e}")
-        album_cover = create_fallback_album_cover(width, height)
-
-    # Cut the album cover into pieces with different approach
-    print("DEBUG: snake_logic.py - Cutting album cover into pieces")
-    # Try using the original cut method but with better source image
-    album_pieces = cut_image_into_pieces(album_cover, ALBUM_GRID_SIZE, ALBUM_GRID_SIZE)
-    print(f"DEBUG: snake_logic.py - Created {len(album_pieces)} album pieces")
+    log.debug("Downloading album cover")
+    album_atlas = None
+    full_cover = None  # Task loading the full-size cover while the game runs on the thumbnail
+    thumb = cached_thumb(album_result.get('thumb') or album_image_url)
+    if album_image_url and thumb is not None:
+        # The search screen already loaded the thumbnail: start on it and sharpen in place later
+        album_atlas = TileAtlas(pygame.transform.scale(thumb, (width, height)), ALBUM_GRID_SIZE)
+        full_cover = asyncio.create_task(load_full_cover(album_image_url))
+        log.debug("Starting on the cached thumbnail")
+    elif album_image_url and not is_pyodide():
+        album_atlas, leave = await load_album_atlas(album_image_url)
+        if leave:
+            return leave
+    if album_atlas is None:
+        album_atlas = await download_album_atlas(album_image_url)
+    log.debug("Created atlas of %s album pieces", len(album_atlas))
 
-    # Initialize game state
-    # Snake should be fixed size (5 blocks) and not grow
-    snake_pos = [width//2, height//2]
-    snake_body = [[snake_pos[0] - i * GRID_SIZE, snake_pos[1]] for i in range(5)]
-    snake_direction = [GRID_SIZE, 0]
-    food = None
-    score = 0
-    game_over = False
-    clock = pygame.time.Clock()
-    
-    # Track revealed album pieces
-    revealed_pieces = set()
-    
-    # Game state
-    won_game = False
-    
     # Song info display
     current_song = "Discogs Album"
     current_artist = album_artist
@@ -529,214 +632,92 @@ async def start_game(screen, album_result=None):
         current_song = song_name
         current_artist = artist_name
         is_easter_egg = easter_egg
-        print(f"DEBUG: snake_logic.py - Song info updated: {song_name} by {artist_name}")
+        log.debug("Song info updated: %s by %s", song_name, artist_name)
 
     # Start playing music (placeholder for Discogs)
-    print("DEBUG: snake_logic.py - Starting album playback (placeholder)")
+    log.debug("Starting album playback (placeholder)")
     try:
         await play_random_track_from_album(album_id, update_song_info)
-        print("DEBUG: snake_logic.py - Album playback started")
+        log.debug("Album playback started")
     except Exception as e:
-        print(f"DEBUG: snake_logic.py - Failed to start album playback: {e}")
+        log.warning("Failed to start album playback: %s", e)
         update_song_info("Discogs Album", album_artist, False)
 
-    def generate_food():
-        nonlocal food
-        attempts = 0
-        while attempts < 100:  # Prevent infinite loop
-            x = random.randrange(0, width, GRID_SIZE)
-            y = random.randrange(0, height, GRID_SIZE)
-            food = (x, y)
-            # Don't place food on snake or on revealed album grid positions
-            fruit_album_grid = (food[0] // ALBUM_GRID_SIZE, food[1] // ALBUM_GRID_SIZE)
-            if food not in snake_body and fruit_album_grid not in revealed_pieces:
-                print(f"DEBUG: snake_logic.py - Generated food at {food}, revealed pieces: {len(revealed_pieces)}")
-                break
-            attempts += 1
-        
-        if attempts >= 100:
-            print("DEBUG: snake_logic.py - Warning: Could not find valid food position after 100 attempts")
-            # Fallback: find any available position
-            for x in range(0, width, GRID_SIZE):
-                for y in range(0, height, GRID_SIZE):
-                    pos = (x, y)
-                    pos_album_grid = (pos[0] // ALBUM_GRID_SIZE, pos[1] // ALBUM_GRID_SIZE)
-                    if pos not in snake_body and pos_album_grid not in revealed_pieces:
-                        food = pos
-                        print(f"DEBUG: snake_logic.py - Fallback food at {food}")
-                return
-
-
-    def draw_food():
-        if food:
-            # Add bouncing animation to fruit
-            bounce_offset = int(5 * abs(math.sin(time.time() * 3)))  # Bounce up and down
-            
-            if fruit_image:
-                screen.blit(fruit_image, (food[0], food[1] - bounce_offset))
-        else:
-                pygame.draw.rect(screen, RED, (food[0], food[1] - bounce_offset, GRID_SIZE, GRID_SIZE))
-                pygame.draw.rect(screen, BLACK, (food[0], food[1] - bounce_offset, GRID_SIZE, GRID_SIZE), 1)
-
-    def draw_album_pieces():
-        # Only draw album pieces that have been revealed
-        for pos in revealed_pieces:
-            # Draw the piece at its proper grid position like the original
-            px, py = pos[0] * ALBUM_GRID_SIZE, pos[1] * ALBUM_GRID_SIZE
-            if pos in album_pieces:
-                screen.blit(album_pieces[pos], (px, py))
-        
-    def draw_ui():
-        # Use better retro fonts
-        try:
-            score_font = pygame.font.SysFont("Courier New", 20, bold=True)
-            info_font = pygame.font.SysFont("Courier New", 16, bold=True)
-        except:
-            try:
-                score_font = pygame.font.SysFont("Monaco", 18, bold=True)
-                info_font = pygame.font.SysFont("Monaco", 14, bold=True)
-            except:
-                score_font = pygame.font.SysFont("Arial", 18, bold=True)
-                info_font = pygame.font.SysFont("Arial", 14, bold=True)
-        
-        # Draw score
-        score_text = score_font.render(f"SCORE: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        
-        # Draw album and speed info
-        album_text = info_font.render(f"ALBUM: {album_title}", True, WHITE)
-        speed_text = info_font.render(f"SPEED: {current_speed:.1f}", True, WHITE)
-        screen.blit(album_text, (10, 40))
-        screen.blit(speed_text, (10, 60))
-        
-        # Draw easter egg indicator
-        if is_easter_egg:
-            easter_text = info_font.render("EASTER EGG!", True, RED)
-            screen.blit(easter_text, (10, 80))
+    # Initialize game state (seeded from the current time for true randomness)
+    game = SnakeGame()
+    # Every accepted turn is logged so the game can be replayed exactly
+    recorder = ReplayRecorder(game, album_id)
 
-    # Initialize random seed for this game session
-    import random
-    import time
-    random.seed(time.time())  # Use current time for true randomness
+    log.debug("Starting main game loop")
     
-    # Generate initial food
-    generate_food()
+    def stop_full_cover():
+        if full_cover is not None:
+            full_cover.cancel()
 
-    print("DEBUG: snake_logic.py - Starting main game loop")
-    
     # Click to start screen
-    await show_click_to_start_screen(screen)
-    
-    # Speed progression variables
-    current_speed = 7  # Start at 7
-    speed_increase_interval = 5  # Increase every 5 pieces
-    pieces_eaten = 0
-    
-    # Input buffering to prevent rapid direction changes
-    direction_changed_this_frame = False
+    if not await show_click_to_start_screen(screen):
+        stop_full_cover()
+        return go_to(QUIT)
     
+    profiler = get_profiler("start_game", GAME_SCOPES)
+    pilot = Autopilot(game) if autopilot.mode != autopilot.OFF else None
+
     # Main game loop
-    while not game_over:
+    while not game.game_over:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                print("DEBUG: snake_logic.py - QUIT event received")
-                await quit_game_async()
-                return
-            elif event.type == pygame.KEYDOWN and not direction_changed_this_frame:
-                if event.key == pygame.K_UP and snake_direction[1] != GRID_SIZE:
-                    snake_direction = [0, -GRID_SIZE]
-                    direction_changed_this_frame = True
-                elif event.key == pygame.K_DOWN and snake_direction[1] != -GRID_SIZE:
-                    snake_direction = [0, GRID_SIZE]
-                    direction_changed_this_frame = True
-                elif event.key == pygame.K_LEFT and snake_direction[0] != GRID_SIZE:
-                    snake_direction = [-GRID_SIZE, 0]
-                    direction_changed_this_frame = True
-                elif event.key == pygame.K_RIGHT and snake_direction[0] != -GRID_SIZE:
-                    snake_direction = [GRID_SIZE, 0]
-                    direction_changed_this_frame = True
+                log.debug("QUIT event received")
+                stop_full_cover()
+                return go_to(QUIT)
+            elif event.type == pygame.KEYDOWN and profiler.handle_key(event.key):
+                continue
+            elif event.type == pygame.KEYDOWN:
+                if event.key == AUTOPILOT_KEY:
+                    pilot = None if pilot else Autopilot(game)
+                    log.info("Autopilot %s", "on" if pilot else "off")
+                elif event.key in KEY_DIRECTIONS and pilot is None:
+                    recorder.change_direction(KEY_DIRECTIONS[event.key])
                 elif event.key == pygame.K_ESCAPE:
-                    print("DEBUG: snake_logic.py - ESC key pressed, returning to menu")
-                    await main_menu()
-                    return
-
-        # Move snake
-        new_head = (snake_body[0][0] + snake_direction[0], snake_body[0][1] + snake_direction[1])
-        
-        # Check for collisions
-        if (new_head[0] < 0 or new_head[0] >= width or 
-            new_head[1] < 0 or new_head[1] >= height or 
-            new_head in snake_body):
-            print(f"DEBUG: snake_logic.py - Game over due to collision at {new_head}")
-            game_over = True
-            break
-        
-        # Check for win condition (all album pieces revealed)
-        if len(revealed_pieces) >= 100:  # 10x10 grid = 100 pieces
-            print(f"DEBUG: snake_logic.py - WIN! All album pieces revealed!")
-            game_over = True
-            won_game = True
+                    log.debug("ESC key pressed, returning to menu")
+                    stop_full_cover()
+                    return go_to(MAIN_MENU)
+        if full_cover is not None and full_cover.done():
+            sharpen_album(album_atlas, full_cover)
+            full_cover = None
+        if pilot:
+            pilot.steer(recorder.change_direction)
+        profiler.mark('events')
+
+        game.step()
+        profiler.mark('simulate')
+        if game.game_over:
             break
 
-        # Move snake (fixed size, so we remove tail and add new head)
-        snake_body.pop()  # Remove tail
-        snake_body.insert(0, new_head)  # Add new head
-        
-        # Check if food is eaten
-        if snake_body[0] == food:
-            score += 10
-            pieces_eaten += 1
-            # Reveal the album piece at the grid position like the original
-            fruit_album_grid = (food[0] // ALBUM_GRID_SIZE, food[1] // ALBUM_GRID_SIZE)
-            if fruit_album_grid not in revealed_pieces:
-                revealed_pieces.add(fruit_album_grid)
-                print(f"DEBUG: snake_logic.py - Food eaten, score: {score}, revealed piece at grid {fruit_album_grid}")
-            else:
-                print(f"DEBUG: snake_logic.py - Warning: Grid position {fruit_album_grid} already revealed!")
-            
-            # Increase speed every 5 pieces
-            if pieces_eaten % speed_increase_interval == 0:
-                current_speed += 1
-                print(f"DEBUG: snake_logic.py - Speed increased to {current_speed}")
-            
-            # Generate new food after revealing the piece
-            generate_food()
-        # Note: snake doesn't grow, so no else clause needed
-
-        # Draw everything
-        # Use background image instead of black
-        if game_bg:
-            screen.blit(game_bg, (0, 0))
-        else:
-            screen.fill(BLACK)
-        
-        # Draw revealed album pieces first (background)
-        draw_album_pieces()
-        
-        # Draw snake as individual blocks
-        for block in snake_body:
-            pygame.draw.rect(screen, GREEN, pygame.Rect(block[0], block[1], GRID_SIZE, GRID_SIZE))
-        
-        # Draw food on top
-        draw_food()
-        
-        # Draw UI
-        draw_ui()
+        draw_game_frame(screen, game, album_atlas, album_title, is_easter_egg, profiler)
         
         pygame.display.flip()
+        profiler.mark('flip')
         # Use async sleep for better performance like the original
-        await asyncio.sleep(1/current_speed)
-        
-        # Reset direction change flag for next frame
-        direction_changed_this_frame = False
+        if pilot and autopilot.mode == autopilot.UNCAPPED:
+            await asyncio.sleep(0)
+        else:
+            await scene_sleep(1/game.current_speed)
+        profiler.mark('sleep')
+        profiler.end_frame()
 
-    print("DEBUG: snake_logic.py - Game over, showing click to continue")
+    log.debug("Game over, showing click to continue")
+    stop_full_cover()
+    replay_code = save_last_replay(recorder.finish())
+    log.debug("Replay: %s", replay_code)
     
     # First show click to continue screen
-    await show_click_to_continue_screen(screen, score)
+    if not await show_click_to_continue_screen(screen, game.score):
+        return go_to(QUIT)
     
     # Then show game over/win screen with two buttons
-    await show_game_over_screen(screen, score, album_result, album_pieces, revealed_pieces, won_game)
+    return go_to(GAME_OVER, score=game.score, album_result=album_result, album_atlas=album_atlas,
+                 revealed_pieces=game.revealed_pieces, won_game=game.won)
 
 def create_fallback_album_cover(target_width, target_height):
     """Create a fallback album cover when image download fails"""
@@ -779,5 +760,5 @@ def create_fallback_album_cover(target_width, target_height):
         
         return surface
     except Exception as e:
-        print(f"DEBUG: snake_logic.py - Error creating fallback album cover: {e}")
+        log.warning("Error creating fallback album cover: %s", e)
         return None
\ No newline at end of file
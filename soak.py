@@ -0,0 +1,100 @@
+"""Soak test: play many consecutive games through the scene loop and watch memory.
+
+Runs headless under SDL's dummy video driver with scene delays turned off.
+A scripted player clicks through the start and continue screens and hits
+RETRY on every game over, so each game goes start -> play -> die -> retry
+exactly like a real session. With --autopilot every game is played through
+to the 100-piece win instead of running into a wall. Process memory is sampled as games complete,
+and the run fails if it grows by more than --max-growth-mb after warm-up.
+
+    python soak.py --games 1000
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import asyncio
+import gc
+import resource
+import sys
+import time
+
+import pygame
+import ui
+import scene_manager
+import autopilot
+from scene_manager import run_scenes, GAME
+
+SOAK_ALBUM = {'title': 'Soak Test', 'artist': 'Soak Test', 'image_url': None, 'id': 0}
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Peak RSS is the best we can do without /proc (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def games_started():
+    return scene_manager.scene_counts.get(GAME, 0)
+
+async def scripted_player(games, sample_every, samples):
+    """Feed input to whichever screen is showing until the requested games are played"""
+    next_sample = sample_every
+    while True:
+        await asyncio.sleep(0)
+        completed = games_started() - 1
+        if completed >= next_sample:
+            gc.collect()
+            samples.append((completed, current_rss_mb(), len(gc.get_objects())))
+            print(f"games {completed:>6}  rss {samples[-1][1]:8.1f} MB  objects {samples[-1][2]:>8}")
+            next_sample += sample_every
+        if completed >= games:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+            return
+        if not pygame.event.peek(pygame.KEYDOWN):
+            # RETURN gets past the click-to-start/continue screens, R retries on game over
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode='\r', mod=0))
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r, unicode='r', mod=0))
+
+async def soak(games, sample_every):
+    scene_manager.time_scale = 0
+    samples = [(0, current_rss_mb(), len(gc.get_objects()))]
+    player = asyncio.ensure_future(scripted_player(games, sample_every, samples))
+    await run_scenes(ui.screen, GAME, album_result=SOAK_ALBUM)
+    await player
+    return samples
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many games in a row and check memory stays flat")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--sample-every', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=50, help="games to play before taking the reference sample")
+    parser.add_argument('--max-growth-mb', type=float, default=16.0)
+    parser.add_argument('--autopilot', action='store_true', help="let the autopilot play every game to a full reveal")
+    args = parser.parse_args(argv)
+    if args.autopilot:
+        autopilot.mode = autopilot.UNCAPPED
+
+    start = time.perf_counter()
+    samples = asyncio.run(soak(args.games, args.sample_every))
+    elapsed = time.perf_counter() - start
+
+    reference = next((s for s in samples if s[0] >= args.warmup), samples[0])
+    final = samples[-1]
+    growth = final[1] - reference[1]
+    print(f"\n{final[0]} games in {elapsed:.1f}s; RSS {reference[1]:.1f} MB after {reference[0]} games -> "
+          f"{final[1]:.1f} MB ({growth:+.1f} MB), objects {reference[2]} -> {final[2]}")
+    if growth > args.max_growth_mb:
+        print(f"FAIL: memory grew by more than {args.max_growth_mb} MB")
+        return 1
+    print("OK: memory stayed flat")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
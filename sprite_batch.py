@@ -0,0 +1,52 @@
+"""Prebuilt sprites drawn in batches with Surface.blits().
+
+Anything drawn the same way every frame (snake blocks, menu buttons with
+their border and label) is rendered once into a surface. A frame then hands
+each layer to a single Surface.blits() call instead of making a Rect and a
+pygame.draw call per block or button, so the Python work per frame doesn't
+grow with the length of the snake or the number of buttons.
+"""
+from itertools import repeat
+
+import pygame
+
+_blocks = {}
+
+def block_sprite(color, size, border_color=None, border_width=1):
+    """A size x size square of color, optionally bordered; built once per combination"""
+    key = (tuple(color), size, tuple(border_color) if border_color else None, border_width)
+    sprite = _blocks.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((size, size))
+        sprite.fill(color)
+        if border_color:
+            pygame.draw.rect(sprite, border_color, sprite.get_rect(), border_width)
+        _blocks[key] = sprite
+    return sprite
+
+def draw_blocks(target, sprite, positions):
+    """Blit sprite at every (x, y) in positions with one C-level call"""
+    target.blits(zip(repeat(sprite), positions), doreturn=False)
+
+class Button:
+    """Menu button prebuilt as a normal and a hover image, label and border included"""
+
+    def __init__(self, rect, label, fill, hover_fill=None, border_color=(0, 0, 0), border_width=2):
+        self.rect = pygame.Rect(rect)
+        self.image = self._render(label, fill, border_color, border_width)
+        self.hover_image = (self._render(label, hover_fill, border_color, border_width)
+                            if hover_fill is not None else self.image)
+
+    def _render(self, label, fill, border_color, border_width):
+        image = pygame.Surface(self.rect.size)
+        image.fill(fill)
+        pygame.draw.rect(image, border_color, image.get_rect(), border_width)
+        image.blit(label, label.get_rect(center=image.get_rect().center))
+        return image
+
+    def collidepoint(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def sprite(self, hovered=False):
+        """(surface, position) pair for Surface.blits()"""
+        return (self.hover_image if hovered else self.image, self.rect)
@@ -0,0 +1,91 @@
+"""Album cover kept as one surface, drawn through a pre-composited board.
+
+The cover is never cut into separate surfaces. A rect table indexed by tile
+number (row * cols + col) says where each tile sits in the atlas, and since
+the atlas covers the board from its top-left corner, the same rect is also
+where the tile goes on the board.
+
+composite() keeps a copy of the background with every revealed tile pasted
+in. Tiles are pasted with one Surface.blits() call when they are revealed,
+so drawing the background and all revealed pieces is a single opaque blit
+per frame, however many pieces there are. (Blitting the tiles straight from
+the atlas every frame would be no cheaper: pygame blits from a large source
+to many destinations at about 15 us a tile.)
+
+replace_image() swaps in a sharper copy of the cover (the game starts on
+the upscaled thumbnail). Tiles already on the board are repainted from it
+REPAINT_PER_FRAME at a time, so even a full 64x64 board sharpens over a few
+frames without one long one.
+"""
+import pygame
+
+REPAINT_PER_FRAME = 128
+
+class TileAtlas:
+    """Cover image plus the rect of every tile in it"""
+
+    def __init__(self, image, tile_size):
+        self.surface = image
+        self.tile_size = tile_size
+        self.cols = image.get_width() // tile_size
+        self.rows = image.get_height() // tile_size
+        self.rects = [pygame.Rect(col * tile_size, row * tile_size, tile_size, tile_size)
+                      for row in range(self.rows) for col in range(self.cols)]
+        self._board = None
+        self._grid = None
+        self._background = None
+        self._pasted = set()
+        self._stale = set()
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, cell):
+        return 0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows
+
+    def tile_number(self, cell):
+        return cell[1] * self.cols + cell[0]
+
+    def tile(self, cell):
+        """One tile as a subsurface of the atlas (no copy)"""
+        return self.surface.subsurface(self.rects[self.tile_number(cell)])
+
+    def composite(self, revealed, background=None):
+        """The background (or black) with the revealed cells pasted in, as one surface
+
+        revealed is a TileGrid or set of (col, row). Pieces are only ever
+        added to a game's grid, so only cells not pasted yet are drawn; a
+        different grid or background starts a fresh board.
+        """
+        if revealed is not self._grid or background is not self._background or self._board is None:
+            if background is not None:
+                self._board = background.copy()
+            else:
+                self._board = pygame.Surface(self.surface.get_size())
+                self._board.fill((0, 0, 0))
+            self._grid = revealed
+            self._background = background
+            self._pasted = set()
+            self._stale = set()
+        if len(revealed) != len(self._pasted):
+            new = [cell for cell in revealed if cell not in self._pasted]
+            rects = self.rects
+            self._board.blits([(self.surface, rects[self.tile_number(cell)], rects[self.tile_number(cell)])
+                               for cell in new if cell in self], doreturn=False)
+            self._pasted.update(new)
+        if self._stale:
+            batch = [self._stale.pop() for _ in range(min(REPAINT_PER_FRAME, len(self._stale)))]
+            self._board.blits([(self.surface, self.rects[self.tile_number(cell)], self.rects[self.tile_number(cell)])
+                               for cell in batch if cell in self], doreturn=False)
+        return self._board
+
+    def replace_image(self, image):
+        """Use image, scaled to the atlas size if needed, from now on
+
+        Tiles already pasted on the board are repainted from it over the
+        next few composite() calls.
+        """
+        if image.get_size() != self.surface.get_size():
+            image = pygame.transform.scale(image, self.surface.get_size())
+        self.surface = image
+        self._stale = set(self._pasted)
@@ -1,85 +1,82 @@
-print("UI MODULE LOADED")
-print("DEBUG: ui.py - Starting UI module initialization")
+from debug_log import get_logger
+
+log = get_logger("ui")
+log.info("UI MODULE LOADED")
+log.debug("Starting UI module initialization")
 
 import pygame
-print("DEBUG: ui.py - Importing pygame")
+log.debug("Importing pygame")
 pygame.init()
-print("DEBUG: ui.py - Pygame initialized in ui module")
+log.debug("Pygame initialized in ui module")
 pygame.font.init()
-print("DEBUG: ui.py - Pygame font initialized in ui module")
+log.debug("Pygame font initialized in ui module")
 import asyncio
 import sys
 import os
 import time
-print("DEBUG: ui.py - Importing shared_constants")
+log.debug("Importing shared_constants")
 from shared_constants import *
-print("DEBUG: ui.py - shared_constants imported successfully")
-print(f"DEBUG: ui.py - fruit_image available: {fruit_image is not None}")
-print("DEBUG: ui.py - Importing discogs_handling functions")
+log.debug("shared_constants imported successfully")
+log.debug("fruit_image available: %s", fruit_image is not None)
+log.debug("Importing discogs_handling functions")
 from discogs_handling import (
     get_album_search_input, cleanup, safe_pause_playback, play_uri_with_details
 )
-print("DEBUG: ui.py - All imports completed successfully")
+from scene_manager import register_scene, go_to, START_MENU, MAIN_MENU, GAME, QUIT
+from idle_presenter import IdlePresenter
+from sprite_batch import Button
+log.debug("All imports completed successfully")
 
-print("DEBUG: ui.py - Setting up pygame display")
+log.debug("Setting up pygame display")
 screen = pygame.display.set_mode((width, height))
-print(f"DEBUG: ui.py - Display set to {width}x{height}")
+log.debug("Display set to %sx%s", width, height)
 pygame.display.set_caption("DiscogSnake - Start Menu")
-print("DEBUG: ui.py - Window caption set")
+log.debug("Window caption set")
 font = pygame.font.SysFont("Press Start 2P", 25)
-print("DEBUG: ui.py - Font initialized")
+log.debug("Font initialized")
 
 async def quit_game_async(dummy_arg=None):
     """Handles game shutdown: cleans up and exits properly for PyInstaller."""
-    print("DEBUG: ui.py - quit_game_async called")
+    log.debug("quit_game_async called")
     try:
-        print("DEBUG: ui.py - Calling cleanup")
+        log.debug("Calling cleanup")
         await cleanup()
-        print("DEBUG: ui.py - Cleanup completed")
+        log.debug("Cleanup completed")
     except Exception as e:
-        print(f"DEBUG: ui.py - Exception during cleanup: {e}")
+        log.warning("Exception during cleanup: %s", e)
         pass
     
     # Proper exit for PyInstaller
     try:
-        print("DEBUG: ui.py - Quitting pygame")
+        log.debug("Quitting pygame")
         pygame.quit()
-        print("DEBUG: ui.py - Pygame quit successfully")
+        log.debug("Pygame quit successfully")
     except Exception as e:
-        print(f"DEBUG: ui.py - Exception during pygame quit: {e}")
+        log.warning("Exception during pygame quit: %s", e)
         pass
     
     # Force exit if running as executable
     if getattr(sys, 'frozen', False):
-        print("DEBUG: ui.py - Running as frozen executable, using os._exit(0)")
+        log.debug("Running as frozen executable, using os._exit(0)")
         os._exit(0)
     else:
-        print("DEBUG: ui.py - Running as script, using sys.exit(0)")
+        log.debug("Running as script, using sys.exit(0)")
         sys.exit(0)
 
 async def back_to_menu():
     """Returns to the start menu instead of quitting."""
-    print("DEBUG: ui.py - back_to_menu called")
-    print("DEBUG: ui.py - back_to_menu completed")
+    log.debug("back_to_menu called")
+    log.debug("back_to_menu completed")
     # Just return to menu - no need to quit pygame
 
-async def start_menu():
+@register_scene(START_MENU)
+async def start_menu(screen):
     """Displays the main start menu."""
-    print("DEBUG: ui.py - start_menu called")
-    
-    # Wake up backend once at the start and wait for confirmation
-    from snake_logic import wake_up_backend, show_backend_loading_screen
-    backend_ready = await wake_up_backend()
-    
-    if not backend_ready:
-        print("DEBUG: ui.py - Backend not ready, showing loading screen")
-        await show_backend_loading_screen(screen)
-        # Try one more time
-        backend_ready = await wake_up_backend()
-        if not backend_ready:
-            print("DEBUG: ui.py - Backend still not ready, but continuing anyway")
+    log.debug("start_menu called")
     
-    clock = pygame.time.Clock()
+    # Start the backend booting in the background; the menu doesn't wait for it
+    from snake_logic import wake_up_backend
+    wake_up_backend()
     
     # Main menu button - positioned 3/4 down the page
     play_button = pygame.Rect(width//2 - 100, int(height * 0.75) - 25, 200, 50)
@@ -97,21 +94,23 @@ async def start_menu():
                 button_font = pygame.font.SysFont("Arial", 26, bold=True)
     
     play_text = button_font.render("PLAY GAME", True, BLACK)
+    play_button = Button(play_button, play_text, LIGHT_BLUE, DARK_BLUE)
     
-    play_text_rect = play_text.get_rect(center=play_button.center)
-    
+    presenter = IdlePresenter()
     while True:
-        mouse_pos = pygame.mouse.get_pos()
-        
-        for event in pygame.event.get():
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return go_to(QUIT)
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if play_button.collidepoint(event.pos):
-                    print("DEBUG: ui.py - Play button clicked")
-                    await start_game(screen)
-                    return
+                    log.debug("Play button clicked")
+                    return go_to(GAME)
+        
+        # Only redraw when the hover state or something else visible changed
+        play_hovered = play_button.collidepoint(pygame.mouse.get_pos())
+        presenter.watch('hover', play_hovered)
+        if not presenter.needs_redraw():
+            continue
         
         # Draw background
         if start_menu_bg:
@@ -120,21 +119,15 @@ async def start_menu():
             screen.fill(DARK_GREY)
         
         # Draw button with hover effect
-        button_color = DARK_BLUE if play_button.collidepoint(mouse_pos) else LIGHT_BLUE
-        pygame.draw.rect(screen, button_color, play_button)
-        pygame.draw.rect(screen, BLACK, play_button, 2)
-        
-        # Draw button text
-        screen.blit(play_text, play_text_rect)
+        screen.blits([play_button.sprite(play_hovered)], doreturn=False)
         
         pygame.display.flip()
-        clock.tick(60)
-        await asyncio.sleep(0.01)
+        presenter.presented()
 
-async def main_menu():
+@register_scene(MAIN_MENU)
+async def main_menu(screen):
     """Displays the main menu after game completion."""
-    print("DEBUG: ui.py - main_menu called")
-    clock = pygame.time.Clock()
+    log.debug("main_menu called")
     
     # Menu buttons
     play_again_button = pygame.Rect(width//2 - 150, height//2 - 50, 300, 50)
@@ -150,28 +143,30 @@ async def main_menu():
     quit_text = button_font.render("QUIT", True, BLACK)
     
     title_rect = title.get_rect(center=(width//2, height//2 - 150))
-    play_again_text_rect = play_again_text.get_rect(center=play_again_button.center)
-    menu_text_rect = menu_text.get_rect(center=menu_button.center)
-    quit_text_rect = quit_text.get_rect(center=quit_button.center)
+    play_again_button = Button(play_again_button, play_again_text, LIGHT_BLUE)
+    menu_button = Button(menu_button, menu_text, LIGHT_BLUE)
+    quit_button = Button(quit_button, quit_text, LIGHT_BLUE)
+    # Nothing on this menu changes, so the title and buttons are one batch
+    menu_layer = [(title, title_rect), play_again_button.sprite(), menu_button.sprite(), quit_button.sprite()]
     
+    presenter = IdlePresenter()
     while True:
-        for event in pygame.event.get():
+        for event in await presenter.wait_for_events():
             if event.type == pygame.QUIT:
-                await quit_game_async()
-                return
+                return go_to(QUIT)
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if play_again_button.collidepoint(event.pos):
-                    print("DEBUG: ui.py - Play again button clicked")
-                    await start_game(screen)
-                    return
+                    log.debug("Play again button clicked")
+                    return go_to(GAME)
                 elif menu_button.collidepoint(event.pos):
-                    print("DEBUG: ui.py - Main menu button clicked")
-                    await start_menu()
-                    return
+                    log.debug("Main menu button clicked")
+                    return go_to(START_MENU)
                 elif quit_button.collidepoint(event.pos):
-                    print("DEBUG: ui.py - Quit button clicked")
-                    await quit_game_async()
-                    return
+                    log.debug("Quit button clicked")
+                    return go_to(QUIT)
+        
+        if not presenter.needs_redraw():
+            continue
         
         # Draw background
         if game_bg:
@@ -179,25 +174,11 @@ async def main_menu():
         else:
             screen.fill(DARK_GREY)
         
-        # Draw title
-        screen.blit(title, title_rect)
-        
-        # Draw buttons
-        pygame.draw.rect(screen, LIGHT_BLUE, play_again_button)
-        pygame.draw.rect(screen, LIGHT_BLUE, menu_button)
-        pygame.draw.rect(screen, LIGHT_BLUE, quit_button)
-        pygame.draw.rect(screen, BLACK, play_again_button, 2)
-        pygame.draw.rect(screen, BLACK, menu_button, 2)
-        pygame.draw.rect(screen, BLACK, quit_button, 2)
-        
-        # Draw button text
-        screen.blit(play_again_text, play_again_text_rect)
-        screen.blit(menu_text, menu_text_rect)
-        screen.blit(quit_text, quit_text_rect)
+        # Draw title and buttons
+        screen.blits(menu_layer, doreturn=False)
         
         pygame.display.flip()
-        clock.tick(60)
-        await asyncio.sleep(0.01)
+        presenter.presented()
 
-# Import the start_game function from snake_logic
-from snake_logic import start_game
\ No newline at end of file
+# Importing snake_logic registers the game scenes
+import snake_logic
\ No newline at end of file